@@ -0,0 +1,11 @@
+"""
+강릉고등학교 총동문회 데이터 관리 도구
+
+CSV 임포트, 업데이트, 마이그레이션, 삭제, 내보내기 작업을 하나의 CLI로 제공합니다.
+Firebase Admin SDK(gRPC 포함)는 실제 Firestore 백엔드를 사용할 때만 로드되므로
+`--help`, dry-run, 로컬 검증은 빠르게 시작합니다.
+
+사용법:
+    python -m gnhs_tools --help
+    python -m gnhs_tools import --csv contacts.csv --dry-run
+"""
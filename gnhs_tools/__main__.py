@@ -0,0 +1,7 @@
+"""python -m gnhs_tools 진입점"""
+import sys
+
+from gnhs_tools.cli import main
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,210 @@
+"""
+한국 주소 파서 (오프라인)
+
+주소 문자열에서 시/도, 시/군/구, 읍/면/동을 추출합니다. 행정구역 표는
+data/regions.json 에 포함되어 있어 외부 API 없이 동작하고, 같은 주소는
+메모이제이션 캐시로 한 번만 해석합니다.
+
+    >>> parse_address('강원 강릉시 연당길 94-3, 1006호(초당동, 유화1차아파트)')
+    ('강원', '강릉시', '초당동')
+
+시/도는 짧은 이름(서울, 경기, 강원 ...)으로 통일합니다.
+"""
+import functools
+import json
+import os
+import re
+
+from gnhs_tools.contacts import COLLECTION, SERVER_TIMESTAMP
+from gnhs_tools.metrics import METRICS
+
+REGIONS_PATH = os.path.join(os.path.dirname(__file__), 'data', 'regions.json')
+
+# 문서에 기록하는 지역 필드
+REGION_FIELDS = ('address_sido', 'address_sigungu', 'address_dong')
+
+# 지역별 집계 문서 (aggregates/regions)
+AGGREGATE_COLLECTION = 'aggregates'
+REGION_AGGREGATE_ID = 'regions'
+
+_SPLIT_RE = re.compile(r'[\s,()?]+')
+_DONG_RE = re.compile(r'^[가-힣][가-힣0-9·.]*(?:동|읍|면|\d가)$')
+# 동처럼 끝나는 건물 이름 ('한국아파트201동', '래미안101동'). 행정동 번호는 두 자리까지
+# ('교1동', '상계10동')이므로 세 자리 이상 + 동만 건물 동으로 봄
+_BUILDING_RE = re.compile(r'아파트|빌라|타운|맨션|\d{3,}동$')
+_SKIP_PREFIXES = ('대한민국', '한국')
+
+
+class _Regions:
+    """행정구역 조회 표"""
+
+    def __init__(self, path=REGIONS_PATH):
+        with open(path, 'r', encoding='utf-8') as f:
+            table = json.load(f)
+
+        self.sido = {}          # 별칭 → 짧은 이름
+        self.sigungu = {}       # 짧은 시/도 → {시/군/구 또는 접미사 뺀 이름 → 시/군/구}
+        by_name = {}            # 시/군/구 → 해당하는 시/도 목록
+        for entry in table['sido']:
+            code = entry['code']
+            for alias in [code, entry['name']] + entry['aliases']:
+                self.sido[alias] = code
+            # '강원특별자치' 처럼 잘린 표기도 허용
+            if entry['name'].endswith('도') or entry['name'].endswith('시'):
+                self.sido[entry['name'][:-1]] = code
+
+            names = self.sigungu[code] = {}
+            for name in entry['sigungu']:
+                names[name] = name
+                short = name[:-1]
+                # '강릉' → 강릉시 (한 글자 이름은 모호하므로 제외)
+                if len(short) >= 2:
+                    names.setdefault(short, name)
+                by_name.setdefault(name, []).append(code)
+                if len(short) >= 2:
+                    by_name.setdefault(short, []).append(code)
+            # 개편 이전 이름 (예: 인천 남구 → 미추홀구)
+            names.update(entry.get('renamed', {}))
+
+        # 시/도 없이 시/군/구만 적힌 주소용 (전국에서 유일한 이름만)
+        self.unique_sigungu = {
+            name: (codes[0], self.sigungu[codes[0]][name])
+            for name, codes in by_name.items() if len(codes) == 1
+        }
+
+
+_REGIONS = None
+
+
+def _regions():
+    global _REGIONS
+    if _REGIONS is None:
+        _REGIONS = _Regions()
+    return _REGIONS
+
+
+@functools.lru_cache(maxsize=65536)
+def parse_address(address):
+    """(시/도, 시/군/구, 읍/면/동) 튜플 반환 (알 수 없는 부분은 '')"""
+    regions = _regions()
+    tokens = [t for t in _SPLIT_RE.split(address or '') if t]
+    while tokens and tokens[0] in _SKIP_PREFIXES:
+        tokens.pop(0)
+    if not tokens:
+        return '', '', ''
+
+    sido = sigungu = dong = ''
+    i = 0
+    first = tokens[0]
+    if first in regions.sido:
+        sido = regions.sido[first]
+        i = 1
+        # 세종특별자치시는 시/군/구가 없음
+        if i < len(tokens) and tokens[i] in regions.sigungu[sido]:
+            sigungu = regions.sigungu[sido][tokens[i]]
+            i += 1
+    elif first in regions.unique_sigungu:
+        sido, sigungu = regions.unique_sigungu[first]
+        i = 1
+
+    for token in tokens[i:]:
+        if _DONG_RE.match(token) and not _BUILDING_RE.search(token):
+            dong = token
+            break
+    return sido, sigungu, dong
+
+
+def region_fields(address):
+    """문서에 기록할 지역 필드 딕셔너리"""
+    sido, sigungu, dong = parse_address(address)
+    return {'address_sido': sido, 'address_sigungu': sigungu, 'address_dong': dong}
+
+
+def bump_count(counts, key, delta):
+    """counts[key] += delta (0 이 되면 키 삭제)"""
+    value = counts.get(key, 0) + delta
+    if value:
+        counts[key] = value
+    else:
+        counts.pop(key, None)
+
+
+class RegionCounter:
+    """시/도, 시/군/구별 인원 집계"""
+
+    def __init__(self):
+        self.total = 0
+        self.unparsed = 0
+        self.sido = {}
+        self.sigungu = {}
+
+    def add(self, data):
+        self._apply(data, 1)
+
+    def remove(self, data):
+        """add() 로 집계한 문서를 되돌림 (변경 스트림의 증분 갱신용)"""
+        self._apply(data, -1)
+
+    def _apply(self, data, delta):
+        self.total += delta
+        sido = data.get('address_sido', '')
+        if not sido:
+            self.unparsed += delta
+            return
+        bump_count(self.sido, sido, delta)
+        sigungu = data.get('address_sigungu', '')
+        if sigungu:
+            bump_count(self.sigungu, f"{sido} {sigungu}", delta)
+
+    def to_document(self):
+        return {
+            'total': self.total,
+            'unparsed': self.unparsed,
+            'sido': dict(sorted(self.sido.items())),
+            'sigungu': dict(sorted(self.sigungu.items())),
+            'updated_at': SERVER_TIMESTAMP,
+        }
+
+
+def write_region_aggregate(backend, counter):
+    backend.set(AGGREGATE_COLLECTION, REGION_AGGREGATE_ID, counter.to_document())
+    backend.flush()
+
+
+def backfill_regions(backend, collection=COLLECTION):
+    """모든 문서의 지역 필드를 주소로부터 다시 계산하고 집계 문서 갱신
+
+    값이 바뀐 문서만 update() 합니다. 반환값: (갱신 문서 수, RegionCounter)
+    """
+    counter = RegionCounter()
+    updated = 0
+    for doc_id, data in backend.stream(collection, fields=('address',) + REGION_FIELDS):
+        with METRICS.timer('parse_address'):
+            fields = region_fields(data.get('address', ''))
+        counter.add(fields)
+        changes = {k: v for k, v in fields.items() if data.get(k) != v}
+        if changes:
+            backend.update(collection, doc_id, changes)
+            updated += 1
+    write_region_aggregate(backend, counter)
+    return updated, counter
+
+
+def run_regions(args):
+    from gnhs_tools.backends import open_backend
+
+    print("=" * 70)
+    print("🗺️  주소 → 지역 필드 재계산" + (" (dry-run)" if args.dry_run else ""))
+    print("=" * 70)
+
+    backend = open_backend(args.dry_run, read_firestore=True, record=args.record)
+    with backend:
+        updated, counter = backfill_regions(backend)
+
+    print(f"\n✅ 지역 필드 갱신: {updated}개 문서")
+    print(f"📊 전체 {counter.total}명 / 지역 미확인 {counter.unparsed}명")
+    for sido, count in sorted(counter.sido.items(), key=lambda kv: -kv[1]):
+        print(f"  {sido}: {count}명")
+    print(f"\n캐시: {parse_address.cache_info()}")
+    print("=" * 70)
+    return 0
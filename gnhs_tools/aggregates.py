@@ -0,0 +1,311 @@
+"""
+변경 스트림 기반 집계 워커
+
+앱(동문 추가/수정 화면)에서 문서가 바뀔 때마다 컬렉션 전체를 다시 읽지
+않고, on_snapshot 으로 받은 변경분만큼 집계 문서를 증분 갱신합니다.
+
+- aggregates/summary: 전체 인원, 회차 있는 인원, 인증 인원, 회차별 인원
+- aggregates/regions: 시/도, 시/군/구별 인원 (regions 명령과 같은 형식)
+- 로컬 미러 (--mirror, 선택): import --diff 의 비교 기준 JSONL
+
+변경은 큐에 모았다가 --interval 초 단위로 묶어서 반영하므로, 같은 문서가
+여러 번 바뀌어도 집계 문서 쓰기는 한 번입니다. 리스너를 처음 연결하거나
+다시 연결할 때는 첫 스냅샷(전체 문서 목록)으로 상태를 맞추고, 리스너를 쓸
+수 없으면 필드 제한 전체 읽기로 대신합니다. 리스너 콜백에서 작업량 한도를
+넘으면(BudgetExceeded) 워커를 멈추고, 그 밖의 오류는 다시 연결합니다.
+
+    python -m gnhs_tools aggregate-worker --mirror alumni.jsonl
+    python -m gnhs_tools aggregate-worker --once     # 전체 읽기로 한 번만 갱신
+"""
+import queue
+import time
+
+from gnhs_tools.address import (
+    AGGREGATE_COLLECTION, REGION_AGGREGATE_ID, REGION_FIELDS, RegionCounter, bump_count,
+)
+from gnhs_tools.contacts import COLLECTION, SERVER_TIMESTAMP
+from gnhs_tools.cost import COSTS, BudgetExceeded
+from gnhs_tools.metrics import METRICS
+from gnhs_tools.sync import without_timestamp
+
+SUMMARY_AGGREGATE_ID = 'summary'
+
+# 집계에 필요한 필드 (미러를 쓰지 않을 때 전체 읽기는 이 필드만 읽음)
+SUMMARY_FIELDS = ('class_number', 'graduation_year', 'is_verified') + REGION_FIELDS
+
+# 리스너 상태 확인 주기 (초)
+HEALTH_INTERVAL = 30.0
+
+# 큐에서 '전체 문서 목록' 항목을 구분하는 표식
+_RESET = object()
+# 큐에서 '리스너 콜백 오류' 항목을 구분하는 표식
+_FAILED = object()
+
+
+def class_of(data):
+    """앱과 같은 규칙으로 회차 결정 (class_number → graduation_year, 없으면 0)"""
+    value = data.get('class_number')
+    if value is None:
+        value = data.get('graduation_year')
+    return value if isinstance(value, int) and value > 0 else 0
+
+
+class SummaryCounter:
+    """전체/회차별 인원 집계 (add/remove 로 증분 갱신)"""
+
+    def __init__(self):
+        self.total = 0
+        self.with_class = 0
+        self.verified = 0
+        self.classes = {}
+
+    def add(self, data):
+        self._apply(data, 1)
+
+    def remove(self, data):
+        self._apply(data, -1)
+
+    def _apply(self, data, delta):
+        self.total += delta
+        if data.get('is_verified'):
+            self.verified += delta
+        class_number = class_of(data)
+        if class_number:
+            self.with_class += delta
+            # Firestore 맵 키는 문자열
+            bump_count(self.classes, str(class_number), delta)
+
+    def to_document(self):
+        return {
+            'total': self.total,
+            'with_class': self.with_class,
+            'verified': self.verified,
+            'classes': dict(sorted(self.classes.items(), key=lambda kv: int(kv[0]))),
+            'updated_at': SERVER_TIMESTAMP,
+        }
+
+
+class AggregateState:
+    """문서별 마지막 값 + 집계
+
+    문서마다 마지막으로 집계한 값을 기억하므로, 변경 한 건은 이전 값을
+    빼고 새 값을 더하는 것으로 끝납니다 (같은 변경을 두 번 받아도 안전).
+    """
+
+    def __init__(self, keep_full=False):
+        self.keep_full = keep_full     # 미러용으로 전체 필드를 보관할지
+        self.docs = {}
+        self.summary = SummaryCounter()
+        self.regions = RegionCounter()
+        self.mirror_dirty = False
+
+    def _project(self, data):
+        if self.keep_full:
+            return dict(data)
+        return {key: data[key] for key in SUMMARY_FIELDS if key in data}
+
+    def apply(self, doc_id, data):
+        """문서 하나의 변경 반영 (data 가 None 이면 삭제)"""
+        old = self.docs.pop(doc_id, None)
+        if old is not None:
+            self.summary.remove(old)
+            self.regions.remove(old)
+        if data is not None:
+            new = self._project(data)
+            self.docs[doc_id] = new
+            self.summary.add(new)
+            self.regions.add(new)
+        self.mirror_dirty |= self.keep_full
+
+    def reset(self, records):
+        """전체 문서 목록으로 상태를 다시 맞춤 (없어진 문서는 삭제로 처리)"""
+        seen = set()
+        for doc_id, data in records:
+            seen.add(doc_id)
+            self.apply(doc_id, data)
+        for doc_id in [d for d in self.docs if d not in seen]:
+            self.apply(doc_id, None)
+        return len(seen)
+
+    def documents(self):
+        """{집계 문서 ID: 내용}"""
+        return {
+            SUMMARY_AGGREGATE_ID: self.summary.to_document(),
+            REGION_AGGREGATE_ID: self.regions.to_document(),
+        }
+
+
+class AggregateWorker:
+    """on_snapshot 변경분을 모아 집계 문서/미러에 반영"""
+
+    def __init__(self, backend, db=None, interval=2.0, mirror=None, collection=COLLECTION):
+        self.backend = backend
+        self.db = db
+        self.interval = interval
+        self.mirror = mirror
+        self.collection = collection
+        self.state = AggregateState(keep_full=mirror is not None)
+        self.changes = queue.Queue()
+        self.written = {}              # 마지막으로 기록한 집계 문서 (updated_at 제외)
+        self.stats = {'changes': 0, 'batches': 0, 'writes': 0, 'rescans': 0}
+        self._watch = None
+        self._initial = True
+        self._broken = None            # 리스너 콜백에서 난 예외 (다시 연결할 때까지)
+
+    # --- 리스너 (SDK 스레드에서 호출) ---
+
+    def _on_snapshot(self, docs, changes, read_time):
+        # SDK 스레드에서 난 예외는 아무도 받지 않고 리스너만 조용히 멈추므로
+        # 본 루프로 넘겨서 한도 초과면 중단, 그 외에는 다시 연결
+        try:
+            self._queue_snapshot(docs, changes, read_time)
+        except Exception as e:
+            print(f"⚠️  변경 수신 중 오류: {type(e).__name__}: {e}")
+            self.changes.put((_FAILED, e))
+
+    def _queue_snapshot(self, docs, changes, _read_time):
+        if self._initial:
+            # 첫 스냅샷은 전체 문서 목록: 끊긴 동안 삭제된 문서까지 맞춤
+            self._initial = False
+            records = [(doc.id, doc.to_dict() or {}) for doc in docs]
+            for doc_id, data in records:
+                COSTS.read(self.collection, doc_id, data)
+            self.changes.put((_RESET, records))
+            return
+        for change in changes:
+            doc = change.document
+            data = None if change.type.name == 'REMOVED' else (doc.to_dict() or {})
+            COSTS.read(self.collection, doc.id, data)
+            self.changes.put((doc.id, data))
+
+    def subscribe(self):
+        self._initial = True
+        self._watch = self.db.collection(self.collection).on_snapshot(self._on_snapshot)
+
+    def unsubscribe(self):
+        if self._watch is not None:
+            self._watch.unsubscribe()
+            self._watch = None
+
+    def _listening(self):
+        # google-cloud-firestore Watch 는 스트림이 복구 불가능하게 끝나면 is_active 가 False
+        return self._watch is not None and getattr(self._watch, 'is_active', True)
+
+    # --- 반영 ---
+
+    def rescan(self):
+        """필드 제한 전체 읽기로 상태를 다시 만듦 (리스너를 쓸 수 없을 때)"""
+        fields = None if self.mirror else SUMMARY_FIELDS
+        with METRICS.timer('aggregate_rescan'):
+            count = self.state.reset(self.backend.stream(self.collection, fields=fields))
+        self.stats['rescans'] += 1
+        return count
+
+    def drain(self, block=True):
+        """큐에 쌓인 변경을 interval 동안 모아서 적용 (적용한 변경 수 반환)"""
+        try:
+            first = self.changes.get(timeout=HEALTH_INTERVAL if block else 0)
+        except queue.Empty:
+            return 0
+        if block and self.interval:
+            time.sleep(self.interval)
+        batch = [first]
+        while True:
+            try:
+                batch.append(self.changes.get_nowait())
+            except queue.Empty:
+                break
+
+        applied = 0
+        with METRICS.timer('aggregate_apply'):
+            for doc_id, data in batch:
+                if doc_id is _FAILED:
+                    if isinstance(data, BudgetExceeded):
+                        raise data
+                    self._broken = data
+                elif doc_id is _RESET:
+                    applied += self.state.reset(data)
+                else:
+                    self.state.apply(doc_id, data)
+                    applied += 1
+        self.stats['changes'] += applied
+        self.stats['batches'] += 1
+        METRICS.count('aggregate_changes', applied)
+        return applied
+
+    def write(self):
+        """내용이 바뀐 집계 문서와 미러만 기록 (기록한 문서 수 반환)"""
+        written = 0
+        for doc_id, document in self.state.documents().items():
+            content = without_timestamp(document)
+            if self.written.get(doc_id) == content:
+                continue
+            self.backend.set(AGGREGATE_COLLECTION, doc_id, document)
+            self.written[doc_id] = content
+            written += 1
+        if written:
+            self.backend.flush()
+        if self.mirror and self.state.mirror_dirty:
+            from gnhs_tools.sync import save_mirror
+            with METRICS.timer('save_mirror'):
+                save_mirror(self.mirror, self.state.docs)
+            self.state.mirror_dirty = False
+        self.stats['writes'] += written
+        return written
+
+    def restart(self):
+        """리스너를 끊고 전체 읽기로 상태를 맞춘 뒤 다시 구독"""
+        self.unsubscribe()
+        self._broken = None
+        self.rescan()
+        self.write()
+        self.subscribe()
+
+    def run_once(self):
+        count = self.rescan()
+        self.write()
+        return count
+
+    def run_forever(self):
+        self.subscribe()
+        try:
+            while True:
+                applied = self.drain()
+                if applied:
+                    written = self.write()
+                    summary = self.state.summary
+                    print(f"🔄 변경 {applied}건 반영 → 집계 문서 {written}개 기록 "
+                          f"(전체 {summary.total}명)")
+                if self._broken is not None or not self._listening():
+                    # 리스너가 끊기거나 콜백이 실패하면 전체 읽기로 맞춘 뒤 다시 구독
+                    print("⚠️  리스너가 끊겼습니다. 전체 읽기로 상태를 맞추고 다시 연결합니다.")
+                    self.restart()
+        finally:
+            self.unsubscribe()
+
+
+def run_worker(args):
+    from gnhs_tools.backends import open_backend
+
+    print("=" * 70)
+    print("📊 집계 워커" + (" (dry-run)" if args.dry_run else ""))
+    print("=" * 70)
+
+    backend = open_backend(args.dry_run, read_firestore=True, record=args.record)
+    with backend:
+        if args.once:
+            worker = AggregateWorker(backend, mirror=args.mirror)
+            count = worker.run_once()
+            print(f"\n✅ 전체 {count}명 집계, 집계 문서 {worker.stats['writes']}개 기록")
+        else:
+            from gnhs_tools.firebase import get_db
+            worker = AggregateWorker(backend, get_db(), args.interval, args.mirror)
+            print(f"👂 {COLLECTION} 변경 대기 중 ({args.interval:g}초 단위로 묶어서 반영, Ctrl+C 로 종료)")
+            try:
+                worker.run_forever()
+            finally:
+                stats = worker.stats
+                print(f"\n📋 변경 {stats['changes']}건 / 배치 {stats['batches']}회 / "
+                      f"집계 문서 쓰기 {stats['writes']}회 / 전체 읽기 {stats['rescans']}회")
+    print("=" * 70)
+    return 0
@@ -0,0 +1,286 @@
+"""
+분석용 Arrow/Parquet 내보내기
+
+alumni, visit_stats, user_activities 를 (또는 연락처 파일 임포트 스트림을)
+타입이 정해진 Arrow 레코드 배치로 바꿔서 Parquet 데이터셋으로 씁니다.
+회차별 인원, 필드 채움 비율, 로그인 추이 같은 분석을 문서마다 파이썬
+딕셔너리를 만드는 스크립트 대신 pandas/DuckDB/pyarrow 의 열 단위 스캔으로
+할 수 있습니다.
+
+    analytics/
+        alumni/class_number=25/part-0.parquet      회차별 파티션
+        visits/month=2025-10/part-0.parquet        접속자 한 명 = 한 행
+        visit_days/month=2025-10/part-0.parquet    날짜별 접속 수
+        activities/month=2025-10/part-0.parquet
+
+직장, 지역, 직책, 활동 종류처럼 반복되는 문자열은 사전 인코딩(dictionary)
+열로 저장합니다. pyarrow 가 필요합니다 (pip install pyarrow).
+
+    python -m gnhs_tools analytics-export -o analytics
+    python -m gnhs_tools analytics-export --input contacts.csv     # Firestore 대신 연락처 파일
+"""
+import datetime
+import os
+import shutil
+
+from gnhs_tools.contacts import COLLECTION, SERVER_TIMESTAMP, company_of
+from gnhs_tools.errors import ToolError
+from gnhs_tools.metrics import METRICS
+
+DEFAULT_OUTPUT = 'analytics'
+BATCH_ROWS = 16384
+TABLES = ('alumni', 'visits', 'visit_days', 'activities')
+
+
+def pyarrow_module():
+    try:
+        import pyarrow
+        import pyarrow.dataset
+    except ImportError as e:
+        raise ToolError("Arrow/Parquet 내보내기에는 pyarrow 가 필요합니다: pip install pyarrow") from e
+    return pyarrow
+
+
+def _schemas(pa):
+    """표별 (스키마, 파티션 열)"""
+    text = pa.string()
+    category = pa.dictionary(pa.int32(), pa.string())
+    timestamp = pa.timestamp('us', tz='UTC')
+    return {
+        'alumni': (pa.schema([
+            ('id', text),
+            ('name', text),
+            ('class_number', pa.int16()),
+            ('company', category),
+            ('company_key', category),
+            ('job_title', category),
+            ('department', category),
+            ('address_sido', category),
+            ('address_sigungu', category),
+            ('address_dong', category),
+            ('has_email', pa.bool_()),
+            ('has_address', pa.bool_()),
+            ('has_birth_date', pa.bool_()),
+            ('has_photo', pa.bool_()),
+            ('is_verified', pa.bool_()),
+            ('created_at', timestamp),
+            ('updated_at', timestamp),
+        ]), 'class_number'),
+        'visits': (pa.schema([
+            ('date', pa.date32()),
+            ('user_id', text),
+            ('user_name', category),
+            ('timestamp', timestamp),
+            ('month', text),
+        ]), 'month'),
+        'visit_days': (pa.schema([
+            ('date', pa.date32()),
+            ('count', pa.int32()),
+            ('named_visits', pa.int32()),
+            ('month', text),
+        ]), 'month'),
+        'activities': (pa.schema([
+            ('id', text),
+            ('user_id', text),
+            ('user_name', category),
+            ('activity_type', category),
+            ('timestamp', timestamp),
+            ('month', text),
+        ]), 'month'),
+    }
+
+
+def _timestamp(value):
+    if not isinstance(value, datetime.datetime):
+        return None
+    return value if value.tzinfo else value.replace(tzinfo=datetime.timezone.utc)
+
+
+def _date(value):
+    try:
+        return datetime.date.fromisoformat(str(value)[:10])
+    except ValueError:
+        return None
+
+
+# --- 문서 → 행 ---
+
+def alumni_rows(records):
+    from gnhs_tools.aggregates import class_of
+
+    for doc_id, data in records:
+        yield {
+            'id': doc_id,
+            'name': data.get('name') or '',
+            'class_number': class_of(data) or None,
+            'company': company_of(data) or None,
+            'company_key': data.get('company_key') or None,
+            'job_title': data.get('job_title') or None,
+            'department': data.get('department') or None,
+            'address_sido': data.get('address_sido') or None,
+            'address_sigungu': data.get('address_sigungu') or None,
+            'address_dong': data.get('address_dong') or None,
+            'has_email': bool(data.get('email')),
+            'has_address': bool(data.get('address')),
+            'has_birth_date': bool(data.get('birth_date')),
+            'has_photo': bool(data.get('profile_photo_url')),
+            'is_verified': bool(data.get('is_verified')),
+            # CSV 스트림에서는 아직 서버 시각이 없음
+            'created_at': _timestamp(data.get('created_at')),
+            'updated_at': _timestamp(data.get('updated_at')),
+        }
+
+
+def visit_rows(records):
+    """visit_stats 문서 → (접속자 행, 날짜 행)"""
+    for doc_id, data in records:
+        day = _date(data.get('date') or doc_id)
+        if day is None:
+            continue
+        month = day.strftime('%Y-%m')
+        users = data.get('visited_users') or []
+        for user in users:
+            yield 'visits', {
+                'date': day,
+                'user_id': user.get('user_id'),
+                'user_name': user.get('user_name'),
+                'timestamp': _timestamp(user.get('timestamp')),
+                'month': month,
+            }
+        yield 'visit_days', {'date': day, 'count': data.get('count', 0),
+                             'named_visits': len(users), 'month': month}
+
+
+def activity_rows(records):
+    for doc_id, data in records:
+        timestamp = _timestamp(data.get('timestamp'))
+        yield {
+            'id': doc_id,
+            'user_id': data.get('user_id'),
+            'user_name': data.get('user_name'),
+            'activity_type': data.get('activity_type'),
+            'timestamp': timestamp,
+            'month': timestamp.strftime('%Y-%m') if timestamp else 'unknown',
+        }
+
+
+# --- 행 → 레코드 배치 → Parquet ---
+
+class BatchBuilder:
+    """행 딕셔너리를 열별로 모아 BATCH_ROWS 개마다 RecordBatch 생성"""
+
+    def __init__(self, pa, schema, batch_rows=BATCH_ROWS):
+        self.pa = pa
+        self.schema = schema
+        self.batch_rows = batch_rows
+        self.columns = {name: [] for name in schema.names}
+        self.rows = 0
+
+    def add(self, row):
+        for name, values in self.columns.items():
+            value = row.get(name)
+            values.append(None if value is SERVER_TIMESTAMP else value)
+        self.rows += 1
+        if len(self.columns[self.schema.names[0]]) >= self.batch_rows:
+            return self.flush()
+        return None
+
+    def flush(self):
+        if not self.columns[self.schema.names[0]]:
+            return None
+        pa = self.pa
+        arrays = []
+        for field in self.schema:
+            values = self.columns[field.name]
+            if pa.types.is_dictionary(field.type):
+                array = pa.array(values, type=field.type.value_type).dictionary_encode()
+            else:
+                array = pa.array(values, type=field.type)
+            arrays.append(array)
+            self.columns[field.name] = []
+        return pa.RecordBatch.from_arrays(arrays, schema=self.schema)
+
+
+def write_table(pa, rows, directory, schema, partition):
+    """행 스트림을 partition 열 기준 Hive 파티션 Parquet 데이터셋으로 기록 (행 수 반환)
+
+    옆 디렉터리에 다 쓴 뒤 기존 데이터셋과 바꾸므로, 이번에 행이 없는 파티션
+    (예: 인원이 모두 빠진 회차)이 지난 내보내기 값으로 남지 않습니다.
+    """
+    builder = BatchBuilder(pa, schema)
+
+    def batches():
+        for row in rows:
+            batch = builder.add(row)
+            if batch is not None:
+                yield batch
+        batch = builder.flush()
+        if batch is not None:
+            yield batch
+
+    staging = f"{directory}.partial"
+    shutil.rmtree(staging, ignore_errors=True)
+    with METRICS.timer('write_parquet'):
+        pa.dataset.write_dataset(
+            batches(), staging, schema=schema, format='parquet',
+            partitioning=pa.dataset.partitioning(pa.schema([schema.field(partition)]), flavor='hive'),
+        )
+    os.makedirs(staging, exist_ok=True)
+    if os.path.exists(directory):
+        shutil.rmtree(directory)
+    os.replace(staging, directory)
+    return builder.rows
+
+
+def export_alumni(pa, records, output):
+    schema, partition = _schemas(pa)['alumni']
+    return {'alumni': write_table(pa, alumni_rows(records), f"{output}/alumni", schema, partition)}
+
+
+def export_visits(pa, records, output):
+    """visit_stats 한 번 스캔으로 visits / visit_days 두 표 기록"""
+    schemas = _schemas(pa)
+    visits, days = [], []
+    for table, row in visit_rows(records):
+        (visits if table == 'visits' else days).append(row)
+    # visit_stats 는 날짜당 문서 하나라 메모리에 모아도 작음
+    return {
+        'visits': write_table(pa, visits, f"{output}/visits", *schemas['visits']),
+        'visit_days': write_table(pa, days, f"{output}/visit_days", *schemas['visit_days']),
+    }
+
+
+def export_activities(pa, records, output):
+    schema, partition = _schemas(pa)['activities']
+    return {'activities': write_table(pa, activity_rows(records), f"{output}/activities", schema, partition)}
+
+
+def export_firestore(pa, backend, output):
+    """alumni / visit_stats / user_activities 를 모두 내보내기 ({표: 행 수})"""
+    counts = export_alumni(pa, backend.stream(COLLECTION), output)
+    counts.update(export_visits(pa, backend.stream('visit_stats'), output))
+    counts.update(export_activities(pa, backend.stream('user_activities'), output))
+    return counts
+
+
+def run_export(args):
+    pa = pyarrow_module()
+    print("=" * 70)
+    print(f"📐 Arrow/Parquet 분석 내보내기 → {args.output}")
+    print("=" * 70)
+
+    counts = {}
+    if args.input:
+        from gnhs_tools.contacts import iter_alumni
+        from gnhs_tools.sources import open_source
+        counts.update(export_alumni(pa, iter_alumni(open_source(args.input, args.format, args.mapping)),
+                                    args.output))
+    else:
+        from gnhs_tools.backends import FirestoreBackend
+        counts.update(export_firestore(pa, FirestoreBackend(), args.output))
+
+    for table in TABLES:
+        if table in counts:
+            print(f"  {table}: {counts[table]}행")
+    print("✅ 완료")
+    return 0
@@ -0,0 +1,224 @@
+"""
+쓰기 백엔드
+
+파이프라인은 create/set/update/delete 만 호출하고, 실제로 어디에 기록할지는
+백엔드가 결정합니다.
+
+- FirestoreBackend: 500개 단위 배치로 Firestore 에 기록 (SDK 지연 로드)
+- DryRunBackend: 아무것도 기록하지 않고 작업 수만 집계
+- RecordingBackend (writelog.py): dry-run + 쓰기 로그 기록
+"""
+import contextlib
+
+from gnhs_tools.contacts import SERVER_TIMESTAMP
+from gnhs_tools.cost import COSTS
+from gnhs_tools.metrics import METRICS
+
+# Firestore 배치 최대 작업 수
+BATCH_LIMIT = 500
+
+
+class Backend:
+    """백엔드 공통 인터페이스"""
+
+    name = 'base'
+
+    def __init__(self):
+        self.stats = {'create': 0, 'set': 0, 'update': 0, 'delete': 0, 'commits': 0}
+
+    def stream(self, collection, fields=None):
+        """컬렉션의 (문서 ID, 데이터)를 순회 (fields 로 필드 제한)"""
+        raise NotImplementedError
+
+    def create(self, collection, doc_id, data):
+        """새 문서 만들기 (이미 있으면 sync.CREATE_ONLY_FIELDS 를 뺀 나머지만 merge)"""
+        raise NotImplementedError
+
+    def set(self, collection, doc_id, data, merge=False):
+        raise NotImplementedError
+
+    def update(self, collection, doc_id, data):
+        raise NotImplementedError
+
+    def delete(self, collection, doc_id):
+        raise NotImplementedError
+
+    def unit(self, key):
+        """key 로 묶인 쓰기 (문서 이동의 create 와 delete 등)
+
+        백엔드 하나 안에서는 create 가 항상 다른 쓰기보다 먼저 커밋되므로 순서가
+        보장됩니다. 쓰기 로그는 묶음 키를 기록해서 재생할 때 같은 워커로 보냅니다.
+        """
+        return contextlib.nullcontext()
+
+    def flush(self):
+        """대기 중인 쓰기를 모두 반영"""
+
+    def close(self):
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is None:
+            self.close()
+
+
+class FirestoreBackend(Backend):
+    """Firestore 배치 쓰기 백엔드"""
+
+    name = 'firestore'
+
+    def __init__(self, db=None, batch_size=BATCH_LIMIT):
+        super().__init__()
+        if db is None:
+            from gnhs_tools.firebase import get_db
+            db = get_db()
+        from gnhs_tools.firebase import firestore_module
+        self._firestore = firestore_module()
+        self.db = db
+        self.batch_size = min(batch_size, BATCH_LIMIT)
+        self._batch = None
+        self._pending = 0
+        self._creates = []
+
+    def _prepare(self, data):
+        """센티널 값을 SDK 값으로 변환"""
+        return {
+            key: self._firestore.SERVER_TIMESTAMP if value is SERVER_TIMESTAMP else value
+            for key, value in data.items()
+        }
+
+    def _ref(self, collection, doc_id):
+        return self.db.collection(collection).document(doc_id)
+
+    def _add(self):
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self.flush()
+
+    def _current_batch(self):
+        if self._batch is None:
+            self._batch = self.db.batch()
+        return self._batch
+
+    def stream(self, collection, fields=None):
+        query = self.db.collection(collection)
+        if fields is not None:
+            # fields=() 이면 문서 ID 만 읽음
+            query = query.select(list(fields))
+        for doc in COSTS.reads(collection, METRICS.timed_iter(query.stream(), 'firestore_read')):
+            METRICS.count('docs_read')
+            yield doc.id, doc.to_dict() or {}
+
+    def create(self, collection, doc_id, data):
+        # 다른 쓰기와 따로 모아서 커밋 (이미 있는 문서 하나가 배치 전체를 실패시키지 않도록)
+        COSTS.write(collection, doc_id, data)
+        self._creates.append((collection, doc_id, data))
+        self.stats['create'] += 1
+        if len(self._creates) >= self.batch_size:
+            self._flush_creates()
+
+    def _flush_creates(self):
+        creates, self._creates = self._creates, []
+        if not creates:
+            return
+        from google.api_core.exceptions import AlreadyExists, Conflict
+
+        batch = self.db.batch()
+        for collection, doc_id, data in creates:
+            batch.create(self._ref(collection, doc_id), self._prepare(data))
+        try:
+            with METRICS.timer('commit'):
+                batch.commit()
+            self.stats['commits'] += 1
+            return
+        except (AlreadyExists, Conflict):
+            pass
+        # 배치에 이미 있는 문서가 섞여 있으면 하나씩 다시 시도
+        from gnhs_tools.sync import without_create_only
+        for collection, doc_id, data in creates:
+            try:
+                with METRICS.timer('commit'):
+                    self._ref(collection, doc_id).create(self._prepare(data))
+                self.stats['commits'] += 1
+            except (AlreadyExists, Conflict):
+                METRICS.count('create_exists')
+                # create() 에서 이미 쓰기 1회로 집계했으므로 set() 을 거치지 않음
+                self._current_batch().set(self._ref(collection, doc_id),
+                                          self._prepare(without_create_only(data)), merge=True)
+                self._add()
+
+    def set(self, collection, doc_id, data, merge=False):
+        COSTS.write(collection, doc_id, data)
+        self._current_batch().set(self._ref(collection, doc_id), self._prepare(data), merge=merge)
+        self.stats['set'] += 1
+        self._add()
+
+    def update(self, collection, doc_id, data):
+        COSTS.write(collection, doc_id, data)
+        self._current_batch().update(self._ref(collection, doc_id), self._prepare(data))
+        self.stats['update'] += 1
+        self._add()
+
+    def delete(self, collection, doc_id):
+        COSTS.delete(collection, doc_id)
+        self._current_batch().delete(self._ref(collection, doc_id))
+        self.stats['delete'] += 1
+        self._add()
+
+    def flush(self):
+        self._flush_creates()
+        if self._batch is not None and self._pending:
+            with METRICS.timer('commit'):
+                self._batch.commit()
+            self.stats['commits'] += 1
+            METRICS.count('commits')
+        self._batch = None
+        self._pending = 0
+
+
+class DryRunBackend(Backend):
+    """기록하지 않고 작업 수만 집계하는 백엔드
+
+    reader 로 다른 백엔드를 넘기면 읽기(stream)는 그 백엔드에 위임합니다.
+    """
+
+    name = 'dry-run'
+
+    def __init__(self, reader=None):
+        super().__init__()
+        self.reader = reader
+
+    def stream(self, collection, fields=None):
+        if self.reader is None:
+            return iter(())
+        return self.reader.stream(collection, fields)
+
+    def create(self, collection, doc_id, data):
+        self.stats['create'] += 1
+
+    def set(self, collection, doc_id, data, merge=False):
+        self.stats['set'] += 1
+
+    def update(self, collection, doc_id, data):
+        self.stats['update'] += 1
+
+    def delete(self, collection, doc_id):
+        self.stats['delete'] += 1
+
+
+def open_backend(dry_run=False, read_firestore=False, record=None):
+    """명령행 옵션에 맞는 백엔드 생성
+
+    record 에 경로를 주면 dry-run 으로 동작하면서 쓰기를 로그 파일에 기록합니다.
+    dry-run 이면서 read_firestore 가 False 이면 Firebase SDK 를 전혀 로드하지 않습니다.
+    """
+    if not dry_run and not record:
+        return FirestoreBackend()
+    reader = FirestoreBackend() if read_firestore else None
+    if record:
+        from gnhs_tools.writelog import RecordingBackend
+        return RecordingBackend(record, reader=reader)
+    return DryRunBackend(reader=reader)
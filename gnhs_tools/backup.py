@@ -0,0 +1,505 @@
+"""
+Firestore 백업 / 복원 (로컬 스냅샷 파일)
+
+대상 컬렉션은 db.collections() 로 찾으므로 새로 생긴 최상위 컬렉션도 목록을
+고치지 않고 백업됩니다. 하위 컬렉션은 문서마다 목록을 조회하면 문서 수만큼
+RPC 가 들기 때문에, 하위 컬렉션 이름을 아는 것(SUBCOLLECTION_IDS, 예:
+visit_stats/{날짜}/visit_shards)은 컬렉션 그룹 쿼리 한 번으로 찾고, 이름을
+모르는 것은 --probe 로 지정한 최상위 컬렉션에서만 병렬로 찾아봅니다.
+최상위 컬렉션은 문서 범위를 여러 파티션으로 나눠 병렬로 읽고, 파티션별로
+gzip 압축한 JSONL 청크 파일에 씁니다. 모든 쿼리는 서버 시각으로 잡은 같은
+읽기 시각(read_time)을 쓰므로 백업 도중 앱에서 바뀐 문서가 섞이지 않습니다
+(Firestore 가 허용하는 1시간이 지나면 남은 쿼리는 최신 상태로 읽음). manifest.json 에는
+청크마다 문서 수와 SHA-256 체크섬, 컬렉션(경로)마다 문서 내용
+다이제스트(순서와 무관)를 기록합니다.
+
+    backups/20251019-103000/
+        manifest.json
+        alumni/000-0000.jsonl.gz     한 줄에 [문서 ID, 데이터]
+        visit_stats/000-0000.jsonl.gz
+        visit_stats/2025-10-19/visit_shards/000-0000.jsonl.gz
+
+복원은 체크섬을 먼저 확인한 뒤 청크 단위로 여러 워커가 500개 배치로
+기록합니다. --prune 을 주면 스냅샷에 없는 문서를 삭제해서 컬렉션을 백업
+시점과 똑같이 맞추고, --verify 는 복원 후 다이제스트를 다시 계산해서
+비교합니다.
+
+    python -m gnhs_tools backup
+    python -m gnhs_tools restore backups/20251019-103000 --prune --verify
+"""
+import base64
+import datetime
+import gzip
+import hashlib
+import inspect
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from gnhs_tools.cost import COSTS
+from gnhs_tools.errors import ToolError
+from gnhs_tools.metrics import METRICS
+from gnhs_tools.visits import SHARD_COLLECTION
+
+FORMAT_VERSION = 1
+MANIFEST_NAME = 'manifest.json'
+DEFAULT_DIR = 'backups'
+
+# 청크 파일 하나의 최대 문서 수
+CHUNK_DOCS = 5000
+DEFAULT_WORKERS = 8
+# 문서마다 하위 컬렉션을 찾아볼 때의 최대 동시 RPC 수
+PROBE_WORKERS = 16
+
+# 컬렉션 그룹 쿼리로 찾는 하위 컬렉션 이름
+SUBCOLLECTION_IDS = (SHARD_COLLECTION,)
+
+# Firestore 가 read_time 으로 허용하는 과거 범위 (PITR 이 꺼져 있을 때)
+READ_TIME_WINDOW = datetime.timedelta(hours=1)
+# 만료 직전에 시작한 쿼리가 거절되지 않도록 두는 여유
+READ_TIME_MARGIN = datetime.timedelta(minutes=5)
+# 서버 시각을 얻으려고 읽는 (없는) 문서
+_READ_TIME_PROBE = ('maintenance_locks', 'read-time-probe')
+
+
+class BackupError(ToolError, ValueError):
+    """백업 파일이 없거나 손상되었을 때 발생"""
+
+
+# --- 값 인코딩 (Firestore 타입 → JSON) ---
+# 쓰기 로그(writelog.py)도 같은 인코딩을 씁니다.
+
+def encode_value(value):
+    """json.dumps(default=...) 용: JSON 으로 표현할 수 없는 Firestore 값 → 표시 객체"""
+    if isinstance(value, datetime.datetime):
+        return {'$datetime': value.isoformat()}
+    if isinstance(value, bytes):
+        return {'$bytes': base64.b64encode(value).decode('ascii')}
+    # GeoPoint / DocumentReference 는 SDK 를 import 하지 않고 속성으로 구분
+    if hasattr(value, 'latitude') and hasattr(value, 'longitude'):
+        return {'$geo': [value.latitude, value.longitude]}
+    if hasattr(value, 'path') and hasattr(value, 'collection'):
+        return {'$ref': value.path}
+    raise TypeError(f"기록할 수 없는 값: {value!r}")
+
+
+def escape_markers(value):
+    """키가 '$' 로 시작하는 키 하나뿐인 사용자 맵은 키 앞에 '$' 를 하나 더 붙임
+
+    {'$datetime': '...'} 같은 사용자 데이터가 표시 객체로 잘못 해석되지 않도록
+    인코딩 전에 적용하고, decoder() 가 붙인 '$' 를 다시 뗍니다.
+    """
+    if isinstance(value, dict):
+        out = {key: escape_markers(v) for key, v in value.items()}
+        if len(out) == 1:
+            [(key, v)] = out.items()
+            if isinstance(key, str) and key.startswith('$'):
+                return {'$' + key: v}
+        return out
+    if isinstance(value, list):
+        return [escape_markers(v) for v in value]
+    return value
+
+
+def encode_line(doc_id, data):
+    return json.dumps([doc_id, escape_markers(data)], ensure_ascii=False, sort_keys=True,
+                      separators=(',', ':'), default=encode_value)
+
+
+def decoder(db):
+    """json.loads(object_hook=...) 용: 표시 객체 → Firestore 값 (참조는 db 로 다시 만듦)
+
+    db 가 None 이면 GeoPoint / 참조는 표시 객체 그대로 둡니다.
+    """
+    geo_point = None
+    if db is not None:
+        from gnhs_tools.firebase import firestore_module
+        geo_point = firestore_module().GeoPoint
+
+    def decode(obj):
+        if len(obj) == 1:
+            [(key, value)] = obj.items()
+            if key.startswith('$$'):
+                return {key[1:]: value}
+            if key == '$datetime':
+                return datetime.datetime.fromisoformat(value)
+            if key == '$bytes':
+                return base64.b64decode(value)
+            if key == '$geo' and geo_point is not None:
+                return geo_point(*value)
+            if key == '$ref' and db is not None:
+                return db.document(value)
+        return obj
+
+    return decode
+
+
+def _doc_digest(line):
+    return int.from_bytes(hashlib.sha256(line.encode('utf-8')).digest()[:16], 'big')
+
+
+def _combine(digests):
+    """문서 다이제스트 합 (순서와 무관, 16진 문자열)"""
+    return f"{sum(digests) % (1 << 128):032x}"
+
+
+# --- 백업 ---
+
+def discover_collections(db, roots=None, subcollections=SUBCOLLECTION_IDS, probe=(), workers=PROBE_WORKERS):
+    """백업할 컬렉션 경로 목록 (roots 가 없으면 db.collections())
+
+    - subcollections: 이름으로 컬렉션 그룹 쿼리를 해서, 문서가 있는 하위 컬렉션
+      경로 중 roots 아래에 있는 것을 추가
+    - probe: 이 최상위 컬렉션들은 문서마다 하위 컬렉션 목록을 조회 (문서 수만큼
+      RPC, 최대 workers 개 동시). 문서 없이 하위 컬렉션만 있는 경로도 찾도록
+      list_documents() 로 문서 참조를 나열합니다.
+    """
+    roots = [c.id for c in db.collections()] if roots is None else list(roots)
+    found = set()
+    for name in subcollections:
+        query = db.collection_group(name).select([])
+        for doc in COSTS.reads(name, query.stream()):
+            parent = doc.reference.path.rsplit('/', 1)[0]
+            if parent.split('/', 1)[0] in roots:
+                found.add(parent)
+
+    def children(ref):
+        return [f"{ref.path}/{sub.id}" for sub in ref.collections()]
+
+    with ThreadPoolExecutor(max(1, workers)) as pool:
+        for path in probe:
+            if path not in roots:
+                continue
+            refs = list(db.collection(path).list_documents())
+            # 문서 나열과 문서별 하위 컬렉션 조회가 각각 읽기 1회
+            COSTS.read(path, count=2 * len(refs))
+            for subs in pool.map(children, refs):
+                found.update(subs)
+    return roots + sorted(found - set(roots))
+
+
+class ReadTime:
+    """서버 시각으로 잡은 쿼리 읽기 시각
+
+    로컬 시계는 서버와 어긋날 수 있으므로 없는 문서를 한 번 읽어서 응답의
+    read_time 을 씁니다. Firestore 는 지난 1시간 안의 read_time 만 받으므로,
+    잡은 지 READ_TIME_WINDOW - READ_TIME_MARGIN 이 지나면 get() 은 None 을
+    반환하고(한 번 경고) 그 뒤 쿼리는 최신 상태로 읽습니다.
+    """
+
+    def __init__(self, db):
+        collection, doc_id = _READ_TIME_PROBE
+        snapshot = db.collection(collection).document(doc_id).get()
+        COSTS.read(collection)
+        self.value = snapshot.read_time
+        self.expired = False
+        self._started = time.monotonic()
+        self._lock = threading.Lock()
+
+    def get(self):
+        if time.monotonic() - self._started < (READ_TIME_WINDOW - READ_TIME_MARGIN).total_seconds():
+            return self.value
+        with self._lock:
+            if not self.expired:
+                self.expired = True
+                print("⚠️  읽기 시각이 Firestore 허용 범위(1시간)를 넘어 남은 쿼리는 최신 상태로 읽습니다.")
+        return None
+
+
+def stream_at(query, read_time):
+    """read_time(ReadTime 또는 None) 시점으로 쿼리 실행"""
+    value = read_time.get() if read_time is not None else None
+    return query.stream(read_time=value) if value is not None else query.stream()
+
+
+def _supports_read_time(query):
+    try:
+        return 'read_time' in inspect.signature(query.stream).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def _partitions(db, collection, count):
+    """컬렉션을 count 개 범위로 나눈 쿼리 목록 (지원하지 않거나 하위 컬렉션이면 전체 하나)"""
+    # 컬렉션 그룹 파티션은 같은 이름의 모든 하위 컬렉션에 걸치므로 최상위에서만 사용
+    if count <= 1 or '/' in collection:
+        return [db.collection(collection)]
+    try:
+        return [p.query() for p in db.collection_group(collection).get_partitions(count)]
+    except Exception as e:
+        print(f"⚠️  {collection}: 파티션 나누기 실패, 단일 스캔으로 진행 ({e})")
+        return [db.collection(collection)]
+
+
+class _ChunkWriter:
+    """파티션 하나의 문서를 CHUNK_DOCS 개씩 gzip 청크로 기록"""
+
+    def __init__(self, directory, collection, partition):
+        self.directory = directory
+        self.collection = collection
+        self.partition = partition
+        self.chunks = []
+        self.digests = []
+        self._file = None
+        self._count = 0
+
+    def _open(self):
+        name = f"{self.collection}/{self.partition:03d}-{len(self.chunks):04d}.jsonl.gz"
+        self._name = name
+        self._file = gzip.open(os.path.join(self.directory, name), 'wt', encoding='utf-8', compresslevel=6)
+        self._count = 0
+
+    def write(self, doc_id, data):
+        if self._file is None:
+            self._open()
+        line = encode_line(doc_id, data)
+        self._file.write(line)
+        self._file.write('\n')
+        self.digests.append(_doc_digest(line))
+        self._count += 1
+        if self._count >= CHUNK_DOCS:
+            self._close_chunk()
+
+    def _close_chunk(self):
+        self._file.close()
+        path = os.path.join(self.directory, self._name)
+        self.chunks.append({'file': self._name, 'documents': self._count,
+                            'bytes': os.path.getsize(path), 'sha256': _file_sha256(path)})
+        self._file = None
+
+    def close(self):
+        if self._file is not None:
+            self._close_chunk()
+
+
+def _file_sha256(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _backup_partition(directory, collection, partition, query, read_time=None):
+    writer = _ChunkWriter(directory, collection, partition)
+    try:
+        for doc in COSTS.reads(collection, METRICS.timed_iter(stream_at(query, read_time), 'backup_read')):
+            # 컬렉션 그룹 파티션에는 같은 이름의 하위 컬렉션 문서도 섞일 수 있음
+            if doc.reference.path.rsplit('/', 1)[0] != collection:
+                continue
+            writer.write(doc.id, doc.to_dict() or {})
+    finally:
+        writer.close()
+    return writer
+
+
+def backup(db, directory, collections=None, workers=DEFAULT_WORKERS, recursive=True, probe=()):
+    """컬렉션들을 directory 에 백업하고 manifest 반환
+
+    collections 가 없으면 모든 최상위 컬렉션, recursive 면 discover_collections 로
+    찾은 하위 컬렉션까지 백업합니다. 모든 쿼리는 ReadTime 으로 잡은 시점으로 읽습니다.
+    """
+    if collections is None:
+        collections = [c.id for c in db.collections()]
+    if recursive:
+        collections = discover_collections(db, collections, probe=probe)
+    os.makedirs(directory, exist_ok=True)
+    read_time = ReadTime(db)
+    tasks = []
+    for collection in collections:
+        os.makedirs(os.path.join(directory, collection), exist_ok=True)
+        for partition, query in enumerate(_partitions(db, collection, workers)):
+            tasks.append((collection, partition, query))
+    if tasks and not _supports_read_time(tasks[0][2]):
+        print("⚠️  이 SDK 는 read_time 을 지원하지 않아 쿼리별 최신 상태로 읽습니다.")
+        read_time = None
+
+    with ThreadPoolExecutor(max(1, workers)) as pool:
+        writers = list(pool.map(lambda task: _backup_partition(directory, *task, read_time), tasks))
+
+    manifest = {
+        'format': FORMAT_VERSION,
+        'created_at': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        # 허용 범위를 넘겨 일부를 최신 상태로 읽었으면 None
+        'read_time': read_time.value.isoformat() if read_time and not read_time.expired else None,
+        'collections': {},
+    }
+    for collection in collections:
+        parts = [w for w in writers if w.collection == collection]
+        digests = [d for w in parts for d in w.digests]
+        manifest['collections'][collection] = {
+            'documents': len(digests),
+            'digest': _combine(digests),
+            'chunks': [c for w in sorted(parts, key=lambda w: w.partition) for c in w.chunks],
+        }
+    with open(os.path.join(directory, MANIFEST_NAME), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, ensure_ascii=False, indent=1)
+    return manifest
+
+
+def backup_before_wipe(db, collection):
+    """삭제 전에 컬렉션 하나를 백업하고 백업 디렉터리 반환"""
+    stamp = datetime.datetime.now().strftime('%Y%m%d-%H%M%S')
+    directory = os.path.join(DEFAULT_DIR, f"{stamp}-before-wipe-{collection}")
+    with COSTS.stage('backup'):
+        # wipe 는 최상위 문서만 지우므로 하위 컬렉션은 읽지 않음
+        manifest = backup(db, directory, (collection,), recursive=False)
+    print(f"💾 삭제 전 백업: {directory} ({manifest['collections'][collection]['documents']}개 문서)")
+    return directory
+
+
+# --- 복원 ---
+
+def load_manifest(directory):
+    path = os.path.join(directory, MANIFEST_NAME)
+    if not os.path.exists(path):
+        raise BackupError(f"백업 manifest 가 없습니다: {path}")
+    with open(path, 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+    if manifest.get('format') != FORMAT_VERSION:
+        raise BackupError(f"지원하지 않는 백업 형식: {manifest.get('format')}")
+    return manifest
+
+
+def verify_checksums(directory, manifest, collections, workers=DEFAULT_WORKERS):
+    """청크 파일 체크섬 확인 (손상된 파일 목록 반환)"""
+    chunks = [c for name in collections for c in manifest['collections'][name]['chunks']]
+
+    def check(chunk):
+        path = os.path.join(directory, chunk['file'])
+        if not os.path.exists(path) or _file_sha256(path) != chunk['sha256']:
+            return chunk['file']
+        return None
+
+    with ThreadPoolExecutor(max(1, workers)) as pool:
+        return [name for name in pool.map(check, chunks) if name]
+
+
+def read_chunk(directory, chunk, decode=None):
+    """청크 파일의 (문서 ID, 데이터)"""
+    with gzip.open(os.path.join(directory, chunk['file']), 'rt', encoding='utf-8') as f:
+        for line in f:
+            doc_id, data = json.loads(line, object_hook=decode)
+            yield doc_id, data
+
+
+def restore(db, directory, collections=None, workers=DEFAULT_WORKERS, prune=False, backend_factory=None):
+    """백업을 복원 ({컬렉션: {'restored', 'pruned'}} 반환)"""
+    from gnhs_tools.backends import FirestoreBackend
+
+    manifest = load_manifest(directory)
+    collections = list(collections or manifest['collections'])
+    missing = [c for c in collections if c not in manifest['collections']]
+    if missing:
+        raise BackupError(f"백업에 없는 컬렉션: {', '.join(missing)}")
+    damaged = verify_checksums(directory, manifest, collections, workers)
+    if damaged:
+        raise BackupError(f"체크섬이 맞지 않는 청크: {', '.join(damaged[:5])}")
+
+    backend_factory = backend_factory or (lambda: FirestoreBackend(db=db))
+    decode = decoder(db)
+    tasks = [(name, chunk) for name in collections for chunk in manifest['collections'][name]['chunks']]
+
+    def write_chunk(task):
+        collection, chunk = task
+        backend = backend_factory()
+        ids = []
+        with backend:
+            for doc_id, data in read_chunk(directory, chunk, decode):
+                backend.set(collection, doc_id, data)
+                ids.append(doc_id)
+        return collection, ids
+
+    result = {name: {'restored': 0, 'pruned': 0} for name in collections}
+    restored_ids = {name: set() for name in collections}
+    with METRICS.timer('restore_write'), ThreadPoolExecutor(max(1, workers)) as pool:
+        for collection, ids in pool.map(write_chunk, tasks):
+            result[collection]['restored'] += len(ids)
+            restored_ids[collection].update(ids)
+
+    if prune:
+        backend = backend_factory()
+        with backend:
+            for collection in collections:
+                for doc_id, _ in backend.stream(collection, fields=()):
+                    if doc_id not in restored_ids[collection]:
+                        backend.delete(collection, doc_id)
+                        result[collection]['pruned'] += 1
+    return result
+
+
+def live_digest(db, collection):
+    """현재 컬렉션의 (문서 수, 다이제스트) (manifest 와 비교용)"""
+    digests = [_doc_digest(encode_line(doc.id, doc.to_dict() or {}))
+               for doc in COSTS.reads(collection, db.collection(collection).stream())]
+    return len(digests), _combine(digests)
+
+
+def verify_live(db, directory, collections=None):
+    """복원된 컬렉션이 백업과 같은지 확인 ({컬렉션: (일치 여부, 현재 문서 수)})"""
+    manifest = load_manifest(directory)
+    report = {}
+    for collection in collections or manifest['collections']:
+        entry = manifest['collections'][collection]
+        count, digest = live_digest(db, collection)
+        report[collection] = (count == entry['documents'] and digest == entry['digest'], count)
+    return report
+
+
+def _split(value):
+    return [c.strip() for c in value.split(',') if c.strip()] if value else None
+
+
+def run_backup(args):
+    from gnhs_tools.firebase import get_db
+
+    directory = args.output or os.path.join(
+        DEFAULT_DIR, datetime.datetime.now().strftime('%Y%m%d-%H%M%S'))
+    collections = _split(args.collections)
+    print(f"💾 백업 → {directory} (워커 {args.workers}개)")
+
+    with METRICS.timer('backup'):
+        manifest = backup(get_db(), directory, collections, args.workers, probe=_split(args.probe) or ())
+    total_bytes = 0
+    for name, entry in manifest['collections'].items():
+        size = sum(c['bytes'] for c in entry['chunks'])
+        total_bytes += size
+        print(f"  {name}: {entry['documents']}개 문서, 청크 {len(entry['chunks'])}개 ({size / 1024:.1f}KB)")
+    print(f"✅ 백업 완료 ({total_bytes / 1024:.1f}KB)")
+    return 0
+
+
+def run_restore(args):
+    from gnhs_tools.backends import DryRunBackend, FirestoreBackend
+    from gnhs_tools.firebase import get_db
+
+    manifest = load_manifest(args.directory)
+    collections = _split(args.collections) or list(manifest['collections'])
+    if not args.dry_run and not args.yes:
+        action = "덮어쓰고 백업에 없는 문서는 삭제" if args.prune else "덮어쓰기"
+        print(f"⚠️  경고: {', '.join(collections)} 컬렉션을 {manifest['created_at']} 백업으로 {action}합니다.")
+        if input("계속하시겠습니까? (yes/no): ").lower() != 'yes':
+            print("❌ 작업이 취소되었습니다.")
+            return 1
+
+    db = get_db()
+    # dry-run 은 기록하지 않지만 --prune 계산을 위해 읽기는 Firestore 에서 함
+    factory = (lambda: DryRunBackend(reader=FirestoreBackend(db=db))) if args.dry_run else None
+    print(f"♻️  {args.directory} 복원 중 (워커 {args.workers}개)" + (" (dry-run)" if args.dry_run else ""))
+    result = restore(db, args.directory, collections, args.workers, args.prune, factory)
+    for name, entry in result.items():
+        print(f"  {name}: {entry['restored']}개 기록 / {entry['pruned']}개 삭제")
+
+    if args.verify and not args.dry_run:
+        failed = False
+        for name, (ok, count) in verify_live(db, args.directory, collections).items():
+            failed |= not ok
+            print(f"  {'✅' if ok else '❌'} {name}: 현재 {count}개 / 백업 "
+                  f"{manifest['collections'][name]['documents']}개")
+        if failed:
+            raise BackupError("복원 결과가 백업과 다릅니다")
+    print("✅ 복원 완료")
+    return 0
+
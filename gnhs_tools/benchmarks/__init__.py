@@ -0,0 +1 @@
+"""gnhs_tools 성능 측정 스크립트 (python -m gnhs_tools.benchmarks.<이름>)"""
@@ -0,0 +1,57 @@
+"""
+백업/복원 왕복 확인 (에뮬레이터 전용)
+
+모든 컬렉션을 백업한 뒤 컬렉션을 비우고 복원해서, 문서 수와 다이제스트가
+백업과 같은지 확인하고 단계별 시간을 출력합니다.
+
+    FIRESTORE_EMULATOR_HOST=localhost:8080 python -m gnhs_tools.benchmarks.backup_roundtrip
+"""
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args(argv)
+
+    if not os.environ.get('FIRESTORE_EMULATOR_HOST'):
+        print("❌ 에뮬레이터 전용입니다. FIRESTORE_EMULATOR_HOST 를 설정하세요.")
+        return 1
+
+    from gnhs_tools.backends import FirestoreBackend
+    from gnhs_tools.backup import backup, restore, verify_live
+    from gnhs_tools.firebase import get_db
+    from gnhs_tools.importer import wipe_collection
+
+    db = get_db()
+    directory = tempfile.mkdtemp(prefix='gnhs-backup-')
+
+    start = time.perf_counter()
+    manifest = backup(db, directory, workers=args.workers)
+    backup_s = time.perf_counter() - start
+    total = sum(entry['documents'] for entry in manifest['collections'].values())
+    print(f"💾 백업: {total}개 문서 {backup_s:.2f}초 → {directory}")
+
+    start = time.perf_counter()
+    with FirestoreBackend(db=db) as backend:
+        for collection in manifest['collections']:
+            wipe_collection(backend, collection)
+    print(f"🗑️  삭제: {time.perf_counter() - start:.2f}초")
+
+    start = time.perf_counter()
+    restore(db, directory, workers=args.workers)
+    print(f"♻️  복원: {time.perf_counter() - start:.2f}초")
+
+    failed = False
+    for collection, (ok, count) in verify_live(db, directory).items():
+        failed |= not ok
+        print(f"  {'✅' if ok else '❌'} {collection}: {count}개")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
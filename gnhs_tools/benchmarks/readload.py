@@ -0,0 +1,343 @@
+"""
+앱 읽기 패턴 부하 테스트 (에뮬레이터 전용)
+
+앱 화면이 보내는 쿼리를 같은 모양으로 재현해서, 동문 수(10k/100k/1M)에 따라
+세션당 문서 읽기 수, 전송량, 지연 시간이 어떻게 늘어나는지 측정합니다.
+
+- home: alumni 전체 get ×2 (getGraduationYears, getTotalAlumniCount),
+  updated_at 최신 6명, 활성 공지, getAllStats (날짜별 visit_stats get + 전체 get)
+- class_list: alumni 전체 get ×3
+- class_alumni: class_number == N
+- visit_stats: getAllStats + 최근 10일 visit_stats get + 접속자 alumni get
+- activities: user_activities orderBy(timestamp).limit(50), 로그인 활동 limit(100)
+
+한 화면의 쿼리는 순서대로 실행하므로 화면 지연 시간은 앱(Future.wait)보다
+큰 상한값입니다. 전송량은 문서 ID와 필드를 JSON 으로 직렬화한 크기로
+근사합니다.
+
+    FIRESTORE_EMULATOR_HOST=localhost:8080 \\
+        python -m gnhs_tools.benchmarks.readload --sizes 10000,100000,1000000 --clients 16
+"""
+import argparse
+import datetime
+import json
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from gnhs_tools.contacts import COLLECTION, DEFAULT_CSV, SERVER_TIMESTAMP, clean_phone
+
+SESSION = ('home', 'class_list', 'class_alumni', 'visit_stats', 'activities')
+
+# 시드 동문 문서 ID: SEED_PREFIX + 7자리 번호
+SEED_PREFIX = '0105'
+
+# 시드용 접속 통계/활동 로그 양
+SEED_DAYS = 40
+SEED_VISITORS_PER_DAY = 50
+SEED_ACTIVITIES = 500
+
+
+def _doc_size(doc):
+    data = doc.to_dict() or {}
+    return len(doc.id) + len(json.dumps(data, ensure_ascii=False, default=str).encode('utf-8'))
+
+
+class Probe:
+    """쿼리 하나 실행 → (읽기 수, 바이트)"""
+
+    def __init__(self, timeout):
+        self.timeout = timeout
+
+    def query(self, query):
+        reads = size = 0
+        for doc in query.stream(timeout=self.timeout):
+            reads += 1
+            size += _doc_size(doc)
+        # 결과가 없는 쿼리도 읽기 1회로 과금
+        return max(reads, 1), size
+
+    def get(self, ref):
+        doc = ref.get(timeout=self.timeout)
+        return 1, _doc_size(doc) if doc.exists else 0
+
+
+def _date_keys(now, days):
+    return [(now - datetime.timedelta(days=i)).strftime('%Y-%m-%d') for i in range(days)]
+
+
+def _all_stats_ops(db, probe, now):
+    """visit_stats_service.dart getAllStats (오늘/이번 주/이번 달 날짜별 get + 전체 get)"""
+    stats = db.collection('visit_stats')
+    ops = [('visit_stats 오늘', lambda: probe.get(stats.document(now.strftime('%Y-%m-%d'))))]
+    for label, days in (('이번 주', now.isoweekday()), ('이번 달', now.day)):
+        keys = _date_keys(now, days)
+        ops.append((f'visit_stats {label} ({len(keys)}일)',
+                    lambda keys=keys: _sum(probe.get(stats.document(k)) for k in keys)))
+    ops.append(('visit_stats 전체', lambda: probe.query(stats)))
+    return ops
+
+
+def _sum(results):
+    reads = size = 0
+    for r, s in results:
+        reads += r
+        size += s
+    return reads, size
+
+
+def screen_ops(db, probe, screen, rng, classes):
+    """화면 하나의 (이름, 실행 함수) 목록"""
+    from gnhs_tools.firebase import firestore_module
+    firestore = firestore_module()
+    alumni = db.collection(COLLECTION)
+    now = datetime.datetime.now()
+
+    if screen == 'home':
+        return [
+            ('alumni 전체 (getGraduationYears)', lambda: probe.query(alumni)),
+            ('alumni 전체 (getTotalAlumniCount)', lambda: probe.query(alumni)),
+            ('alumni updated_at 최신 6명', lambda: probe.query(
+                alumni.order_by('updated_at', direction=firestore.Query.DESCENDING).limit(6))),
+            ('notices is_active', lambda: probe.query(
+                db.collection('notices').where('is_active', '==', True))),
+        ] + _all_stats_ops(db, probe, now)
+    if screen == 'class_list':
+        return [
+            ('alumni 전체 (getGraduationYears)', lambda: probe.query(alumni)),
+            ('alumni 전체 (getAlumniCountByYear)', lambda: probe.query(alumni)),
+            ('alumni 전체 (getTotalAlumniCount)', lambda: probe.query(alumni)),
+        ]
+    if screen == 'class_alumni':
+        class_number = rng.choice(classes)
+        return [('alumni class_number == N', lambda: probe.query(
+            alumni.where('class_number', '==', class_number)))]
+    if screen == 'visit_stats':
+        keys = _date_keys(now, 10)
+        stats = db.collection('visit_stats')
+
+        def recent_visitors():
+            reads, size, users = 0, 0, set()
+            for key in keys:
+                doc = stats.document(key).get(timeout=probe.timeout)
+                reads += 1
+                if doc.exists:
+                    size += _doc_size(doc)
+                    users.update(u.get('user_id') for u in (doc.to_dict() or {}).get('visited_users', []))
+            # 접속자마다 alumni 문서 get (getRecentVisitors 의 회차 조회)
+            r, s = _sum(probe.get(alumni.document(u)) for u in users if u)
+            return reads + r, size + s
+
+        return _all_stats_ops(db, probe, now) + [('최근 10일 접속자 + alumni get', recent_visitors)]
+    if screen == 'activities':
+        activities = db.collection('user_activities')
+        return [
+            ('user_activities 최신 50개', lambda: probe.query(
+                activities.order_by('timestamp', direction=firestore.Query.DESCENDING).limit(50))),
+            ('user_activities 로그인 100개', lambda: probe.query(
+                activities.where('activity_type', '==', 'login')
+                .order_by('timestamp', direction=firestore.Query.DESCENDING).limit(100))),
+        ]
+    raise ValueError(screen)
+
+
+class Results:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.ops = {}        # (화면, 쿼리) → {'ms': [], 'reads', 'bytes', 'errors'}
+        self.screens = {}    # 화면 → {'ms': [], 'reads', 'bytes', 'errors'}
+
+    @staticmethod
+    def _entry(table, key):
+        return table.setdefault(key, {'ms': [], 'reads': 0, 'bytes': 0, 'errors': 0})
+
+    def add(self, screen, label, ms, reads, size, error):
+        with self.lock:
+            entry = self._entry(self.ops, (screen, label))
+            entry['ms'].append(ms)
+            entry['reads'] += reads
+            entry['bytes'] += size
+            entry['errors'] += error
+
+    def add_screen(self, screen, ms, reads, size, errors):
+        with self.lock:
+            entry = self._entry(self.screens, screen)
+            entry['ms'].append(ms)
+            entry['reads'] += reads
+            entry['bytes'] += size
+            entry['errors'] += errors
+
+
+def run_session(db, probe, rng, classes, results):
+    for screen in SESSION:
+        total_ms = total_reads = total_bytes = errors = 0
+        for label, op in screen_ops(db, probe, screen, rng, classes):
+            start = time.perf_counter()
+            try:
+                reads, size = op()
+                error = 0
+            except Exception:
+                # 시간 초과/메모리 부족 등: 해당 화면이 무너진 것으로 집계
+                reads = size = 0
+                error = 1
+            ms = (time.perf_counter() - start) * 1000
+            results.add(screen, label, ms, reads, size, error)
+            total_ms += ms
+            total_reads += reads
+            total_bytes += size
+            errors += error
+        results.add_screen(screen, total_ms, total_reads, total_bytes, errors)
+
+
+# --- 시드 ---
+
+def alumni_count(db):
+    return db.collection(COLLECTION).count().get()[0][0].value
+
+
+def next_seed_number(db):
+    """SEED_PREFIX 범위에서 가장 큰 문서 ID 다음 번호 (없으면 0)
+
+    문서 수에서 시작하면 임포트한 실제 동문이 섞여 있을 때 이미 있는 시드
+    문서를 덮어쓰고 목표 인원에 못 미치므로, 가장 큰 ID 를 찾아 이어 붙입니다.
+    """
+    from gnhs_tools.firebase import firestore_module
+    firestore = firestore_module()
+    alumni = db.collection(COLLECTION)
+    query = (alumni.where('__name__', '>=', alumni.document(SEED_PREFIX))
+             .where('__name__', '<=', alumni.document(SEED_PREFIX + '9' * 7))
+             .order_by('__name__', direction=firestore.Query.DESCENDING)
+             .limit(1))
+    for doc in query.stream():
+        suffix = doc.id[len(SEED_PREFIX):]
+        return int(suffix) + 1 if suffix.isdigit() else 0
+    return 0
+
+
+def seed_alumni(db, target, source=DEFAULT_CSV):
+    """연락처 레코드를 복제해서 alumni 를 target 명까지 채움 (추가한 수 반환)"""
+    from gnhs_tools.backends import FirestoreBackend
+    from gnhs_tools.contacts import iter_alumni
+
+    missing = target - alumni_count(db)
+    if missing <= 0:
+        return 0
+    templates = [data for _, data in iter_alumni(source)]
+    backend = FirestoreBackend(db)
+    start = next_seed_number(db)
+    for n in range(start, start + missing):
+        doc_id = f"{SEED_PREFIX}{n:07d}"
+        data = dict(templates[n % len(templates)])
+        # 임포트와 같은 형식 (숫자만)
+        data['phone'] = clean_phone(doc_id)
+        data['updated_at'] = SERVER_TIMESTAMP
+        backend.set(COLLECTION, doc_id, data)
+        if (n - start + 1) % 50000 == 0:
+            print(f"  🌱 {n - start + 1:,}명...")
+    backend.flush()
+    return missing
+
+
+def seed_activity(db, rng):
+    """최근 접속 통계/활동 로그 (고정 문서 ID 라 여러 번 실행해도 같은 양)"""
+    from gnhs_tools.backends import FirestoreBackend
+
+    backend = FirestoreBackend(db)
+    now = datetime.datetime.now(datetime.timezone.utc)
+    for i, key in enumerate(_date_keys(datetime.datetime.now(), SEED_DAYS)):
+        visitors = [{'user_id': f"{SEED_PREFIX}{rng.randrange(10000):07d}", 'user_name': f"동문{j}",
+                     'timestamp': now - datetime.timedelta(days=i, minutes=j)}
+                    for j in range(SEED_VISITORS_PER_DAY)]
+        backend.set('visit_stats', key, {'date': key, 'count': len(visitors), 'visited_users': visitors})
+    for i in range(SEED_ACTIVITIES):
+        backend.set('user_activities', f"loadtest-{i}", {
+            'user_id': f"{SEED_PREFIX}{rng.randrange(10000):07d}",
+            'user_name': f"동문{i}",
+            'activity_type': 'login' if i % 2 else 'view',
+            'timestamp': now - datetime.timedelta(minutes=i * 7),
+        })
+    backend.flush()
+
+
+# --- 보고 ---
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] if ordered else 0.0
+
+
+def _mb(size):
+    return f"{size / 1_000_000:.2f}MB"
+
+
+def report(size, results, sessions, detail):
+    print(f"\n📏 alumni {size:,}명 / 세션 {sessions}개")
+    print(f"  {'화면':<14}{'읽기/세션':>12}{'전송/세션':>12}{'p50':>10}{'p95':>10}{'p99':>10}{'오류':>6}")
+    worst = None
+    for screen in SESSION:
+        entry = results.screens.get(screen)
+        if not entry:
+            continue
+        p95 = _percentile(entry['ms'], 95)
+        print(f"  {screen:<14}{entry['reads'] / sessions:>12,.0f}{_mb(entry['bytes'] / sessions):>12}"
+              f"{_percentile(entry['ms'], 50):>8.0f}ms{p95:>8.0f}ms{_percentile(entry['ms'], 99):>8.0f}ms"
+              f"{entry['errors']:>6}")
+        if worst is None or (entry['errors'], p95) > worst[1]:
+            worst = (screen, (entry['errors'], p95))
+        if detail:
+            for (op_screen, label), op in results.ops.items():
+                if op_screen == screen:
+                    print(f"      {label:<36}{op['reads'] / sessions:>10,.0f} 읽기"
+                          f"{_percentile(op['ms'], 95):>10.0f}ms p95")
+    total_reads = sum(e['reads'] for e in results.screens.values())
+    print(f"  세션당 문서 읽기 합계: {total_reads / sessions:,.0f}")
+    if worst:
+        print(f"  ⚠️  가장 느린 화면: {worst[0]} (p95 {worst[1][1]:.0f}ms, 오류 {worst[1][0]})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', default='10000,100000,1000000', help="쉼표로 구분한 alumni 수")
+    parser.add_argument('--clients', type=int, default=16, help="동시 클라이언트 수")
+    parser.add_argument('--sessions', type=int, default=2, help="클라이언트당 세션 수")
+    parser.add_argument('--timeout', type=float, default=60.0, help="쿼리 하나의 제한 시간(초)")
+    parser.add_argument('--input', default=DEFAULT_CSV, help="시드 레코드로 쓸 연락처 파일")
+    parser.add_argument('--detail', action='store_true', help="쿼리별 내역 출력")
+    parser.add_argument('--seed', type=int, default=0, help="난수 시드")
+    args = parser.parse_args(argv)
+
+    if not os.environ.get('FIRESTORE_EMULATOR_HOST'):
+        print("❌ 에뮬레이터 전용입니다. FIRESTORE_EMULATOR_HOST 를 설정하세요.")
+        return 1
+
+    from gnhs_tools.firebase import get_db
+    db = get_db()
+    rng = random.Random(args.seed)
+    seed_activity(db, rng)
+    probe = Probe(args.timeout)
+
+    for size in sorted(int(s) for s in args.sizes.split(',')):
+        start = time.perf_counter()
+        added = seed_alumni(db, size, args.input)
+        if added:
+            print(f"🌱 alumni {added:,}명 추가 ({time.perf_counter() - start:.0f}초)")
+        classes = list(range(1, 51))
+        results = Results()
+        total_sessions = args.clients * args.sessions
+
+        def client(n):
+            client_rng = random.Random(args.seed * 1000 + n)
+            for _ in range(args.sessions):
+                run_session(db, probe, client_rng, classes, results)
+
+        with ThreadPoolExecutor(args.clients) as pool:
+            list(pool.map(client, range(args.clients)))
+        report(size, results, total_sessions, args.detail)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
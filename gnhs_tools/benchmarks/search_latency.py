@@ -0,0 +1,104 @@
+"""
+검색 지연 시간 측정
+
+연락처 파일(또는 export 스냅샷)로 색인을 만든 뒤, 프로세스 안에서 검색
+함수 자체의 지연 시간을 재고, 임시 포트에 검색 서버를 띄워 여러 스레드로
+동시에 요청했을 때의 p50/p95/p99 와 초당 처리량을 출력합니다.
+
+    python -m gnhs_tools.benchmarks.search_latency [--input contacts.csv] [--clients 8]
+"""
+import argparse
+import statistics
+import sys
+import threading
+import time
+import urllib.request
+from urllib.parse import quote
+
+from gnhs_tools.contacts import DEFAULT_CSV
+
+QUERIES = ('김', '이영', 'ㄱㅊㅅ', 'ㅂㅈ', '강릉시청', '삼성', '강릉 김', '서울 강남구',
+           '교동 ㅂ', '3490', '010', '교사', '한국전력', '원주 ㅇ')
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def _report(label, times_ms, elapsed=None):
+    line = (f"{label}: p50 {_percentile(times_ms, 50):.3f}ms / p95 {_percentile(times_ms, 95):.3f}ms"
+            f" / p99 {_percentile(times_ms, 99):.3f}ms / 평균 {statistics.mean(times_ms):.3f}ms")
+    if elapsed:
+        line += f" / {len(times_ms) / elapsed:,.0f} QPS"
+    print(line)
+
+
+def _load(args):
+    from gnhs_tools.search import load_index, snapshot_records
+    if args.snapshot:
+        return load_index(snapshot_records(args.snapshot))
+    from gnhs_tools.contacts import iter_alumni
+    return load_index(iter_alumni(args.input))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--input', default=DEFAULT_CSV)
+    parser.add_argument('--snapshot', metavar='JSONL')
+    parser.add_argument('--rounds', type=int, default=200, help="검색어별 반복 횟수 (프로세스 내)")
+    parser.add_argument('--clients', type=int, default=8, help="동시 HTTP 클라이언트 수")
+    parser.add_argument('--requests', type=int, default=500, help="클라이언트당 요청 수")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    index = _load(args)
+    print(f"🔎 색인: {len(index)}명 ({(time.perf_counter() - start) * 1000:.0f}ms)")
+
+    print("\n📋 검색어별 (프로세스 내):")
+    overall = []
+    for query in QUERIES:
+        times = []
+        for _ in range(args.rounds):
+            t = time.perf_counter()
+            total = index.search(query)['total']
+            times.append((time.perf_counter() - t) * 1000)
+        overall.extend(times)
+        _report(f"  {query!r:14} {total:5}건", times)
+    _report("\n⏱️  전체", overall)
+
+    from gnhs_tools.search import make_server
+    server = make_server(index, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base = f"http://127.0.0.1:{server.server_address[1]}/search?q="
+
+    latencies = []
+    lock = threading.Lock()
+
+    def client(n):
+        local = []
+        for i in range(args.requests):
+            url = base + quote(QUERIES[(n + i) % len(QUERIES)])
+            t = time.perf_counter()
+            with urllib.request.urlopen(url) as response:
+                response.read()
+            local.append((time.perf_counter() - t) * 1000)
+        with lock:
+            latencies.extend(local)
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=client, args=(n,)) for n in range(args.clients)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    server.shutdown()
+    server.server_close()
+
+    _report(f"🌐 HTTP ({args.clients}개 클라이언트 × {args.requests}회)", latencies, elapsed)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,88 @@
+"""
+CLI 시작 시간 측정
+
+`--help` 와 dry-run 경로가 Firebase SDK/gRPC 를 로드하지 않고 100ms 안에
+시작하는지 확인합니다.
+
+    python -m gnhs_tools.benchmarks.startup [--runs 20] [--limit-ms 100]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+COMMANDS = (
+    ('--help', ['-m', 'gnhs_tools', '--help']),
+    ('import --help', ['-m', 'gnhs_tools', 'import', '--help']),
+    ('dry-run 경로 import', ['-c', 'import gnhs_tools.cli, gnhs_tools.importer, gnhs_tools.backends']),
+)
+
+# dry-run 경로에서 로드되면 안 되는 모듈
+HEAVY_MODULES = ('firebase_admin', 'google.cloud.firestore', 'grpc')
+
+_CHECK_HEAVY = (
+    "import sys, gnhs_tools.cli, gnhs_tools.importer, gnhs_tools.backends;"
+    "print(','.join(m for m in {mods!r} if m in sys.modules))"
+)
+
+
+def _run(argv):
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + argv, stdout=subprocess.DEVNULL, check=True)
+    return (time.perf_counter() - start) * 1000
+
+
+def _top_imports(argv, top=5):
+    """-X importtime 결과에서 누적 시간이 큰 모듈"""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime'] + argv,
+        stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True, check=True)
+    rows = []
+    for line in result.stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name = line[len('import time:'):].split('|')
+        rows.append((int(cumulative), name.strip()))
+    return sorted(rows, reverse=True)[:top]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--runs', type=int, default=20)
+    parser.add_argument('--limit-ms', type=float, default=100.0)
+    args = parser.parse_args(argv)
+
+    env_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+    os.chdir(env_root)
+
+    baseline = statistics.median(_run(['-c', 'pass']) for _ in range(args.runs))
+    print(f"🐍 인터프리터 기본 시작 시간: {baseline:.1f}ms")
+
+    failed = False
+    for label, command in COMMANDS:
+        times = [_run(command) for _ in range(args.runs)]
+        median = statistics.median(times)
+        mark = '✅' if median < args.limit_ms else '❌'
+        failed |= median >= args.limit_ms
+        print(f"{mark} {label}: 중앙값 {median:.1f}ms / 최대 {max(times):.1f}ms ({args.runs}회)")
+
+    print("\n⏱️  import 누적 시간 상위 모듈 (dry-run 경로):")
+    for cumulative, name in _top_imports(COMMANDS[-1][1]):
+        print(f"  {cumulative / 1000:7.2f}ms  {name}")
+
+    loaded = subprocess.run(
+        [sys.executable, '-c', _CHECK_HEAVY.format(mods=HEAVY_MODULES)],
+        capture_output=True, text=True, check=True).stdout.strip()
+    if loaded:
+        print(f"\n❌ dry-run 경로에서 무거운 모듈이 로드됨: {loaded}")
+        failed = True
+    else:
+        print("\n✅ dry-run 경로에서 Firebase SDK/gRPC 미로드")
+
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
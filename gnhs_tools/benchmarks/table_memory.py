@@ -0,0 +1,86 @@
+"""
+열 단위 동문 표 메모리/질의 시간 측정
+
+연락처 파일의 동문을 가짜 문서 ID 로 복제해서 --rows 명까지 늘린 뒤,
+행마다 딕셔너리를 들고 있는 방식과 AlumniTable 의 메모리 사용량
+(tracemalloc)과 대표 질의 시간을 비교합니다.
+
+    python -m gnhs_tools.benchmarks.table_memory --rows 1000000
+"""
+import argparse
+import sys
+import time
+import tracemalloc
+
+from gnhs_tools.contacts import DEFAULT_CSV
+
+
+def synthetic_records(base, rows):
+    """base 레코드를 돌려 쓰면서 문서 ID 만 바꾼 (문서 ID, 데이터)"""
+    for n in range(rows):
+        data = dict(base[n % len(base)][1])
+        data['phone'] = f"0107{n:07d}"
+        yield data['phone'], data
+
+
+def _measure(label, build):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print(f"  {label}: {size / 1024 / 1024:,.1f}MB ({elapsed:.1f}초)")
+    return result
+
+
+def _time(label, func, rounds=20):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = func()
+    print(f"  {label}: {(time.perf_counter() - start) * 1000 / rounds:.2f}ms")
+    return result
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--input', default=DEFAULT_CSV)
+    parser.add_argument('--rows', type=int, default=1_000_000, help="복제할 동문 수")
+    args = parser.parse_args(argv)
+
+    from gnhs_tools.contacts import iter_alumni
+    from gnhs_tools.sync import TIMESTAMP_FIELDS
+    from gnhs_tools.table import AlumniTable
+
+    base = [(doc_id, {k: v for k, v in data.items() if k not in TIMESTAMP_FIELDS})
+            for doc_id, data in iter_alumni(args.input)]
+    print(f"📋 {len(base)}명 → {args.rows:,}명으로 복제")
+
+    print("\n💾 메모리:")
+    records = _measure("딕셔너리", lambda: dict(synthetic_records(base, args.rows)))
+    table = _measure("AlumniTable", lambda: AlumniTable.from_records(synthetic_records(base, args.rows)))
+
+    print("\n⏱️  질의 (회차 20~25 & 강릉 & 이메일 없음 → 직장별 인원):")
+
+    def dict_query():
+        counts = {}
+        for data in records.values():
+            if 20 <= data['class_number'] <= 25 and '강릉' in data.get('address_sigungu', '') \
+                    and not data['email'] and data['company']:
+                counts[data['company']] = counts.get(data['company'], 0) + 1
+        return counts
+
+    def table_query():
+        mask = table.between('class_number', 20, 25) & table.contains('address_sigungu', '강릉') \
+            & ~table.columns['has_email']
+        return table.group_count('company', mask)
+
+    expected = _time("딕셔너리", dict_query, rounds=3)
+    groups = _time("AlumniTable", table_query)
+    ok = dict(groups) == expected
+    print(f"\n{'✅' if ok else '❌'} 결과 일치 ({len(groups)}개 직장)")
+    return 0 if ok else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
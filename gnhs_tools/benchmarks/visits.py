@@ -0,0 +1,170 @@
+"""
+동시 접속 기록 시뮬레이터 (에뮬레이터 전용)
+
+접속 기록을 여러 스레드로 동시에 보내서, 현재 방식(날짜 문서 하나를
+트랜잭션으로 갱신)과 샤드 방식의 처리량, 지연 시간, 트랜잭션 중단 횟수를
+비교합니다. 실행이 끝나면 기록된 접속 수가 성공 건수와 같은지 확인합니다.
+
+    FIRESTORE_EMULATOR_HOST=localhost:8080 \\
+        python -m gnhs_tools.benchmarks.visits --visits 2000 --concurrency 64
+"""
+import argparse
+import datetime
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# 현재 방식 트랜잭션 재시도 횟수 (Flutter runTransaction 기본값과 같음)
+MAX_ATTEMPTS = 5
+
+
+def record_visit_single(db, day, user_id, user_name, counters):
+    """visit_stats_service.dart 의 recordVisit 과 같은 트랜잭션 (중단 횟수 집계)"""
+    from gnhs_tools.firebase import firestore_module
+    from gnhs_tools.visits import VISIT_COLLECTION
+    firestore = firestore_module()
+    ref = db.collection(VISIT_COLLECTION).document(day)
+    attempts = [0]
+
+    @firestore.transactional
+    def visit(transaction):
+        attempts[0] += 1
+        snapshot = ref.get(transaction=transaction)
+        entry = {'user_id': user_id, 'user_name': user_name,
+                 'timestamp': datetime.datetime.now(datetime.timezone.utc)}
+        if snapshot.exists:
+            data = snapshot.to_dict() or {}
+            transaction.update(ref, {
+                'count': data.get('count', 0) + 1,
+                'last_visit': firestore.SERVER_TIMESTAMP,
+                'visited_users': [entry] + data.get('visited_users', []),
+            })
+        else:
+            transaction.set(ref, {
+                'date': day,
+                'count': 1,
+                'created_at': firestore.SERVER_TIMESTAMP,
+                'last_visit': firestore.SERVER_TIMESTAMP,
+                'visited_users': [entry],
+            })
+
+    ok = True
+    try:
+        visit(db.transaction(max_attempts=MAX_ATTEMPTS))
+    except Exception:
+        # 재시도 횟수를 넘기면 SDK 가 ValueError/Aborted 를 발생시킴
+        ok = False
+    with counters['lock']:
+        counters['aborted'] += attempts[0] - (1 if ok else 0)
+    return ok
+
+
+def record_visit_sharded_counted(db, day, user_id, user_name, shards, counters):
+    """샤드 방식 기록 (예외는 실패로, 경합으로 중단된 쓰기는 중단 횟수로 집계)"""
+    from google.api_core.exceptions import Aborted
+    from gnhs_tools.visits import record_visit_sharded
+
+    try:
+        record_visit_sharded(db, day, user_id, user_name, shards)
+        return True
+    except Exception as e:
+        if isinstance(e, Aborted):
+            with counters['lock']:
+                counters['aborted'] += 1
+        return False
+
+
+def _percentile(values, pct):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] if ordered else 0.0
+
+
+def simulate(db, layout, visits, concurrency, shards, day):
+    counters = {'lock': threading.Lock(), 'aborted': 0, 'failed': 0}
+    latencies = []
+
+    def one(n):
+        user_id, user_name = f"0109999{n:04d}", f"부하{n}"
+        start = time.perf_counter()
+        if layout == 'single':
+            ok = record_visit_single(db, day, user_id, user_name, counters)
+        else:
+            ok = record_visit_sharded_counted(db, day, user_id, user_name, shards, counters)
+        elapsed = (time.perf_counter() - start) * 1000
+        with counters['lock']:
+            latencies.append(elapsed)
+            counters['failed'] += not ok
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(concurrency) as pool:
+        list(pool.map(one, range(visits)))
+    elapsed = time.perf_counter() - start
+    return {
+        'elapsed': elapsed,
+        'throughput': visits / elapsed,
+        'aborted': counters['aborted'],
+        'failed': counters['failed'],
+        'p50': _percentile(latencies, 50),
+        'p95': _percentile(latencies, 95),
+        'p99': _percentile(latencies, 99),
+        'mean': statistics.mean(latencies) if latencies else 0.0,
+    }
+
+
+def recorded_count(db, day):
+    from gnhs_tools.visits import VISIT_COLLECTION
+    doc = db.collection(VISIT_COLLECTION).document(day).get()
+    return (doc.to_dict() or {}).get('count', 0) if doc.exists else 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--layout', choices=('single', 'sharded', 'both'), default='both')
+    parser.add_argument('--visits', type=int, default=2000, help="보낼 접속 기록 수")
+    parser.add_argument('--concurrency', type=int, default=64, help="동시 클라이언트 수")
+    parser.add_argument('--shards', type=int, default=10, help="샤드 수")
+    args = parser.parse_args(argv)
+
+    if not os.environ.get('FIRESTORE_EMULATOR_HOST'):
+        print("❌ 에뮬레이터 전용입니다. FIRESTORE_EMULATOR_HOST 를 설정하세요.")
+        return 1
+
+    from gnhs_tools.firebase import get_db
+    from gnhs_tools.visits import compact
+
+    db = get_db()
+    layouts = ('single', 'sharded') if args.layout == 'both' else (args.layout,)
+    run_id = datetime.datetime.now().strftime('%H%M%S')
+    failed = False
+    for layout in layouts:
+        # 실제 날짜 문서와 겹치지 않는 키 사용
+        day = f"loadtest-{run_id}-{layout}"
+        result = simulate(db, layout, args.visits, args.concurrency, args.shards, day)
+        if layout == 'sharded':
+            fold_start = time.perf_counter()
+            try:
+                compact(db)
+            except Exception as e:
+                # 압축 트랜잭션이 재시도 횟수를 넘긴 경우 (아래 접속 수 확인이 실패로 표시)
+                print(f"❌ 압축 실패: {type(e).__name__}: {e}")
+            result['compact_ms'] = (time.perf_counter() - fold_start) * 1000
+        recorded = recorded_count(db, day)
+        expected = args.visits - result['failed']
+        ok = recorded == expected
+        failed |= not ok
+
+        print(f"\n📊 {layout} ({args.visits}회, 동시 {args.concurrency})")
+        print(f"  처리량 {result['throughput']:.0f}회/초 ({result['elapsed']:.2f}초)")
+        print(f"  지연 p50 {result['p50']:.1f}ms / p95 {result['p95']:.1f}ms / p99 {result['p99']:.1f}ms")
+        print(f"  트랜잭션/쓰기 중단 {result['aborted']}회 / 실패 {result['failed']}건")
+        if 'compact_ms' in result:
+            print(f"  압축 {result['compact_ms']:.0f}ms")
+        print(f"  {'✅' if ok else '❌'} 기록된 접속 수 {recorded} / 기대값 {expected}")
+    return 1 if failed else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,230 @@
+"""
+Firestore 데이터 번들 빌더
+
+홈 화면과 회차별 명단 화면이 실행할 때마다 보내는 쿼리 결과를 미리
+Firestore 데이터 번들(이름 있는 쿼리 포함)로 만들어 build/web/bundles 에
+정적 파일로 둡니다. 앱은 CDN/브라우저 캐시에서 번들을 받아 loadBundle 한 뒤
+namedQueryGet 으로 읽으므로, 콜드 스타트에 문서 읽기 비용이 들지 않습니다.
+
+- home: 최근 수정 동문 6명(recent-alumni), 활성 공지(active-notices),
+  집계 문서 aggregates/summary
+- class-{회차}: 회차별 명단. 앱처럼 class_number 와 graduation_year (구버전
+  데이터) 두 쿼리를 이름 있는 쿼리 class-{회차}, class-{회차}-graduation_year 로
+  담으므로, 앱은 두 결과를 문서 ID 로 합치면 됩니다.
+
+번들 파일 이름에 내용 해시를 붙여서(class-25.1a2b3c4d.bundle) 오래 캐시하고,
+어떤 파일이 최신인지는 짧게 캐시하는 index.json 에 기록합니다. 다시 빌드할
+때는 지난 빌드 이후 updated_at 이 바뀐 문서가 속한 회차와 인원 수가 달라진
+회차만 다시 만듭니다.
+
+    python -m gnhs_tools bundles                    # 한 번 빌드
+    python -m gnhs_tools bundles --every 600        # 10분마다 빌드
+"""
+import datetime
+import hashlib
+import json
+import os
+import time
+
+from gnhs_tools.address import AGGREGATE_COLLECTION
+from gnhs_tools.aggregates import SUMMARY_AGGREGATE_ID, class_of
+from gnhs_tools.contacts import COLLECTION
+from gnhs_tools.cost import COSTS
+from gnhs_tools.errors import ToolError
+from gnhs_tools.metrics import METRICS
+
+DEFAULT_OUTPUT = os.path.join('build', 'web', 'bundles')
+MANIFEST_NAME = 'index.json'
+NOTICE_COLLECTION = 'notices'
+
+# 홈 화면의 최근 동문 수 (home_screen.dart 의 limit(6))
+RECENT_LIMIT = 6
+
+# 앱 기기 시계로 기록한 updated_at 의 오차를 감안해서 겹쳐 읽는 시간
+SINCE_OVERLAP = datetime.timedelta(minutes=10)
+
+
+def _bundle_class():
+    try:
+        from google.cloud.firestore_bundle import FirestoreBundle
+    except ImportError as e:
+        raise ToolError("번들을 만들려면 google-cloud-firestore 2.1 이상이 필요합니다: "
+                        "pip install -U firebase-admin") from e
+    return FirestoreBundle
+
+
+def home_queries(db):
+    """{이름 있는 쿼리: 쿼리} (home_screen.dart 와 같은 모양)"""
+    from gnhs_tools.firebase import firestore_module
+    firestore = firestore_module()
+    return {
+        'recent-alumni': db.collection(COLLECTION)
+        .order_by('updated_at', direction=firestore.Query.DESCENDING)
+        .limit(RECENT_LIMIT),
+        'active-notices': db.collection(NOTICE_COLLECTION).where('is_active', '==', True),
+    }
+
+
+def class_queries(db, class_number):
+    """{이름 있는 쿼리: 쿼리} (class_alumni_list_screen.dart 의 회차별 쿼리 두 개)"""
+    name = f"class-{class_number}"
+    return {
+        name: db.collection(COLLECTION).where('class_number', '==', class_number),
+        f"{name}-graduation_year": db.collection(COLLECTION).where('graduation_year', '==', class_number),
+    }
+
+
+def build_bundle(name, queries, documents=()):
+    """번들 바이트 생성 (queries: {이름: 쿼리}, documents: 추가할 스냅샷)"""
+    bundle = _bundle_class()(name)
+    for query_name, query in queries.items():
+        with METRICS.timer('bundle_query'):
+            bundle.add_named_query(query_name, query)
+    # add_named_query 가 쿼리를 실행하며 읽은 문서 (빈 쿼리도 1회 과금)
+    COSTS.read(f"bundle:{name}", count=max(len(getattr(bundle, 'documents', ())), len(queries)))
+    for snapshot in documents:
+        if snapshot.exists:
+            bundle.add_document(snapshot)
+    return bundle.build().encode('utf-8')
+
+
+def class_counts(db, summary=None):
+    """{회차 문자열: 인원} (집계 문서가 있으면 그 값, 없으면 필드 제한 전체 읽기)"""
+    if summary is None:
+        summary = db.collection(AGGREGATE_COLLECTION).document(SUMMARY_AGGREGATE_ID).get()
+        COSTS.read(AGGREGATE_COLLECTION)
+    if summary.exists and (summary.to_dict() or {}).get('classes'):
+        return dict(summary.to_dict()['classes'])
+    counts = {}
+    query = db.collection(COLLECTION).select(['class_number', 'graduation_year'])
+    for doc in COSTS.reads(COLLECTION, query.stream()):
+        class_number = class_of(doc.to_dict() or {})
+        if class_number:
+            key = str(class_number)
+            counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def changed_classes(db, since):
+    """since 이후 updated_at 이 바뀐 문서가 속한 회차 (문자열 집합)
+
+    문서는 class_number 와 graduation_year 두 쿼리 모두에 걸릴 수 있으므로 두 값을 다 씁니다.
+    """
+    query = (db.collection(COLLECTION)
+             .where('updated_at', '>', since)
+             .select(['class_number', 'graduation_year']))
+    classes = set()
+    for doc in COSTS.reads(COLLECTION, query.stream()):
+        data = doc.to_dict() or {}
+        for value in (data.get('class_number'), data.get('graduation_year')):
+            if isinstance(value, int) and value > 0:
+                classes.add(str(value))
+    return classes
+
+
+def load_manifest(output):
+    path = os.path.join(output, MANIFEST_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _write_atomic(path, data):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(data)
+    os.replace(tmp_path, path)
+
+
+class BundleBuilder:
+    """번들 파일과 index.json 을 output 디렉터리에 기록"""
+
+    def __init__(self, db, output=DEFAULT_OUTPUT):
+        self.db = db
+        self.output = output
+        os.makedirs(output, exist_ok=True)
+
+    def _publish(self, manifest, name, data):
+        digest = hashlib.sha256(data).hexdigest()
+        filename = f"{name}.{digest[:8]}.bundle"
+        _write_atomic(os.path.join(self.output, filename), data)
+        manifest['bundles'][name] = {'file': filename, 'sha256': digest, 'bytes': len(data)}
+
+    def _cleanup(self, manifest):
+        """index.json 이 가리키지 않는 번들 파일 삭제"""
+        keep = {entry['file'] for entry in manifest['bundles'].values()}
+        removed = 0
+        for filename in os.listdir(self.output):
+            if filename.endswith('.bundle') and filename not in keep:
+                os.remove(os.path.join(self.output, filename))
+                removed += 1
+        return removed
+
+    def build(self, full=False):
+        """번들 갱신 (통계 딕셔너리 반환)"""
+        started = datetime.datetime.now(datetime.timezone.utc)
+        manifest = {} if full else load_manifest(self.output)
+        manifest.setdefault('bundles', {})
+        stats = {'built': 0, 'dropped': 0, 'removed': 0, 'classes': 0}
+
+        summary = self.db.collection(AGGREGATE_COLLECTION).document(SUMMARY_AGGREGATE_ID).get()
+        COSTS.read(AGGREGATE_COLLECTION)
+        home = build_bundle('home', home_queries(self.db), [summary])
+        self._publish(manifest, 'home', home)
+        stats['built'] += 1
+
+        counts = class_counts(self.db, summary)
+        previous_counts = manifest.get('class_counts', {})
+        since = manifest.get('since')
+        if full or since is None:
+            targets = set(counts)
+        else:
+            since = datetime.datetime.fromisoformat(since)
+            targets = changed_classes(self.db, since)
+            targets |= {key for key in set(counts) | set(previous_counts)
+                        if counts.get(key) != previous_counts.get(key)}
+
+        for key in sorted(targets, key=int):
+            name = f"class-{key}"
+            if key not in counts:
+                # 인원이 0명이 된 회차
+                if manifest['bundles'].pop(name, None):
+                    stats['dropped'] += 1
+                continue
+            with METRICS.timer('bundle_class'):
+                data = build_bundle(name, class_queries(self.db, int(key)))
+            self._publish(manifest, name, data)
+            stats['built'] += 1
+        stats['classes'] = len(targets)
+
+        manifest['class_counts'] = counts
+        manifest['since'] = (started - SINCE_OVERLAP).isoformat()
+        manifest['generated_at'] = started.isoformat()
+        _write_atomic(os.path.join(self.output, MANIFEST_NAME),
+                      json.dumps(manifest, ensure_ascii=False, indent=1, sort_keys=True).encode('utf-8'))
+        stats['removed'] = self._cleanup(manifest)
+        return stats
+
+
+def run_bundles(args):
+    from gnhs_tools.firebase import get_db
+
+    print("=" * 70)
+    print(f"📦 Firestore 데이터 번들 빌드 → {args.output}")
+    print("=" * 70)
+
+    builder = BundleBuilder(get_db(), args.output)
+    full = args.full
+    while True:
+        start = time.perf_counter()
+        stats = builder.build(full=full)
+        print(f"✅ 번들 {stats['built']}개 기록 / 빈 회차 제외 {stats['dropped']}개 / "
+              f"다시 계산한 회차 {stats['classes']}개 / 오래된 파일 삭제 {stats['removed']}개 "
+              f"({time.perf_counter() - start:.1f}초)")
+        if not args.every:
+            break
+        full = False
+        time.sleep(args.every)
+    print("🚀 firebase deploy --only hosting 으로 배포하세요.")
+    return 0
@@ -0,0 +1,306 @@
+"""
+gnhs_tools 명령행 인터페이스
+
+각 서브커맨드의 구현 모듈은 실행 시점에만 import 합니다. 이 모듈은 표준
+라이브러리만 사용하므로 `--help` 와 인자 검증은 SDK 로드 없이 끝납니다.
+"""
+import argparse
+import importlib
+
+from gnhs_tools.contacts import DEFAULT_CSV
+
+# sources.SOURCES 의 키 (도움말을 위해 sources 모듈을 import 하지 않음)
+SOURCE_FORMATS = ('google-csv', 'csv', 'vcard', 'excel', 'jsonl')
+
+
+def _command(parser, handler):
+    """서브커맨드 처리 함수를 'module:function' 문자열로 등록 (지연 import)"""
+    parser.set_defaults(handler=handler)
+
+
+def _add_csv(parser):
+    parser.add_argument('--csv', '--input', dest='csv', default=DEFAULT_CSV,
+                        help=f"연락처 파일 경로 (기본값: {DEFAULT_CSV})")
+    parser.add_argument('--format', choices=SOURCE_FORMATS,
+                        help="입력 형식 (생략하면 확장자로 판단: .csv .vcf .xlsx .jsonl)")
+    parser.add_argument('--mapping', metavar='JSON', help="{표준 키: 원본 컬럼} 컬럼 매핑 파일")
+
+
+def _add_dry_run(parser):
+    parser.add_argument('--dry-run', action='store_true', help="Firestore 에 기록하지 않고 작업 수만 출력")
+    parser.add_argument('--record', metavar='LOG', help="dry-run 으로 실행하면서 쓰기 작업을 로그 파일에 기록")
+
+
+def _add_yes(parser):
+    parser.add_argument('-y', '--yes', action='store_true', help="삭제 확인 질문 생략")
+
+
+def _add_no_backup(parser):
+    parser.add_argument('--no-backup', action='store_true', help="삭제 전 자동 백업(backups/) 생략")
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='python -m gnhs_tools',
+        description="강릉고등학교 총동문회 Firestore 데이터 관리 도구",
+    )
+    parser.add_argument('--metrics', metavar='PATH',
+                        help="단계별 계측 요약 기록 (.prom 이면 Prometheus textfile, 그 외 JSON)")
+    parser.add_argument('--profile', metavar='PATH', help="cProfile 결과를 PATH 에 저장")
+    parser.add_argument('--trace-memory', action='store_true', help="tracemalloc 으로 메모리 사용량 추적")
+    parser.add_argument('--cost', action='store_true',
+                        help="Firestore 읽기/쓰기/삭제/색인 항목/바이트와 예상 비용 보고")
+    parser.add_argument('--budget-reads', type=int, metavar='N', help="읽기가 N 회를 넘으면 중단 (GNHS_BUDGET_READS)")
+    parser.add_argument('--budget-writes', type=int, metavar='N', help="쓰기가 N 회를 넘으면 중단 (GNHS_BUDGET_WRITES)")
+    parser.add_argument('--budget-deletes', type=int, metavar='N',
+                        help="삭제가 N 회를 넘으면 중단 (GNHS_BUDGET_DELETES)")
+    parser.add_argument('--budget-usd', type=float, metavar='USD', help="예상 비용이 USD 를 넘으면 중단 (GNHS_BUDGET_USD)")
+    sub = parser.add_subparsers(dest='command', metavar='COMMAND')
+    sub.required = True
+
+    p = sub.add_parser('import', help="CSV 를 alumni 컬렉션에 임포트")
+    _add_csv(p)
+    _add_dry_run(p)
+    _add_yes(p)
+    p.add_argument('--overwrite', action='store_true', help="merge 대신 문서 전체 덮어쓰기")
+    p.add_argument('--wipe', action='store_true', help="임포트 전에 기존 alumni 문서 모두 삭제")
+    _add_no_backup(p)
+    p.add_argument('--diff', action='store_true', help="현재 상태와 비교해서 바뀐 필드만 update()")
+    p.add_argument('--mirror', metavar='JSONL',
+                   help="--diff 비교 기준으로 Firestore 대신 로컬 미러 사용 (실행 후 갱신)")
+    _command(p, 'gnhs_tools.importer:run_import')
+
+    p = sub.add_parser('update', help="기존 문서에 CSV 추가 필드 반영")
+    _add_csv(p)
+    _add_dry_run(p)
+    _command(p, 'gnhs_tools.importer:run_update')
+
+    p = sub.add_parser('diff', help="연락처 파일 두 개를 비교해서 추가/삭제/변경 내역과 최소 쓰기 작업 생성")
+    p.add_argument('old', help="이전 연락처 파일")
+    p.add_argument('new', help="새 연락처 파일")
+    p.add_argument('--format', choices=SOURCE_FORMATS,
+                   help="입력 형식 (생략하면 확장자로 판단: .csv .vcf .xlsx .jsonl)")
+    p.add_argument('--mapping', metavar='JSON', help="{표준 키: 원본 컬럼} 컬럼 매핑 파일")
+    p.add_argument('-o', '--output', metavar='JSONL', help="전체 비교 내역을 JSONL 로 기록")
+    p.add_argument('--show', type=int, default=20, help="화면에 보여줄 변경 예시 수 (기본값: 20)")
+    p.add_argument('--run-rows', type=int, default=200_000,
+                   help="메모리에서 정렬할 레코드 수, 넘으면 임시 파일로 외부 정렬 (기본값: 200000)")
+    p.add_argument('--delete-removed', action='store_true', help="새 파일에 없는 동문 문서 삭제도 쓰기 작업에 포함")
+    p.add_argument('--record', metavar='LOG', help="쓰기 작업을 로그 파일에 기록 (replay 로 반영)")
+    p.add_argument('--apply', action='store_true', help="쓰기 작업을 Firestore 에 바로 반영")
+    _command(p, 'gnhs_tools.contactdiff:run_diff')
+
+    p = sub.add_parser('reconcile', help="연락처 파일과 Firestore 를 대조해서 불일치를 종류별로 보고하고 고치는 쓰기 생성")
+    _add_csv(p)
+    p.add_argument('--workers', type=int, default=8, help="Firestore 병렬 읽기 파티션 수 (기본값: 8)")
+    p.add_argument('-o', '--output', metavar='JSONL', help="불일치 전체 내역을 JSONL 로 기록")
+    p.add_argument('--show', type=int, default=20, help="화면에 보여줄 불일치 예시 수 (기본값: 20)")
+    p.add_argument('--run-rows', type=int, default=200_000,
+                   help="메모리에서 정렬할 레코드 수, 넘으면 임시 파일로 외부 정렬 (기본값: 200000)")
+    p.add_argument('--delete-orphans', action='store_true', help="연락처 파일에 없는 문서 삭제도 쓰기 작업에 포함")
+    p.add_argument('--record', metavar='LOG', help="쓰기 작업을 로그 파일에 기록 (replay 로 반영)")
+    p.add_argument('--apply', action='store_true', help="쓰기 작업을 Firestore 에 바로 반영")
+    _command(p, 'gnhs_tools.reconcile:run_reconcile')
+
+    p = sub.add_parser('migrate', help="graduation_year 년도 → 회차 변환")
+    _add_dry_run(p)
+    _command(p, 'gnhs_tools.maintenance:run_migrate')
+
+    p = sub.add_parser('regions', help="주소로 지역 필드 재계산 + 지역별 집계 문서 갱신")
+    _add_dry_run(p)
+    _command(p, 'gnhs_tools.address:run_regions')
+
+    p = sub.add_parser('companies', help="직장명 정규화/묶기 + 직장별 동문 색인 문서 갱신")
+    p.add_argument('--input', help="Firestore 대신 연락처 파일로 색인 계산 (company_key 는 기록하지 않음)")
+    p.add_argument('--format', choices=SOURCE_FORMATS)
+    p.add_argument('--mapping', metavar='JSON')
+    p.add_argument('--threshold', type=float, default=0.9, help="같은 직장으로 볼 유사도 (기본값: 0.9)")
+    _add_dry_run(p)
+    _command(p, 'gnhs_tools.companies:run_companies')
+
+    p = sub.add_parser('rosters', help="회차/그룹(Labels)별 명단 문서를 rosters 컬렉션에 갱신")
+    p.add_argument('--input', help="Firestore 대신 연락처 파일로 명단 계산")
+    p.add_argument('--format', choices=SOURCE_FORMATS)
+    p.add_argument('--mapping', metavar='JSON')
+    _add_dry_run(p)
+    _command(p, 'gnhs_tools.rosters:run_rosters')
+
+    p = sub.add_parser('aggregate-worker', help="alumni 변경을 구독해서 집계 문서를 증분 갱신")
+    p.add_argument('--interval', type=float, default=2.0, help="변경을 묶어서 반영할 간격(초) (기본값: 2)")
+    p.add_argument('--mirror', metavar='JSONL', help="로컬 미러도 함께 갱신 (import --diff 비교 기준)")
+    p.add_argument('--once', action='store_true', help="구독하지 않고 전체 읽기로 한 번만 갱신")
+    _add_dry_run(p)
+    _command(p, 'gnhs_tools.aggregates:run_worker')
+
+    p = sub.add_parser('bundles', help="홈/회차별 명단 Firestore 데이터 번들을 build/web 에 생성")
+    p.add_argument('-o', '--output', default='build/web/bundles', help="출력 디렉터리 (기본값: build/web/bundles)")
+    p.add_argument('--full', action='store_true', help="바뀐 회차만이 아니라 전체 다시 빌드")
+    p.add_argument('--every', type=float, metavar='SECONDS', help="SECONDS 초마다 반복 빌드")
+    _command(p, 'gnhs_tools.bundles:run_bundles')
+
+    p = sub.add_parser('photos', help="프로필 사진 썸네일 병렬 생성 + build/web/photos 게시 + profile_photo_url 갱신 (Pillow 필요)")
+    source = p.add_mutually_exclusive_group(required=True)
+    source.add_argument('--dir', help="사진 디렉터리 (파일 이름 = 전화번호)")
+    source.add_argument('--input', help="Photo 열이 있는 연락처 파일 (URL 또는 파일 경로)")
+    p.add_argument('--format', choices=SOURCE_FORMATS)
+    p.add_argument('--mapping', metavar='JSON')
+    p.add_argument('--image-format', choices=('webp', 'jpeg'), default='webp', help="썸네일 형식 (기본값: webp)")
+    p.add_argument('--sizes', default='96,256,768', help="정사각형 썸네일 크기 목록 (기본값: 96,256,768)")
+    p.add_argument('--workers', type=int, help="변환 프로세스 수 (기본값: CPU 수)")
+    p.add_argument('--store', default='photos', help="썸네일 저장소 디렉터리 (기본값: photos)")
+    p.add_argument('--publish', default='build/web/photos', help="게시 디렉터리 (기본값: build/web/photos)")
+    p.add_argument('--base-url', default='https://gnhs-alumni.web.app', help="호스팅 주소 (기본값: https://gnhs-alumni.web.app)")
+    p.add_argument('--force', action='store_true', help="앱에서 올린 사진도 덮어쓰기")
+    _add_dry_run(p)
+    _command(p, 'gnhs_tools.photos:run_photos')
+
+    p = sub.add_parser('compact-visits', help="접속 통계 샤드를 날짜 문서에 합치기")
+    p.add_argument('--every', type=float, metavar='SECONDS', help="SECONDS 초마다 반복")
+    _command(p, 'gnhs_tools.visits:run_compact')
+
+    p = sub.add_parser('serve-search', help="메모리 역색인 기반 동문 검색 HTTP 서버")
+    p.add_argument('--snapshot', metavar='JSONL', help="Firestore 대신 export JSONL 스냅샷으로 색인")
+    p.add_argument('--input', help="Firestore 대신 연락처 파일로 색인")
+    p.add_argument('--host', default='127.0.0.1', help="바인드 주소 (기본값: 127.0.0.1)")
+    p.add_argument('--port', type=int, default=8765, help="포트 (기본값: 8765)")
+    _command(p, 'gnhs_tools.search:run_serve')
+
+    p = sub.add_parser('query', help="열 단위 메모리 표로 동문 필터/집계/조인 (numpy 필요)")
+    p.add_argument('--input', metavar='FILE', help="Firestore 대신 연락처 파일로 표 생성")
+    p.add_argument('--snapshot', metavar='JSONL', help="Firestore 대신 export/미러 JSONL 로 표 생성")
+    p.add_argument('--format', choices=SOURCE_FORMATS,
+                   help="입력 형식 (생략하면 확장자로 판단: .csv .vcf .xlsx .jsonl)")
+    p.add_argument('--mapping', metavar='JSON', help="{표준 키: 원본 컬럼} 컬럼 매핑 파일")
+    p.add_argument('--class', dest='class_range', metavar='N[-M]', help="회차 (예: 25, 20-25)")
+    p.add_argument('--company', help="직장명에 포함된 문자열")
+    p.add_argument('--region', help="시/도·시/군/구·동에 포함된 문자열")
+    p.add_argument('--verified', action='store_true', help="인증된 동문만")
+    p.add_argument('--missing', action='append', choices=('has_email', 'has_address', 'has_photo'),
+                   help="해당 정보가 없는 동문만 (여러 번 지정 가능)")
+    p.add_argument('--group-by', choices=('class_number', 'company', 'company_key', 'job_title', 'department')
+                   + ('address_sido', 'address_sigungu', 'address_dong'), help="열 값별 인원 집계")
+    p.add_argument('--join', metavar='FILE', help="연락처 파일과 문서 ID 로 조인해서 차이 요약")
+    p.add_argument('--limit', type=int, default=20, help="출력할 행/그룹 수 (기본값: 20)")
+    _command(p, 'gnhs_tools.table:run_query')
+
+    p = sub.add_parser('daemon', help="유지보수 작업 스케줄러 상주 프로세스 (공유 클라이언트, 작업 잠금, /status)")
+    p.add_argument('--config', metavar='JSON', help="작업 일정 설정 파일 (생략하면 기본 일정)")
+    p.add_argument('--jobs', metavar='A,B', help="설정 중 이 작업들만 실행")
+    p.add_argument('--run-now', action='append', metavar='JOB', help="시작하자마자 한 번 실행할 작업")
+    p.add_argument('--list', action='store_true', help="일정과 다음 실행 시각만 출력하고 종료")
+    p.add_argument('--ops-per-second', type=float, default=500.0,
+                   help="모든 작업을 합친 Firestore 작업 속도 제한 (기본값: 500, 0 이면 제한 없음)")
+    p.add_argument('--lock-ttl', type=float, default=600.0, help="작업 잠금 만료 시간(초) (기본값: 600)")
+    p.add_argument('--host', default='127.0.0.1', help="상태 서버 주소 (기본값: 127.0.0.1)")
+    p.add_argument('--port', type=int, default=8790, help="상태 서버 포트 (기본값: 8790)")
+    _command(p, 'gnhs_tools.daemon:run_daemon')
+
+    p = sub.add_parser('wipe', help="컬렉션의 모든 문서 삭제")
+    p.add_argument('--collection', default='alumni', help="삭제할 컬렉션 (기본값: alumni)")
+    _add_dry_run(p)
+    _add_yes(p)
+    _add_no_backup(p)
+    _command(p, 'gnhs_tools.maintenance:run_wipe')
+
+    p = sub.add_parser('analytics-export', help="alumni/접속 통계/활동 로그를 Parquet 데이터셋으로 내보내기 (pyarrow 필요)")
+    p.add_argument('-o', '--output', default='analytics', help="출력 디렉터리 (기본값: analytics)")
+    p.add_argument('--input', help="Firestore 대신 연락처 파일로 alumni 표만 생성")
+    p.add_argument('--format', choices=SOURCE_FORMATS)
+    p.add_argument('--mapping', metavar='JSON')
+    _command(p, 'gnhs_tools.analytics:run_export')
+
+    p = sub.add_parser('backup', help="컬렉션을 압축 스냅샷 파일로 병렬 백업")
+    p.add_argument('-o', '--output', help="백업 디렉터리 (기본값: backups/YYYYmmdd-HHMMSS)")
+    p.add_argument('--collections', help="쉼표로 구분한 최상위 컬렉션 (기본값: 모든 컬렉션, 알려진 하위 컬렉션 포함)")
+    p.add_argument('--probe', metavar='COLLECTIONS',
+                   help="문서마다 하위 컬렉션을 찾아볼 최상위 컬렉션 (문서 수만큼 RPC, 쉼표로 구분)")
+    p.add_argument('--workers', type=int, default=8, help="동시 워커 수 (기본값: 8)")
+    _command(p, 'gnhs_tools.backup:run_backup')
+
+    p = sub.add_parser('restore', help="백업 스냅샷을 Firestore 에 병렬 복원")
+    p.add_argument('directory', help="backup 명령이 만든 디렉터리")
+    p.add_argument('--collections', help="복원할 컬렉션 (기본값: 백업의 모든 컬렉션)")
+    p.add_argument('--workers', type=int, default=8, help="동시 워커 수 (기본값: 8)")
+    p.add_argument('--prune', action='store_true', help="백업에 없는 문서 삭제 (백업 시점으로 되돌림)")
+    p.add_argument('--verify', action='store_true', help="복원 후 문서 다이제스트를 백업과 비교")
+    p.add_argument('--dry-run', action='store_true', help="기록하지 않고 작업 수만 출력")
+    _add_yes(p)
+    _command(p, 'gnhs_tools.backup:run_restore')
+
+    p = sub.add_parser('export', help="컬렉션을 JSONL/CSV 로 내보내기")
+    p.add_argument('--collection', default='alumni', help="내보낼 컬렉션 (기본값: alumni)")
+    p.add_argument('--format', choices=('jsonl', 'csv'), default='jsonl')
+    p.add_argument('-o', '--output', default='-', help="출력 파일 ('-' 이면 표준 출력)")
+    _command(p, 'gnhs_tools.export:run_export')
+
+    p = sub.add_parser('replay', help="쓰기 로그를 Firestore 에 병렬 재생")
+    p.add_argument('log', help="--record 로 만든 쓰기 로그")
+    p.add_argument('--workers', type=int, default=8, help="동시 워커 수 (기본값: 8)")
+    p.add_argument('--dry-run', action='store_true', help="재생하지 않고 작업 수만 집계")
+    _command(p, 'gnhs_tools.writelog:run_replay')
+
+    p = sub.add_parser('log-summary', help="쓰기 로그 요약")
+    p.add_argument('log', help="--record 로 만든 쓰기 로그")
+    _command(p, 'gnhs_tools.writelog:run_summary')
+
+    return parser
+
+
+def resolve(handler):
+    """'module:function' 문자열을 실제 함수로 변환"""
+    module_name, func_name = handler.split(':')
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if getattr(args, 'record', None):
+        args.dry_run = True
+    _enable_costs(args)
+    if not (args.metrics or args.profile or args.trace_memory):
+        return _report_costs(args, _run(args))
+
+    from gnhs_tools.metrics import METRICS, Profiler
+    METRICS.enable()
+    with Profiler(args.profile, args.trace_memory):
+        code = _run(args)
+    if args.metrics:
+        summary = METRICS.write(args.metrics, command=args.command)
+        print(f"\n📈 계측 요약: {args.metrics} "
+              f"(wall {summary['wall_seconds']:.2f}s / cpu {summary['cpu_seconds']:.2f}s)")
+    return _report_costs(args, code)
+
+
+def _enable_costs(args):
+    """--cost / --budget-* (또는 GNHS_BUDGET_* 환경 변수)가 있으면 작업량 집계 시작"""
+    from gnhs_tools.cost import COSTS, budgets_from_env
+
+    budgets = budgets_from_env()
+    for key in ('reads', 'writes', 'deletes', 'usd'):
+        value = getattr(args, f'budget_{key}')
+        # 0 도 한도 (쓰기 없이 읽기만 허용하는 등)
+        if value is not None:
+            budgets[key] = value
+    args.cost = args.cost or bool(budgets)
+    if args.cost:
+        COSTS.enable(budgets, stage=args.command)
+
+
+def _report_costs(args, code):
+    if args.cost:
+        from gnhs_tools.cost import COSTS
+        COSTS.report()
+    return code
+
+
+def _run(args):
+    from gnhs_tools.errors import ToolError
+
+    try:
+        return resolve(args.handler)(args) or 0
+    except ToolError as e:
+        print(f"❌ {e}")
+        return 1
+    except KeyboardInterrupt:
+        print("\n❌ 작업이 중단되었습니다.")
+        return 130
@@ -0,0 +1,252 @@
+"""
+직장명 정규화 / 직장별 동문 색인
+
+'前포스코건설', '(주)조유', '한국남동발전(주)' 처럼 제각각인 직장명을
+정규화한 뒤, 비슷한 표기를 묶어서 대표 키(company_key)를 정합니다.
+
+- 정규화: 前/전)/現 접두어, (주)/㈜/주식회사 등 법인 표기, 공백/구두점 제거
+- 묶기: 정규화 이름 앞 두 글자로 블록을 나누고 블록 안에서만 유사도 비교
+  (전체 쌍 비교 O(n²) 를 피함)
+- 색인: companies/{company_key} 문서에 인원 수와 동문 목록을 미리 저장해서
+  직장별 동문 보기를 문서 하나 읽기로 끝냄 (다시 만들 때는 내용이 바뀐 문서만 기록)
+
+직장명은 앱과 같이 organization (앱에서 수정한 값) 을 먼저, 없으면 company 를 씁니다.
+"""
+import difflib
+import re
+
+from gnhs_tools.contacts import COLLECTION, SERVER_TIMESTAMP, company_of
+from gnhs_tools.metrics import METRICS
+from gnhs_tools.sync import without_timestamp
+
+COMPANY_COLLECTION = 'companies'
+DEFAULT_THRESHOLD = 0.9
+# 색인을 다시 만들 때 alumni 에서 읽는 필드
+SOURCE_FIELDS = ('name', 'organization', 'company', 'class_number', 'graduation_year', 'company_key')
+
+_FORMER_RE = re.compile(r'^\s*(?:前\)?|전\)|전\s|現|현\))\s*|\s*(?:前|現)\s*$')
+_LEGAL_RE = re.compile(r'\(주\)|㈜|주식회사|\(유\)|유한회사|\(사\)|사단법인|\(재\)|재단법인|\(합\)|\(株\)')
+_DIGITS_RE = re.compile(r'\d+')
+_PUNCT_RE = re.compile(r'[\s.,·\-_/&()\[\]\'"]+')
+# 직장명 뒤에 붙은 직책/설명 ('前 대우조선 전무', '前 용평스키장 근무')
+_TRAILING_WORDS = {
+    '근무', '재직', '퇴직', '대표', '대표이사', '이사', '전무', '상무', '부장', '차장', '과장',
+    '팀장', '국장', '실장', '원장', '소장', '지점장', '교수', '교사', '교장', '부군수', '부시장',
+}
+# 기관 종류 접미사: 접미사가 같은 이름끼리만, 접미사를 뺀 부분으로 비교
+# ('강릉남산초등학교' 와 '강릉성산초등학교' 가 묶이지 않도록)
+_GENERIC_SUFFIXES = tuple(sorted((
+    '여자고등학교', '고등학교', '여자중학교', '중학교', '초등학교', '대학교', '대학원', '병원', '의원',
+    '은행', '시청', '군청', '구청', '도청', '경찰서', '소방서', '교육청', '교육지원청', '우체국',
+    '농협', '수협', '신협', '새마을금고', '세무서', '법원', '검찰청',
+), key=len, reverse=True))
+# 직장이 아닌 값
+_PLACEHOLDERS = {'', '-', '.', '미등록', '없음', '무', '무직', '해당없음'}
+
+
+def normalize_company(name):
+    """비교용 정규화 이름 (직장이 아니면 '')"""
+    name = (name or '').strip()
+    if name in _PLACEHOLDERS:
+        return ''
+    name = _FORMER_RE.sub('', name)
+    name = _LEGAL_RE.sub(' ', name)
+    words = name.split()
+    while len(words) > 1 and words[-1] in _TRAILING_WORDS:
+        words.pop()
+    key = _PUNCT_RE.sub('', ''.join(words)).upper()
+    if key.endswith('대학'):
+        key += '교'
+    return '' if key in _PLACEHOLDERS else key
+
+
+def split_suffix(key):
+    """(접미사를 뺀 이름, 기관 종류 접미사)"""
+    for suffix in _GENERIC_SUFFIXES:
+        if key.endswith(suffix) and len(key) > len(suffix):
+            return key[:-len(suffix)], suffix
+    return key, ''
+
+
+def display_name(name):
+    """표시용 이름 (접두어/법인 표기만 제거, 띄어쓰기 유지)"""
+    name = _FORMER_RE.sub('', (name or '').strip())
+    return ' '.join(_LEGAL_RE.sub(' ', name).split())
+
+
+class _UnionFind:
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, x):
+        parent = self.parent
+        parent.setdefault(x, x)
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    def union(self, a, b):
+        ra, rb = self.find(a), self.find(b)
+        if ra != rb:
+            self.parent[rb] = ra
+
+
+def cluster_names(counts, threshold=DEFAULT_THRESHOLD):
+    """{정규화 이름: 인원 수} → {정규화 이름: 대표 정규화 이름}
+
+    같은 블록(기관 종류 접미사 + 나머지 앞 두 글자) 안에서, 접미사를 뺀
+    부분의 SequenceMatcher 유사도가 threshold 이상인 이름끼리 묶고,
+    묶음에서 인원이 가장 많은 이름을 대표로 씁니다.
+    """
+    blocks = {}
+    for name in counts:
+        stem, suffix = split_suffix(name)
+        blocks.setdefault((suffix, stem[:2]), []).append((stem, name))
+
+    uf = _UnionFind()
+    for entries in blocks.values():
+        entries.sort()
+        for i, (a, name_a) in enumerate(entries):
+            uf.find(name_a)
+            matcher = difflib.SequenceMatcher(None, a)
+            for b, name_b in entries[i + 1:]:
+                # 길이 차이만으로 threshold 를 넘을 수 없으면 건너뜀
+                if 2 * min(len(a), len(b)) / (len(a) + len(b)) < threshold:
+                    continue
+                # 숫자가 다르면 다른 기관 ('18전투비행단' / '8전투비행단')
+                if _DIGITS_RE.findall(a) != _DIGITS_RE.findall(b):
+                    continue
+                matcher.set_seq2(b)
+                if matcher.quick_ratio() >= threshold and matcher.ratio() >= threshold:
+                    uf.union(name_a, name_b)
+
+    groups = {}
+    for name in counts:
+        groups.setdefault(uf.find(name), []).append(name)
+
+    canonical = {}
+    for members in groups.values():
+        best = max(members, key=lambda n: (counts[n], -len(n), n))
+        for name in members:
+            canonical[name] = best
+    return canonical
+
+
+def _doc_id(key):
+    # Firestore 문서 ID 에는 '/' 를 쓸 수 없음
+    return key.replace('/', '_')
+
+
+class CompanyIndex:
+    """동문 레코드를 모아 직장 키와 직장별 문서를 계산"""
+
+    def __init__(self, threshold=DEFAULT_THRESHOLD):
+        self.threshold = threshold
+        self.records = []          # (문서 ID, 정규화 이름, 원본 이름, 이름, 회차, 현재 키)
+        self.counts = {}
+
+    def add(self, doc_id, data):
+        raw = company_of(data)
+        key = normalize_company(raw)
+        self.records.append((doc_id, key, raw, data.get('name', ''),
+                             data.get('class_number') or data.get('graduation_year') or 0,
+                             data.get('company_key')))
+        if key:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def build(self):
+        """(키 변경 목록, 직장 문서 딕셔너리) 반환"""
+        with METRICS.timer('cluster_companies'):
+            canonical = cluster_names(self.counts, self.threshold)
+
+        changes = []
+        companies = {}
+        for doc_id, key, raw, name, class_number, current in self.records:
+            company_key = canonical.get(key, '') if key else ''
+            if company_key != (current or ''):
+                changes.append((doc_id, company_key))
+            if not company_key:
+                continue
+            entry = companies.setdefault(company_key, {'variants': {}, 'members': []})
+            label = display_name(raw)
+            entry['variants'][label] = entry['variants'].get(label, 0) + 1
+            entry['members'].append({'id': doc_id, 'name': name, 'class_number': class_number})
+
+        documents = {}
+        for company_key, entry in companies.items():
+            variants = sorted(entry['variants'].items(), key=lambda kv: (-kv[1], kv[0]))
+            members = sorted(entry['members'], key=lambda m: (m['class_number'], m['name'], m['id']))
+            documents[_doc_id(company_key)] = {
+                'key': company_key,
+                'name': variants[0][0],
+                'variants': [v for v, _ in variants[:20]],
+                'count': len(members),
+                'members': members,
+                'updated_at': SERVER_TIMESTAMP,
+            }
+        return changes, documents
+
+
+def rebuild_company_index(backend, records, threshold=DEFAULT_THRESHOLD, write_keys=True):
+    """company_key 갱신 + companies 컬렉션을 바뀐 문서만 기록 (통계 딕셔너리 반환)"""
+    index = CompanyIndex(threshold)
+    for doc_id, data in records:
+        index.add(doc_id, data)
+    changes, documents = index.build()
+
+    if write_keys:
+        for doc_id, company_key in changes:
+            backend.update(COLLECTION, doc_id, {'company_key': company_key})
+
+    stale = written = 0
+    existing = dict(backend.stream(COMPANY_COLLECTION))
+    for doc_id in existing:
+        if doc_id not in documents:
+            backend.delete(COMPANY_COLLECTION, doc_id)
+            stale += 1
+    for doc_id, document in sorted(documents.items()):
+        current = existing.get(doc_id)
+        if current is not None and without_timestamp(current) == without_timestamp(document):
+            continue
+        backend.set(COMPANY_COLLECTION, doc_id, document)
+        written += 1
+    backend.flush()
+
+    return {
+        'alumni': len(index.records),
+        'raw_names': len({r[2] for r in index.records if r[1]}),
+        'companies': len(documents),
+        'key_changes': len(changes) if write_keys else 0,
+        'written': written,
+        'unchanged': len(documents) - written,
+        'stale_deleted': stale,
+    }
+
+
+def run_companies(args):
+    from gnhs_tools.backends import open_backend
+
+    print("=" * 70)
+    print("🏢 직장명 정규화 / 직장별 색인" + (" (dry-run)" if args.dry_run else ""))
+    print("=" * 70)
+
+    from_csv = args.input is not None
+    backend = open_backend(args.dry_run, read_firestore=not from_csv, record=args.record)
+    with backend:
+        if from_csv:
+            from gnhs_tools.contacts import iter_alumni
+            from gnhs_tools.sources import open_source
+            records = iter_alumni(open_source(args.input, args.format, args.mapping))
+        else:
+            records = backend.stream(COLLECTION, fields=SOURCE_FIELDS)
+        # CSV 기준일 때는 문서가 아직 없을 수 있으므로 company_key 는 쓰지 않음
+        stats = rebuild_company_index(backend, records, args.threshold, write_keys=not from_csv)
+
+    print(f"\n📋 동문 {stats['alumni']}명, 원본 직장명 {stats['raw_names']}종")
+    print(f"🏢 묶은 뒤 직장 {stats['companies']}곳")
+    print(f"✏️  company_key 변경: {stats['key_changes']}명")
+    print(f"📝 직장 문서 기록 {stats['written']}개 / 그대로 {stats['unchanged']}개")
+    print(f"🗑️  사라진 직장 문서 삭제: {stats['stale_deleted']}개")
+    print("=" * 70)
+    return 0
@@ -0,0 +1,177 @@
+"""
+연락처 파일 두 개 비교 (외부 정렬 + 병합 조인)
+
+새 연락처 파일을 받았을 때 지난 파일과 비교해서 추가/삭제/변경된 동문과
+바뀐 필드를 보여주고, 그 결과를 최소 쓰기 작업(신규 create, 바뀐 필드만
+merge set, 선택적으로 delete)으로 만듭니다.
+
+두 파일 모두 임포트와 같은 정규화(iter_alumni)를 거친 뒤 문서 ID 순으로
+정렬합니다. 레코드가 --run-rows 보다 많으면 정렬된 조각(run)을 임시 파일로
+내보내고 heapq.merge 로 합치므로 메모리 사용량은 파일 크기와 무관합니다.
+같은 문서 ID 가 여러 번 나오면 임포트와 마찬가지로 마지막 값을 씁니다.
+
+    python -m gnhs_tools diff old.csv contacts.csv                 # 요약 + 변경 예시
+    python -m gnhs_tools diff old.csv contacts.csv -o diff.jsonl   # 전체 내역
+    python -m gnhs_tools diff old.csv contacts.csv --record diff.wal && \\
+        python -m gnhs_tools replay diff.wal                       # 바뀐 것만 반영
+"""
+import heapq
+import json
+import os
+import tempfile
+from operator import itemgetter
+
+from gnhs_tools.contacts import COLLECTION, SERVER_TIMESTAMP, iter_alumni
+from gnhs_tools.metrics import METRICS
+from gnhs_tools.sync import TIMESTAMP_FIELDS, changed_fields
+
+# 메모리에서 한 번에 정렬할 레코드 수
+DEFAULT_RUN_ROWS = 200_000
+
+_ORDER = itemgetter(0, 1)
+
+
+def _spill(buffer, tmpdir):
+    """정렬한 조각을 임시 파일로 기록하고 경로 반환"""
+    buffer.sort(key=_ORDER)
+    fd, path = tempfile.mkstemp(prefix='gnhs-run-', suffix='.jsonl', dir=tmpdir)
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        for item in buffer:
+            f.write(json.dumps(item, ensure_ascii=False, separators=(',', ':')))
+            f.write('\n')
+    METRICS.count('sort_runs')
+    return path
+
+
+def _read_run(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            yield tuple(json.loads(line))
+
+
+def _last_per_id(items):
+    """(문서 ID, 순번, 데이터) 정렬 스트림에서 문서 ID 별 마지막 값만"""
+    previous = None
+    for item in items:
+        if previous is not None and previous[0] != item[0]:
+            yield previous[0], previous[2]
+        previous = item
+    if previous is not None:
+        yield previous[0], previous[2]
+
+
+def sorted_records(records, run_rows=DEFAULT_RUN_ROWS, tmpdir=None):
+    """(문서 ID, 데이터)를 문서 ID 순으로 반환 (필요하면 외부 정렬)"""
+    runs = []
+    buffer = []
+    try:
+        for seq, (doc_id, data) in enumerate(records):
+            data = {k: v for k, v in data.items() if k not in TIMESTAMP_FIELDS}
+            buffer.append((doc_id, seq, data))
+            if len(buffer) >= run_rows:
+                runs.append(_spill(buffer, tmpdir))
+                buffer = []
+        if runs:
+            if buffer:
+                runs.append(_spill(buffer, tmpdir))
+            merged = heapq.merge(*(_read_run(path) for path in runs), key=_ORDER)
+        else:
+            buffer.sort(key=_ORDER)
+            merged = iter(buffer)
+        yield from _last_per_id(merged)
+    finally:
+        for path in runs:
+            os.remove(path)
+
+
+def merge_join(old, new):
+    """정렬된 두 스트림 비교: ('added'|'removed'|'changed', 문서 ID, 이전, 이후, 바뀐 필드)"""
+    missing = object()
+    old_iter, new_iter = iter(old), iter(new)
+    o = next(old_iter, missing)
+    n = next(new_iter, missing)
+    while o is not missing or n is not missing:
+        if n is missing or (o is not missing and o[0] < n[0]):
+            yield 'removed', o[0], o[1], None, None
+            o = next(old_iter, missing)
+        elif o is missing or n[0] < o[0]:
+            yield 'added', n[0], None, n[1], None
+            n = next(new_iter, missing)
+        else:
+            changes = changed_fields(n[1], o[1])
+            if changes:
+                yield 'changed', n[0], o[1], n[1], changes
+            o = next(old_iter, missing)
+            n = next(new_iter, missing)
+
+
+def apply_diff(backend, op, doc_id, new, changes, delete_removed=False, collection=COLLECTION):
+    """비교 결과 하나를 최소 쓰기 작업으로 변환
+
+    추가는 create (앱에서 이미 만든 문서면 CREATE_ONLY_FIELDS 를 뺀 merge),
+    변경은 바뀐 필드만 merge set 이므로 문서가 없어도 배치가 실패하지 않습니다.
+    """
+    if op == 'added':
+        backend.create(collection, doc_id,
+                       {**new, 'created_at': SERVER_TIMESTAMP, 'updated_at': SERVER_TIMESTAMP})
+    elif op == 'changed':
+        backend.set(collection, doc_id, {**changes, 'updated_at': SERVER_TIMESTAMP}, merge=True)
+    elif op == 'removed' and delete_removed:
+        backend.delete(collection, doc_id)
+
+
+def _source_records(path, fmt, mapping):
+    from gnhs_tools.sources import open_source
+    return iter_alumni(open_source(path, fmt, mapping))
+
+
+def run_diff(args):
+    from gnhs_tools.backends import open_backend
+
+    print("=" * 70)
+    print(f"🔍 연락처 비교: {args.old} → {args.new}")
+    print("=" * 70)
+
+    old = sorted_records(_source_records(args.old, args.format, args.mapping), args.run_rows)
+    new = sorted_records(_source_records(args.new, args.format, args.mapping), args.run_rows)
+
+    counts = {'added': 0, 'removed': 0, 'changed': 0}
+    field_counts = {}
+    shown = 0
+    out = open(args.output, 'w', encoding='utf-8') if args.output else None
+    backend = open_backend(dry_run=not args.apply, record=args.record)
+    try:
+        with backend:
+            for op, doc_id, before, after, changes in merge_join(old, new):
+                counts[op] += 1
+                for field in changes or ():
+                    field_counts[field] = field_counts.get(field, 0) + 1
+                apply_diff(backend, op, doc_id, after, changes, args.delete_removed)
+                if out is not None:
+                    entry = {'op': op, 'id': doc_id}
+                    if op == 'changed':
+                        entry['fields'] = {k: [before.get(k), v] for k, v in changes.items()}
+                    else:
+                        entry['data'] = after if op == 'added' else before
+                    out.write(json.dumps(entry, ensure_ascii=False, default=str))
+                    out.write('\n')
+                if shown < args.show:
+                    shown += 1
+                    name = (after or before).get('name', '')
+                    if op == 'changed':
+                        detail = ', '.join(f"{k}: {before.get(k)!r} → {v!r}" for k, v in changes.items())
+                        print(f"  ✏️  {doc_id} {name}: {detail}")
+                    else:
+                        print(f"  {'➕' if op == 'added' else '➖'} {doc_id} {name}")
+    finally:
+        if out is not None:
+            out.close()
+
+    print(f"\n➕ 추가 {counts['added']}명 / ➖ 삭제 {counts['removed']}명 / ✏️  변경 {counts['changed']}명")
+    for field, count in sorted(field_counts.items(), key=lambda kv: -kv[1]):
+        print(f"  {field}: {count}명")
+    if counts['removed'] and not args.delete_removed:
+        print("ℹ️  삭제된 동문은 쓰기 작업에 포함하지 않았습니다 (--delete-removed 로 포함).")
+    print(f"🧾 쓰기 작업: {backend.stats}" + ("" if args.apply or args.record else " (기록 안 함)"))
+    print("=" * 70)
+    return 0
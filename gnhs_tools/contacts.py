@@ -0,0 +1,175 @@
+"""
+연락처 레코드 → 동문 문서 변환
+
+입력 형식별 파싱은 sources.py 의 어댑터가 맡고, 이 모듈은 표준 키
+레코드를 정규화합니다. 파싱과 정규화는 Firebase SDK 없이 동작합니다. Firestore 전용 값
+(SERVER_TIMESTAMP 등)은 이 모듈의 센티널로 표시하고, 실제 백엔드가
+기록 시점에 SDK 값으로 바꿉니다.
+"""
+import re
+
+from gnhs_tools.metrics import METRICS
+
+DEFAULT_CSV = 'contacts.csv'
+COLLECTION = 'alumni'
+
+# record_to_alumni 가 만드는 필드 (타임스탬프 제외)
+ALUMNI_FIELDS = (
+    'phone', 'name', 'graduation_year', 'class_number', 'email', 'email2',
+    'company', 'job_title', 'department', 'address', 'address2', 'birth_date',
+    'notes', 'phone2', 'profile_photo_url', 'is_verified',
+    'address_sido', 'address_sigungu', 'address_dong', 'groups',
+)
+
+_CLASS_RE = re.compile(r'(\d{1,2})회')
+_NON_DIGIT_RE = re.compile(r'\D')
+_LABEL_SEP_RE = re.compile(r'\s*:::\s*')
+_CLASS_LABEL_RE = re.compile(r'^0*(\d{1,2})\s*회$')
+# Google 주소록 시스템 라벨 ('* myContacts', '* starred')
+_SYSTEM_LABEL_PREFIX = '*'
+
+
+class _ServerTimestamp:
+    """Firestore SERVER_TIMESTAMP 자리 표시자"""
+
+    def __repr__(self):
+        return 'SERVER_TIMESTAMP'
+
+    def __reduce__(self):
+        return 'SERVER_TIMESTAMP'
+
+
+SERVER_TIMESTAMP = _ServerTimestamp()
+
+
+def clean_phone(phone):
+    """전화번호에서 숫자만 남기기 (문서 ID 형식: 01012345678)"""
+    if not phone:
+        return ''
+    return _NON_DIGIT_RE.sub('', phone)
+
+
+def company_of(data):
+    """앱과 같은 규칙으로 직장명 결정 (앱에서 수정한 organization → company, 없으면 '')"""
+    return data.get('organization') or data.get('company') or ''
+
+
+def format_phone(phone):
+    """전화번호 표시 형식 (010-1234-5678)"""
+    digits = clean_phone(phone)
+    if digits.startswith('010') and len(digits) == 11:
+        return f"{digits[:3]}-{digits[3:7]}-{digits[7:]}"
+    return phone
+
+
+def extract_class_number(*texts):
+    """이름 접미사/닉네임/라벨에서 회차 추출 ('(21회)' → 21, 없으면 0)"""
+    for text in texts:
+        if not text:
+            continue
+        match = _CLASS_RE.search(text)
+        if match:
+            return int(match.group(1))
+    return 0
+
+
+def class_label(label):
+    """회차 라벨이면 회차 숫자 ('08회' → 8), 아니면 0"""
+    match = _CLASS_LABEL_RE.match(label)
+    return int(match.group(1)) if match else 0
+
+
+def parse_labels(text):
+    """라벨 문자열 → 정규화한 그룹 목록 (정렬, 중복 제거)
+
+    'Z-001 ::: 08회 ::: * myContacts' → ['8회', 'Z-001']
+    시스템 라벨은 버리고, 회차 라벨은 앞자리 0 을 떼며, 공백은 하나로 줄입니다.
+    """
+    groups = set()
+    for label in _LABEL_SEP_RE.split(text or ''):
+        label = ' '.join(label.split())
+        if not label or label.startswith(_SYSTEM_LABEL_PREFIX):
+            continue
+        number = class_label(label)
+        groups.add(f"{number}회" if number else label)
+    return sorted(groups)
+
+
+def read_records(source=DEFAULT_CSV):
+    """입력 파일(또는 Source)의 표준 키 레코드를 하나씩 반환"""
+    from gnhs_tools.sources import open_source
+    return iter(open_source(source))
+
+
+def _get(record, key):
+    return (record.get(key) or '').strip()
+
+
+def record_to_alumni(record):
+    """표준 키 레코드 하나를 (문서 ID, 문서 데이터)로 변환
+
+    이름이 없거나 010 휴대전화 번호가 없으면 None 을 반환합니다.
+    graduation_year 와 class_number 에는 모두 회차 숫자를 기록합니다.
+    """
+    name = f"{_get(record, 'first_name')}{_get(record, 'last_name')}"
+    phone = clean_phone(_get(record, 'phone'))
+
+    if not name or not phone.startswith('010'):
+        return None
+
+    labels = _get(record, 'labels')
+    class_number = extract_class_number(_get(record, 'name_suffix'), _get(record, 'nickname'), labels)
+
+    address = _get(record, 'address')
+    if not address:
+        address = f"{_get(record, 'address_region')} {_get(record, 'address_city')}".strip()
+
+    data = {
+        'phone': phone,
+        'name': name,
+        'graduation_year': class_number,
+        'class_number': class_number,
+        'email': _get(record, 'email'),
+        'email2': _get(record, 'email2'),
+        'company': _get(record, 'organization'),
+        'job_title': _get(record, 'title'),
+        'department': _get(record, 'department'),
+        'address': address,
+        'address2': _get(record, 'address2'),
+        'birth_date': _get(record, 'birthday'),
+        'notes': _get(record, 'notes'),
+        'phone2': clean_phone(_get(record, 'phone2')),
+        'profile_photo_url': '',
+        'is_verified': False,
+        'groups': parse_labels(labels),
+        'created_at': SERVER_TIMESTAMP,
+        'updated_at': SERVER_TIMESTAMP,
+    }
+    return phone, data
+
+
+def iter_alumni(source=DEFAULT_CSV, stats=None):
+    """입력 파일(또는 Source)에서 (문서 ID, 문서 데이터)를 스트리밍
+
+    stats 딕셔너리를 넘기면 rows/skipped 카운트를 채웁니다.
+    주소는 address.py 로 해석해서 지역 필드(address_sido 등)를 덧붙입니다.
+    """
+    from gnhs_tools.address import region_fields
+
+    if stats is None:
+        stats = {}
+    stats.setdefault('rows', 0)
+    stats.setdefault('skipped', 0)
+
+    for record in METRICS.timed_iter(read_records(source), 'parse'):
+        stats['rows'] += 1
+        with METRICS.timer('normalize'):
+            result = record_to_alumni(record)
+        if result is None:
+            stats['skipped'] += 1
+            METRICS.count('rows_skipped')
+            continue
+        with METRICS.timer('parse_address'):
+            result[1].update(region_fields(result[1]['address']))
+        METRICS.count('rows_accepted')
+        yield result
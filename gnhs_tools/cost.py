@@ -0,0 +1,248 @@
+"""
+Firestore 작업량 / 비용 계산
+
+읽기, 쓰기, 삭제 횟수와 주고받은 문서 크기, 갱신되는 색인 항목 수를
+단계(stage)와 컬렉션별로 모아서 실행이 끝나면 예상 요금과 함께 출력합니다.
+METRICS 와 마찬가지로 기본값은 비활성 상태이며, CLI 의 --cost 나 --budget-*
+옵션으로 켭니다. 한도를 넘으면 BudgetExceeded 를 발생시켜서 남은 배치를
+커밋하지 않고 작업을 멈춥니다.
+
+    from gnhs_tools.cost import COSTS
+
+    for doc in COSTS.reads('alumni', query.stream()):
+        ...
+    COSTS.write('alumni', doc_id, data)
+
+문서 크기는 Firestore 저장 크기 계산 규칙(문자열 UTF-8 + 1, 숫자/시각 8,
+문서 이름 + 32 바이트)을 따르고, 색인 항목은 자동 단일 필드 색인(필드마다
+오름차순/내림차순 2개, 배열은 array-contains 1개) 기준 추정값입니다.
+"""
+import contextlib
+import datetime
+import os
+import threading
+import time
+
+from gnhs_tools.errors import ToolError
+
+# 작업 10만 건당 요금 (USD, nam5 멀티 리전 기준)
+PRICES = {'reads': 0.06, 'writes': 0.18, 'deletes': 0.02}
+# 하루 무료 할당량
+FREE_DAILY = {'reads': 50_000, 'writes': 20_000, 'deletes': 20_000}
+# --budget-* 옵션 기본값을 읽는 환경 변수 (레거시 스크립트에서도 사용)
+BUDGET_ENV = {
+    'reads': 'GNHS_BUDGET_READS',
+    'writes': 'GNHS_BUDGET_WRITES',
+    'deletes': 'GNHS_BUDGET_DELETES',
+    'usd': 'GNHS_BUDGET_USD',
+}
+OPERATIONS = ('reads', 'writes', 'deletes')
+
+
+class BudgetExceeded(ToolError):
+    """작업량 한도를 넘었을 때 발생"""
+
+
+def budgets_from_env():
+    """환경 변수에 설정된 한도 {'reads': 1000, 'usd': 0.5, ...}"""
+    budgets = {}
+    for key, env in BUDGET_ENV.items():
+        value = os.environ.get(env)
+        if value:
+            budgets[key] = float(value) if key == 'usd' else int(value)
+    return budgets
+
+
+def _value_size(value):
+    if value is None or isinstance(value, bool):
+        return 1
+    if isinstance(value, str):
+        return len(value.encode('utf-8')) + 1
+    if isinstance(value, (int, float, datetime.datetime)):
+        return 8
+    if isinstance(value, bytes):
+        return len(value)
+    if isinstance(value, dict):
+        return sum(len(key.encode('utf-8')) + 1 + _value_size(v) for key, v in value.items())
+    if isinstance(value, (list, tuple)):
+        return sum(_value_size(v) for v in value)
+    if hasattr(value, 'latitude'):
+        return 16
+    if hasattr(value, 'path'):
+        return len(value.path.encode('utf-8')) + 1 + 16
+    # SERVER_TIMESTAMP, Increment 같은 변환 값
+    return 8
+
+
+def document_size(collection, doc_id, data):
+    """Firestore 저장 크기 기준 문서 크기 (바이트)"""
+    name = len(collection.encode('utf-8')) + 1 + len(str(doc_id).encode('utf-8')) + 1 + 16
+    return name + _value_size(data or {}) + 32
+
+
+def index_entries(data):
+    """자동 단일 필드 색인 기준으로 data 를 기록할 때 갱신되는 색인 항목 수 (추정)"""
+    entries = 0
+    for value in (data or {}).values():
+        if isinstance(value, dict):
+            entries += index_entries(value)
+        elif isinstance(value, (list, tuple)):
+            entries += len(value)
+        else:
+            entries += 2
+    return entries
+
+
+class RateLimiter:
+    """토큰 버킷 (초당 rate 회, 최대 burst 회까지 몰아서 허용, 스레드 안전)"""
+
+    def __init__(self, rate, burst=None):
+        self.rate = float(rate)
+        self.capacity = float(burst or max(1.0, self.rate))
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self, n=1):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                # burst 보다 큰 요청은 버킷이 가득 찼을 때 빚으로 허용
+                need = min(n, self.capacity)
+                if self.tokens >= need:
+                    self.tokens -= n
+                    return
+                wait = (need - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+def _counter():
+    return {'reads': 0, 'writes': 0, 'deletes': 0, 'index_entries': 0, 'bytes_read': 0, 'bytes_written': 0}
+
+
+def estimate_usd(counts):
+    return sum(counts[op] * PRICES[op] / 100_000 for op in OPERATIONS)
+
+
+class CostLedger:
+    """단계/컬렉션별 작업량 집계 (스레드 안전)"""
+
+    def __init__(self):
+        self.enabled = False
+        # RateLimiter 를 넣으면 기록하는 모든 작업이 전역 속도 제한을 거침
+        self.limiter = None
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.rows = {}
+        self.totals = _counter()
+        self.budgets = {}
+        self.current_stage = 'main'
+
+    def enable(self, budgets=None, stage='main'):
+        self.enabled = True
+        self.reset()
+        self.budgets = {k: v for k, v in (budgets or {}).items() if v is not None}
+        self.current_stage = stage
+
+    def start_period(self):
+        """한도는 그대로 두고 집계만 새로 시작 (상주 프로세스의 하루 단위 한도)"""
+        with self._lock:
+            self.rows = {}
+            self.totals = _counter()
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """with 블록 안의 작업을 name 단계로 집계"""
+        previous = self.current_stage
+        self.current_stage = name
+        try:
+            yield
+        finally:
+            self.current_stage = previous
+
+    def _add(self, collection, **counts):
+        with self._lock:
+            key = (self.current_stage, collection)
+            row = self.rows.get(key)
+            if row is None:
+                row = self.rows[key] = _counter()
+            for name, n in counts.items():
+                row[name] += n
+                self.totals[name] += n
+            self._check()
+        if self.limiter is not None:
+            self.limiter.acquire(counts.get('reads', 0) + counts.get('writes', 0) + counts.get('deletes', 0))
+
+    def _check(self):
+        for op in OPERATIONS:
+            limit = self.budgets.get(op)
+            if limit is not None and self.totals[op] > limit:
+                raise BudgetExceeded(f"Firestore {op} 한도 초과: {self.totals[op]} > {limit}")
+        limit = self.budgets.get('usd')
+        if limit is not None and estimate_usd(self.totals) > limit:
+            raise BudgetExceeded(f"예상 비용 한도 초과: ${estimate_usd(self.totals):.6f} > ${limit:.6f}")
+
+    # --- 기록 ---
+
+    def read(self, collection, doc_id=None, data=None, count=1):
+        if self.enabled:
+            size = document_size(collection, doc_id, data) if data is not None else 0
+            self._add(collection, reads=count, bytes_read=size)
+
+    def reads(self, collection, docs):
+        """쿼리 결과(DocumentSnapshot)를 그대로 넘기면서 읽기 집계
+
+        결과가 없는 쿼리도 읽기 1회로 과금되므로 그만큼 더합니다.
+        """
+        if not self.enabled:
+            yield from docs
+            return
+        returned = 0
+        for doc in docs:
+            returned += 1
+            self.read(collection, doc.id, doc.to_dict() or {})
+            yield doc
+        if not returned:
+            self.read(collection)
+
+    def write(self, collection, doc_id, data):
+        if self.enabled:
+            self._add(collection, writes=1, index_entries=index_entries(data),
+                      bytes_written=document_size(collection, doc_id, data))
+
+    def delete(self, collection, doc_id=None):
+        if self.enabled:
+            self._add(collection, deletes=1)
+
+    # --- 보고 ---
+
+    def summary(self):
+        with self._lock:
+            rows = [{'stage': stage, 'collection': collection, **counts, 'usd': round(estimate_usd(counts), 6)}
+                    for (stage, collection), counts in sorted(self.rows.items())]
+            totals = dict(self.totals)
+        return {'rows': rows, 'totals': {**totals, 'usd': round(estimate_usd(totals), 6)},
+                'budgets': dict(self.budgets)}
+
+    def report(self):
+        summary = self.summary()
+        totals = summary['totals']
+        print("\n💰 Firestore 작업량 (단계 / 컬렉션)")
+        for row in summary['rows']:
+            print(f"  {row['stage']:>12} / {row['collection']:<16} 읽기 {row['reads']:>7} · "
+                  f"쓰기 {row['writes']:>7} · 삭제 {row['deletes']:>6} · 색인 {row['index_entries']:>8} · "
+                  f"{(row['bytes_read'] + row['bytes_written']) / 1024 / 1024:.2f}MB · ${row['usd']:.4f}")
+        print(f"  합계: 읽기 {totals['reads']} / 쓰기 {totals['writes']} / 삭제 {totals['deletes']}"
+              f" / 색인 항목 약 {totals['index_entries']}"
+              f" / 읽음 {totals['bytes_read'] / 1024 / 1024:.2f}MB / 씀 {totals['bytes_written'] / 1024 / 1024:.2f}MB")
+        free = ', '.join(f"{op} {totals[op] / FREE_DAILY[op] * 100:.1f}%" for op in OPERATIONS)
+        print(f"  예상 비용: ${totals['usd']:.4f} (매일 실행하면 월 ${totals['usd'] * 30:.2f})"
+              f" / 하루 무료 할당량 대비 {free}")
+        return summary
+
+
+COSTS = CostLedger()
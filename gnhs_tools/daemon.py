@@ -0,0 +1,569 @@
+"""
+유지보수 상주 프로세스 (스케줄러)
+
+집계, 방문 통계 압축, 번들, 백업 같은 작업을 명령마다 따로 실행하면
+실행할 때마다 SDK/gRPC 로드와 인증을 다시 하고, 동시에 돌면서 할당량을
+나눠 씁니다. 이 프로세스는 Firestore 클라이언트 하나를 계속 재사용하면서
+cron 형식 일정에 따라 작업을 하나씩 실행합니다.
+
+- 일정: 'm h dom mon dow' 5개 필드 cron 식, @hourly/@daily/@weekly, '@every 60s'
+- 속도 제한: 모든 작업의 읽기/쓰기/삭제를 합쳐 초당 --ops-per-second 회 (cost.RateLimiter)
+- 하루 한도: 전역 --budget-* 옵션을 날짜마다 새로 적용
+- 작업 잠금: maintenance_locks/{작업 이름} 문서를 트랜잭션으로 잡아서 여러
+  인스턴스가 떠 있어도 한 곳에서만 실행 (실행 중에는 만료 시각을 연장)
+- 상태: GET /status (JSON), /metrics (Prometheus), /health
+
+설정 파일(JSON)을 주지 않으면 DEFAULT_SCHEDULE 을 씁니다.
+
+    {"jobs": {"compact-visits": "@every 60s",
+              "bundles": {"schedule": "*/15 * * * *", "output": "build/web/bundles"},
+              "backup": "30 3 * * *"}}
+
+    python -m gnhs_tools daemon --config daemon.json --port 8790
+"""
+import datetime
+import json
+import os
+import re
+import socket
+import threading
+import time
+import traceback
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from gnhs_tools.cost import COSTS, RateLimiter
+from gnhs_tools.errors import ToolError
+from gnhs_tools.metrics import METRICS
+
+LOCK_COLLECTION = 'maintenance_locks'
+DEFAULT_LOCK_TTL = 600.0
+
+DEFAULT_SCHEDULE = {
+    'compact-visits': '*/5 * * * *',
+    'aggregates': '17 * * * *',
+    'bundles': '*/15 * * * *',
+    'backup': '30 3 * * *',
+    'regions': '0 4 * * 0',
+    'companies': '30 4 * * 0',
+    # 명단은 alumni 전체를 읽으므로 임포트 뒤 하루 한 번이면 충분 (`rosters` 명령으로 즉시 갱신)
+    'rosters': '45 4 * * *',
+}
+
+_ALIASES = {
+    '@hourly': '0 * * * *',
+    '@daily': '0 0 * * *',
+    '@weekly': '0 0 * * 0',
+    '@monthly': '0 0 1 * *',
+}
+_EVERY_RE = re.compile(r'^@every\s+(\d+)\s*([smh])$')
+_UNITS = {'s': 1, 'm': 60, 'h': 3600}
+
+
+# --- 일정 ---
+
+def _parse_field(text, low, high):
+    values = set()
+    for part in text.split(','):
+        spec, _, step = part.partition('/')
+        step = int(step) if step else 1
+        if spec == '*':
+            start, end = low, high
+        elif '-' in spec:
+            start, end = (int(v) for v in spec.split('-', 1))
+        else:
+            start = end = int(spec)
+            if step > 1:
+                end = high
+        if start < low or end > high or start > end or step < 1:
+            raise ValueError(part)
+        values.update(range(start, end + 1, step))
+    return values
+
+
+class CronSchedule:
+    """5개 필드 cron 식 (분 시 일 월 요일, 요일 0/7 = 일요일, 로컬 시각)"""
+
+    def __init__(self, expr):
+        self.expr = expr
+        fields = _ALIASES.get(expr.strip(), expr).split()
+        if len(fields) != 5:
+            raise ToolError(f"cron 식은 필드 5개여야 합니다: {expr!r}")
+        try:
+            self.minutes = _parse_field(fields[0], 0, 59)
+            self.hours = _parse_field(fields[1], 0, 23)
+            self.days = _parse_field(fields[2], 1, 31)
+            self.months = _parse_field(fields[3], 1, 12)
+            self.weekdays = {d % 7 for d in _parse_field(fields[4], 0, 7)}
+        except ValueError as e:
+            raise ToolError(f"cron 식을 해석할 수 없습니다: {expr!r} ({e})") from e
+        # cron 규칙: 일/요일이 둘 다 지정되면 둘 중 하나만 맞아도 실행
+        self._any_day = fields[2] == '*'
+        self._any_weekday = fields[4] == '*'
+
+    def _day_matches(self, t):
+        day = t.day in self.days
+        weekday = (t.weekday() + 1) % 7 in self.weekdays
+        if self._any_day or self._any_weekday:
+            return day and weekday
+        return day or weekday
+
+    def next_after(self, now):
+        t = now.replace(second=0, microsecond=0) + datetime.timedelta(minutes=1)
+        limit = t + datetime.timedelta(days=366 * 5)
+        while t < limit:
+            if t.month not in self.months:
+                t = (t.replace(day=1, hour=0, minute=0) + datetime.timedelta(days=32)).replace(day=1)
+            elif not self._day_matches(t):
+                t = t.replace(hour=0, minute=0) + datetime.timedelta(days=1)
+            elif t.hour not in self.hours:
+                t = t.replace(minute=0) + datetime.timedelta(hours=1)
+            elif t.minute not in self.minutes:
+                t += datetime.timedelta(minutes=1)
+            else:
+                return t
+        raise ToolError(f"실행 시각이 없는 cron 식입니다: {self.expr!r}")
+
+
+class IntervalSchedule:
+    """'@every 60s' 처럼 일정 간격 반복"""
+
+    def __init__(self, expr, seconds):
+        self.expr = expr
+        self.interval = datetime.timedelta(seconds=seconds)
+
+    def next_after(self, now):
+        return now + self.interval
+
+
+def parse_schedule(expr):
+    match = _EVERY_RE.match(expr.strip())
+    if match:
+        return IntervalSchedule(expr, int(match.group(1)) * _UNITS[match.group(2)])
+    return CronSchedule(expr)
+
+
+# --- 작업 ---
+
+def _backend(db):
+    from gnhs_tools.backends import FirestoreBackend
+    return FirestoreBackend(db=db)
+
+
+def job_compact_visits(db, options):
+    from gnhs_tools.visits import compact
+    folded = compact(db)
+    return {'days': len(folded), 'visits': sum(folded.values())}
+
+
+def job_aggregates(db, options):
+    from gnhs_tools.aggregates import AggregateWorker
+    with _backend(db) as backend:
+        worker = AggregateWorker(backend, mirror=options.get('mirror'))
+        count = worker.run_once()
+    return {'alumni': count, 'writes': worker.stats['writes']}
+
+
+def job_bundles(db, options):
+    from gnhs_tools.bundles import DEFAULT_OUTPUT, BundleBuilder
+    return BundleBuilder(db, options.get('output', DEFAULT_OUTPUT)).build()
+
+
+def job_backup(db, options):
+    from gnhs_tools.backup import DEFAULT_DIR, DEFAULT_WORKERS, backup
+    directory = os.path.join(options.get('output', DEFAULT_DIR),
+                             datetime.datetime.now().strftime('%Y%m%d-%H%M%S'))
+    # collections 를 주지 않으면 모든 최상위 컬렉션 + 알려진 하위 컬렉션 (probe 로 더 찾아봄)
+    manifest = backup(db, directory, options.get('collections'),
+                      options.get('workers', DEFAULT_WORKERS), probe=tuple(options.get('probe', ())))
+    return {'directory': directory,
+            'documents': sum(entry['documents'] for entry in manifest['collections'].values())}
+
+
+def job_regions(db, options):
+    from gnhs_tools.address import backfill_regions
+    with _backend(db) as backend:
+        updated, counter = backfill_regions(backend)
+    return {'updated': updated, 'unparsed': counter.unparsed}
+
+
+def job_companies(db, options):
+    from gnhs_tools.companies import DEFAULT_THRESHOLD, SOURCE_FIELDS, rebuild_company_index
+    from gnhs_tools.contacts import COLLECTION
+    with _backend(db) as backend:
+        records = backend.stream(COLLECTION, fields=SOURCE_FIELDS)
+        return rebuild_company_index(backend, records, options.get('threshold', DEFAULT_THRESHOLD))
+
+
+def job_rosters(db, options):
+    from gnhs_tools.contacts import COLLECTION
+    from gnhs_tools.rosters import SOURCE_FIELDS, rebuild_rosters
+    with _backend(db) as backend:
+        stats = rebuild_rosters(backend, backend.stream(COLLECTION, fields=SOURCE_FIELDS))
+    stats.pop('largest')
+    return stats
+
+
+def job_migrate(db, options):
+    from gnhs_tools.maintenance import migrate_class_numbers
+    with _backend(db) as backend:
+        return {'updated': migrate_class_numbers(backend)}
+
+
+def job_analytics_export(db, options):
+    from gnhs_tools.analytics import DEFAULT_OUTPUT, export_firestore, pyarrow_module
+    return export_firestore(pyarrow_module(), _backend(db), options.get('output', DEFAULT_OUTPUT))
+
+
+JOBS = {
+    'compact-visits': job_compact_visits,
+    'aggregates': job_aggregates,
+    'bundles': job_bundles,
+    'backup': job_backup,
+    'regions': job_regions,
+    'companies': job_companies,
+    'rosters': job_rosters,
+    'migrate': job_migrate,
+    'analytics-export': job_analytics_export,
+}
+
+
+class Job:
+    """일정 하나와 실행 기록"""
+
+    def __init__(self, name, schedule, options=None):
+        if name not in JOBS:
+            raise ToolError(f"알 수 없는 작업: {name} (가능: {', '.join(JOBS)})")
+        self.name = name
+        self.func = JOBS[name]
+        self.schedule = parse_schedule(schedule)
+        self.options = options or {}
+        self.next_run = None
+        self.running = False
+        self.runs = {'ok': 0, 'error': 0, 'locked': 0, 'skipped': 0}
+        self.last = {}
+
+    def status(self):
+        return {
+            'schedule': self.schedule.expr,
+            'next_run': self.next_run.isoformat() if self.next_run else None,
+            'running': self.running,
+            'runs': dict(self.runs),
+            'last': dict(self.last),
+        }
+
+
+def load_jobs(path=None, only=None):
+    """설정 파일(없으면 DEFAULT_SCHEDULE)에서 Job 목록"""
+    config = {'jobs': DEFAULT_SCHEDULE}
+    if path:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+        except (OSError, ValueError) as e:
+            raise ToolError(f"설정 파일을 읽을 수 없습니다: {path} ({e})") from e
+    jobs = []
+    for name, spec in config.get('jobs', {}).items():
+        if only and name not in only:
+            continue
+        if isinstance(spec, str):
+            spec = {'schedule': spec}
+        options = {k: v for k, v in spec.items() if k != 'schedule'}
+        jobs.append(Job(name, spec['schedule'], options))
+    if not jobs:
+        raise ToolError("실행할 작업이 없습니다.")
+    return jobs
+
+
+# --- 작업 잠금 ---
+
+def _utcnow():
+    return datetime.datetime.now(datetime.timezone.utc)
+
+
+class JobLock:
+    """maintenance_locks/{작업 이름} 임대(lease) 잠금
+
+    만료 시각이 지난 잠금은 다른 인스턴스가 가져갈 수 있으므로, 작업이
+    실행되는 동안 ttl/3 마다 만료 시각을 연장합니다.
+    """
+
+    def __init__(self, db, name, owner, ttl=DEFAULT_LOCK_TTL):
+        self.db = db
+        self.name = name
+        self.owner = owner
+        self.ttl = ttl
+        self.ref = db.collection(LOCK_COLLECTION).document(name)
+        self._stop = threading.Event()
+        self._heartbeat = None
+
+    def _transact(self, func):
+        from gnhs_tools.firebase import firestore_module
+        return firestore_module().transactional(func)(self.db.transaction())
+
+    def acquire(self):
+        """잡으면 None, 다른 인스턴스가 잡고 있으면 그 owner 반환"""
+
+        def take(transaction):
+            snapshot = self.ref.get(transaction=transaction)
+            COSTS.read(LOCK_COLLECTION)
+            current = snapshot.to_dict() if snapshot.exists else None
+            now = _utcnow()
+            if current and current.get('owner') != self.owner and current.get('expires_at') \
+                    and current['expires_at'] > now:
+                return current['owner']
+            data = {'owner': self.owner, 'job': self.name, 'acquired_at': now,
+                    'expires_at': now + datetime.timedelta(seconds=self.ttl)}
+            transaction.set(self.ref, data)
+            COSTS.write(LOCK_COLLECTION, self.name, data)
+            return None
+
+        holder = self._transact(take)
+        if holder is None:
+            self._stop.clear()
+            self._heartbeat = threading.Thread(target=self._renew_loop, daemon=True)
+            self._heartbeat.start()
+        return holder
+
+    def _renew_loop(self):
+        while not self._stop.wait(self.ttl / 3):
+            data = {'expires_at': _utcnow() + datetime.timedelta(seconds=self.ttl)}
+            try:
+                self.ref.update(data)
+                COSTS.write(LOCK_COLLECTION, self.name, data)
+            except Exception as e:
+                print(f"⚠️  잠금 연장 실패 ({self.name}): {e}")
+
+    def release(self):
+        self._stop.set()
+        if self._heartbeat is not None:
+            self._heartbeat.join()
+            self._heartbeat = None
+
+        def drop(transaction):
+            snapshot = self.ref.get(transaction=transaction)
+            COSTS.read(LOCK_COLLECTION)
+            if snapshot.exists and (snapshot.to_dict() or {}).get('owner') == self.owner:
+                transaction.delete(self.ref)
+                COSTS.delete(LOCK_COLLECTION)
+
+        self._transact(drop)
+
+
+# --- 스케줄러 ---
+
+class Daemon:
+    """Job 들을 일정에 맞춰 하나씩 실행 (Firestore 클라이언트 공유)"""
+
+    def __init__(self, db, jobs, lock_ttl=DEFAULT_LOCK_TTL, owner=None):
+        self.db = db
+        self.jobs = {job.name: job for job in jobs}
+        self.lock_ttl = lock_ttl
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+        self.started_at = _utcnow()
+        self.stop = threading.Event()
+        self._due = []
+        self._wakeup = threading.Condition()
+        self._day = datetime.date.today()
+
+    def execute(self, job):
+        """작업 하나 실행 (잠금 → 실행 → 해제) 후 결과 상태 반환"""
+        job.running = True
+        started = time.time()
+        job.last = {'started_at': datetime.datetime.fromtimestamp(started).isoformat()}
+        lock = JobLock(self.db, job.name, self.owner, self.lock_ttl)
+        status, result, error = 'ok', None, None
+        try:
+            with COSTS.stage(job.name):
+                holder = lock.acquire()
+                if holder is not None:
+                    status, result = 'locked', {'holder': holder}
+                else:
+                    try:
+                        with METRICS.timer(f'job_{job.name}'):
+                            result = job.func(self.db, job.options)
+                    finally:
+                        lock.release()
+        except Exception as e:
+            status, error = 'error', f"{type(e).__name__}: {e}"
+            if not isinstance(e, ToolError):
+                traceback.print_exc()
+        finally:
+            job.running = False
+        duration = time.time() - started
+        job.runs[status] += 1
+        job.last.update({'status': status, 'duration_seconds': round(duration, 3),
+                         'result': result, 'error': error})
+        if status == 'ok':
+            job.last['succeeded_at'] = time.time()
+        icon = {'ok': '✅', 'locked': '🔒', 'error': '❌'}[status]
+        print(f"{icon} {job.name} {status} ({duration:.1f}초) {error or result or ''}")
+        return status
+
+    def _worker(self):
+        while not self.stop.is_set():
+            with self._wakeup:
+                while not self._due and not self.stop.is_set():
+                    self._wakeup.wait(1.0)
+                if self.stop.is_set():
+                    return
+                job = self._due.pop(0)
+            self.execute(job)
+
+    def tick(self, now=None):
+        """시각이 된 작업을 실행 대기열에 넣음 (앞 실행이 안 끝났으면 이번 차례는 건너뜀)"""
+        now = now or datetime.datetime.now()
+        if now.date() != self._day:
+            self._day = now.date()
+            COSTS.start_period()
+        for job in self.jobs.values():
+            if job.next_run is None:
+                job.next_run = job.schedule.next_after(now)
+            if job.next_run <= now:
+                with self._wakeup:
+                    if job.running or job in self._due:
+                        job.runs['skipped'] += 1
+                    else:
+                        self._due.append(job)
+                        self._wakeup.notify()
+                job.next_run = job.schedule.next_after(now)
+
+    def run_now(self, name):
+        with self._wakeup:
+            self._due.append(self.jobs[name])
+            self._wakeup.notify()
+
+    def run_forever(self):
+        worker = threading.Thread(target=self._worker, name='maintenance-worker', daemon=True)
+        worker.start()
+        try:
+            while not self.stop.is_set():
+                self.tick()
+                # 다음 분 경계(또는 가장 가까운 @every 실행 시각)까지 대기
+                now = datetime.datetime.now()
+                wake = min(job.next_run for job in self.jobs.values())
+                self.stop.wait(max(0.2, min((wake - now).total_seconds(), 60.0)))
+        finally:
+            self.stop.set()
+            with self._wakeup:
+                self._wakeup.notify_all()
+            # 실행 중인 작업은 끝까지 기다려서 잠금을 정리
+            worker.join()
+
+    def status(self):
+        return {
+            'owner': self.owner,
+            'started_at': self.started_at.isoformat(),
+            'queued': [job.name for job in self._due],
+            'jobs': {name: job.status() for name, job in self.jobs.items()},
+            'firestore': COSTS.summary()['totals'],
+            'budgets': dict(COSTS.budgets),
+        }
+
+
+def _labels(**labels):
+    return ','.join(f'{k}="{v}"' for k, v in labels.items())
+
+
+def to_prometheus(daemon):
+    lines = ['# TYPE gnhs_daemon_job_runs_total counter']
+    for name, job in sorted(daemon.jobs.items()):
+        for status, count in sorted(job.runs.items()):
+            lines.append(f'gnhs_daemon_job_runs_total{{{_labels(job=name, status=status)}}} {count}')
+    lines.append('# TYPE gnhs_daemon_job_running gauge')
+    for name, job in sorted(daemon.jobs.items()):
+        lines.append(f'gnhs_daemon_job_running{{{_labels(job=name)}}} {int(job.running)}')
+    lines.append('# TYPE gnhs_daemon_job_last_duration_seconds gauge')
+    lines.append('# TYPE gnhs_daemon_job_last_success_timestamp_seconds gauge')
+    for name, job in sorted(daemon.jobs.items()):
+        if 'duration_seconds' in job.last:
+            lines.append(f'gnhs_daemon_job_last_duration_seconds{{{_labels(job=name)}}} '
+                         f'{job.last["duration_seconds"]}')
+        if 'succeeded_at' in job.last:
+            lines.append(f'gnhs_daemon_job_last_success_timestamp_seconds{{{_labels(job=name)}}} '
+                         f'{job.last["succeeded_at"]:.0f}')
+    totals = COSTS.summary()['totals']
+    lines.append('# TYPE gnhs_firestore_operations gauge')
+    for op in ('reads', 'writes', 'deletes', 'index_entries', 'bytes_read', 'bytes_written'):
+        lines.append(f'gnhs_firestore_operations{{{_labels(op=op)}}} {totals[op]}')
+    lines.append('# TYPE gnhs_firestore_estimated_usd gauge')
+    lines.append(f'gnhs_firestore_estimated_usd {totals["usd"]}')
+    return '\n'.join(lines) + '\n'
+
+
+class _Handler(BaseHTTPRequestHandler):
+    daemon = None
+
+    def _send(self, status, body, content_type='application/json; charset=utf-8'):
+        if not isinstance(body, bytes):
+            body = json.dumps(body, ensure_ascii=False, default=str).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        path = urlparse(self.path).path
+        if path == '/health':
+            self._send(200, {'status': 'ok', 'owner': self.daemon.owner})
+        elif path == '/status':
+            self._send(200, self.daemon.status())
+        elif path == '/metrics':
+            self._send(200, to_prometheus(self.daemon).encode('utf-8'), 'text/plain; version=0.0.4')
+        else:
+            self._send(404, {'error': 'not found'})
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(daemon, host='127.0.0.1', port=8790):
+    handler = type('DaemonHandler', (_Handler,), {'daemon': daemon})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def run_daemon(args):
+    from gnhs_tools.cost import budgets_from_env
+    from gnhs_tools.firebase import get_db
+
+    jobs = load_jobs(args.config, set(args.jobs.split(',')) if args.jobs else None)
+    now = datetime.datetime.now()
+    print("=" * 70)
+    print("🛠️  유지보수 데몬")
+    print("=" * 70)
+    for job in jobs:
+        job.next_run = job.schedule.next_after(now)
+        print(f"  {job.name:<18} {job.schedule.expr:<16} 다음 실행 {job.next_run:%m-%d %H:%M:%S}")
+    if args.list:
+        return 0
+
+    # 전역 --budget-* 는 하루 단위 한도로 적용하고, 작업량은 항상 집계해서 /status 에 노출
+    COSTS.enable(COSTS.budgets if COSTS.enabled else budgets_from_env(), stage='daemon')
+    if args.ops_per_second:
+        COSTS.limiter = RateLimiter(args.ops_per_second)
+
+    unknown = [name for name in args.run_now or () if name not in {job.name for job in jobs}]
+    if unknown:
+        raise ToolError(f"--run-now 작업이 일정에 없습니다: {', '.join(unknown)}")
+    daemon = Daemon(get_db(), jobs, args.lock_ttl)
+    for name in args.run_now or ():
+        daemon.run_now(name)
+    server = make_server(daemon, args.host, args.port)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"🚀 http://{args.host}:{server.server_address[1]}/status (owner {daemon.owner}, Ctrl+C 로 종료)")
+
+    import signal
+    signal.signal(signal.SIGTERM, lambda *_: daemon.stop.set())
+    try:
+        daemon.run_forever()
+    except KeyboardInterrupt:
+        print("\n⏹️  종료 중... (실행 중인 작업이 끝나면 잠금을 풀고 종료)")
+        daemon.stop.set()
+    finally:
+        server.shutdown()
+        server.server_close()
+    return 0
@@ -0,0 +1,5 @@
+"""gnhs_tools 공통 예외"""
+
+
+class ToolError(Exception):
+    """사용자에게 메시지만 보여주고 종료할 오류 (CLI 가 트레이스백 없이 출력)"""
@@ -0,0 +1,52 @@
+"""
+Firestore 컬렉션 내보내기 (JSONL / CSV)
+"""
+import csv
+import datetime
+import json
+import sys
+
+
+def _default(value):
+    if isinstance(value, (datetime.date, datetime.datetime)):
+        return value.isoformat()
+    return str(value)
+
+
+def export_jsonl(records, out):
+    count = 0
+    for doc_id, data in records:
+        out.write(json.dumps({'id': doc_id, **data}, ensure_ascii=False, default=_default))
+        out.write('\n')
+        count += 1
+    return count
+
+
+def export_csv(records, out):
+    writer = None
+    count = 0
+    for doc_id, data in records:
+        row = {'id': doc_id, **{k: _default(v) if not isinstance(v, (str, int, float, bool)) else v
+                                for k, v in data.items()}}
+        if writer is None:
+            writer = csv.DictWriter(out, fieldnames=list(row), extrasaction='ignore')
+            writer.writeheader()
+        writer.writerow(row)
+        count += 1
+    return count
+
+
+def run_export(args):
+    from gnhs_tools.backends import FirestoreBackend
+
+    backend = FirestoreBackend()
+    records = backend.stream(args.collection)
+    writer = export_csv if args.format == 'csv' else export_jsonl
+
+    if args.output == '-':
+        count = writer(records, sys.stdout)
+    else:
+        with open(args.output, 'w', encoding='utf-8', newline='') as out:
+            count = writer(records, out)
+    print(f"✅ {args.collection}: {count}개 문서 내보내기 완료", file=sys.stderr)
+    return 0
@@ -0,0 +1,71 @@
+"""
+Firebase Admin SDK 지연 초기화
+
+firebase_admin 은 import 시점에 gRPC 스택 전체를 로드하므로 모듈 최상단에서
+import 하지 않습니다. 실제로 Firestore 가 필요한 시점에 get_db() 를 호출하세요.
+"""
+import os
+
+from gnhs_tools.errors import ToolError
+
+# 서비스 계정 키 경로 (환경 변수로 변경 가능)
+DEFAULT_CREDENTIALS = '/opt/flutter/firebase-admin-sdk.json'
+CREDENTIALS_ENV = 'GNHS_FIREBASE_CREDENTIALS'
+DEFAULT_PROJECT_ID = 'gnhs-alumni'
+
+_db = None
+
+
+class FirebaseUnavailable(ToolError, RuntimeError):
+    """Firebase Admin SDK 를 사용할 수 없을 때 발생"""
+
+
+def credentials_path():
+    """서비스 계정 키 파일 경로"""
+    return os.environ.get(CREDENTIALS_ENV, DEFAULT_CREDENTIALS)
+
+
+def firestore_module():
+    """google.cloud.firestore 모듈 (최초 호출 시 import)
+
+    SERVER_TIMESTAMP, Increment, ArrayUnion 등 센티널 값을 얻을 때 사용합니다.
+    """
+    try:
+        from google.cloud import firestore
+    except ImportError as e:
+        raise FirebaseUnavailable(
+            "firebase-admin 패키지가 필요합니다: pip install firebase-admin"
+        ) from e
+    return firestore
+
+
+def get_db():
+    """Firestore 클라이언트 (최초 호출 시 SDK 초기화)
+
+    FIRESTORE_EMULATOR_HOST 가 설정되어 있으면 서비스 계정 키 없이
+    에뮬레이터에 연결합니다.
+    """
+    global _db
+    if _db is not None:
+        return _db
+
+    if os.environ.get('FIRESTORE_EMULATOR_HOST'):
+        # 에뮬레이터는 인증이 필요 없으므로 google-cloud-firestore 를 직접 사용
+        firestore = firestore_module()
+        from google.auth.credentials import AnonymousCredentials
+        project_id = os.environ.get('GCLOUD_PROJECT', DEFAULT_PROJECT_ID)
+        _db = firestore.Client(project=project_id, credentials=AnonymousCredentials())
+        return _db
+
+    firestore_module()
+    import firebase_admin
+    from firebase_admin import credentials, firestore
+
+    try:
+        firebase_admin.get_app()
+    except ValueError:
+        cred = credentials.Certificate(credentials_path())
+        firebase_admin.initialize_app(cred)
+
+    _db = firestore.client()
+    return _db
@@ -0,0 +1,202 @@
+"""
+CSV 임포트 / 추가 필드 업데이트
+"""
+from gnhs_tools.contacts import COLLECTION, clean_phone, iter_alumni, read_records
+from gnhs_tools.cost import COSTS
+from gnhs_tools.metrics import METRICS
+
+# update 명령이 반영하는 추가 필드 (update_existing_data.py 와 동일)
+EXTRA_FIELDS = ('email2', 'department', 'address2', 'notes', 'phone2')
+
+
+def wipe_collection(backend, collection=COLLECTION):
+    """컬렉션의 모든 문서 삭제 (삭제한 문서 수 반환)"""
+    deleted = 0
+    with COSTS.stage('wipe'):
+        for doc_id, _ in backend.stream(collection, fields=()):
+            backend.delete(collection, doc_id)
+            deleted += 1
+            if deleted % 500 == 0:
+                print(f"  삭제 중... {deleted}개")
+        backend.flush()
+    return deleted
+
+
+def import_csv(backend, source, merge=True, progress_every=1000, regions=None):
+    """CSV 를 읽어 alumni 컬렉션에 기록 (통계 딕셔너리 반환)
+
+    merge 이면 backend.create 로 기록하므로, 이미 있는 문서에는
+    sync.CREATE_ONLY_FIELDS (사진, 인증 여부, created_at) 를 뺀 필드만 merge 되고
+    앱에서 바꾼 값이 지워지지 않습니다. merge=False (--overwrite) 는 문서 전체를 덮어씁니다.
+    regions 에 RegionCounter 를 넘기면 기록한 문서의 지역을 집계합니다.
+    """
+    stats = {'uploaded': 0}
+    for doc_id, data in iter_alumni(source, stats):
+        with METRICS.timer('write'):
+            if merge:
+                backend.create(COLLECTION, doc_id, data)
+            else:
+                backend.set(COLLECTION, doc_id, data)
+        if regions is not None:
+            regions.add(data)
+        stats['uploaded'] += 1
+        if progress_every and stats['uploaded'] % progress_every == 0:
+            print(f"📝 {stats['uploaded']}명 처리 완료...")
+    backend.flush()
+    return stats
+
+
+def load_extra_fields(source):
+    """입력 파일에서 전화번호 → 추가 필드 딕셔너리 로드"""
+    phone_to_data = {}
+    for record in METRICS.timed_iter(read_records(source), 'parse'):
+        phone = clean_phone(record.get('phone', ''))
+        if phone.startswith('010'):
+            phone_to_data[phone] = {
+                'email2': record.get('email2', ''),
+                'department': record.get('department', ''),
+                'address2': record.get('address2', ''),
+                'notes': record.get('notes', ''),
+                'phone2': clean_phone(record.get('phone2', '')),
+            }
+    return phone_to_data
+
+
+def update_extra_fields(backend, source):
+    """기존 문서에 CSV 의 추가 필드 중 바뀐 것만 반영 (업데이트한 문서 수 반환)"""
+    from gnhs_tools.sync import changed_fields
+
+    phone_to_data = load_extra_fields(source)
+    print(f"📋 CSV에서 {len(phone_to_data)}개 레코드 로드 완료")
+    METRICS.gauge('csv_records', len(phone_to_data))
+
+    updated = 0
+    for doc_id, current in backend.stream(COLLECTION, fields=EXTRA_FIELDS):
+        extra_data = phone_to_data.get(doc_id)
+        if extra_data is None:
+            continue
+        changes = changed_fields(extra_data, current)
+        if not changes:
+            continue
+        with METRICS.timer('write'):
+            backend.update(COLLECTION, doc_id, changes)
+        updated += 1
+    backend.flush()
+    return updated
+
+
+def diff_import_csv(backend, source, current):
+    """CSV 를 현재 상태와 비교해서 바뀐 필드만 기록 (통계 딕셔너리 반환)"""
+    from gnhs_tools.sync import sync_records
+
+    stats = {}
+    stats.update(sync_records(backend, iter_alumni(source, stats), current))
+    return stats
+
+
+def _open_source(args):
+    from gnhs_tools.sources import open_source
+    return open_source(args.csv, args.format, args.mapping)
+
+
+def run_import(args):
+    from gnhs_tools.address import RegionCounter, write_region_aggregate
+    from gnhs_tools.backends import open_backend
+
+    print("=" * 70)
+    print("🏫 강릉고등학교 총동문회 CSV 임포트" + (" (dry-run)" if args.dry_run else ""))
+    print("=" * 70)
+
+    if args.wipe and not args.dry_run and not args.yes:
+        print("\n⚠️  경고: 기존 alumni 데이터를 모두 삭제하고 다시 임포트합니다.")
+        if input("계속하시겠습니까? (yes/no): ").lower() != 'yes':
+            print("❌ 작업이 취소되었습니다.")
+            return 1
+
+    if args.diff:
+        if args.wipe or args.overwrite:
+            print("❌ --diff 는 --wipe/--overwrite 와 함께 사용할 수 없습니다.")
+            return 2
+        return _run_diff_import(args)
+
+    backend = open_backend(args.dry_run, read_firestore=args.wipe, record=args.record)
+    with backend:
+        if args.wipe:
+            if not args.dry_run and not args.no_backup:
+                from gnhs_tools.backup import backup_before_wipe
+                backup_before_wipe(backend.db, COLLECTION)
+            print("\n🗑️  기존 데이터 삭제 중...")
+            deleted = wipe_collection(backend)
+            print(f"✅ {deleted}개의 기존 데이터 삭제")
+
+        print(f"\n📂 {args.csv} 처리 중...")
+        # 컬렉션을 비우고 다시 채운 경우에만 CSV 집계가 곧 전체 집계
+        regions = RegionCounter() if args.wipe else None
+        stats = import_csv(backend, _open_source(args), merge=not args.overwrite, regions=regions)
+        if regions is not None:
+            write_region_aggregate(backend, regions)
+
+    print(f"\n{'=' * 70}")
+    print(f"📊 업로드: {stats['uploaded']}명")
+    print(f"⏭️  제외: {stats['skipped']}명 (이름 없음 또는 비010 번호)")
+    print(f"📋 총 처리: {stats['rows']}행")
+    print(f"🧾 쓰기 작업: {backend.stats}")
+    if not args.wipe:
+        print("ℹ️  지역 집계는 'regions' 명령으로 갱신하세요.")
+    print("=" * 70)
+    return 0
+
+
+def _run_diff_import(args):
+    from gnhs_tools.address import RegionCounter, write_region_aggregate
+    from gnhs_tools.backends import open_backend
+    from gnhs_tools.contacts import ALUMNI_FIELDS
+    from gnhs_tools.sync import CREATE_ONLY_FIELDS, load_mirror, read_state, save_mirror
+
+    backend = open_backend(args.dry_run, read_firestore=not args.mirror, record=args.record)
+    with backend:
+        if args.mirror:
+            current = load_mirror(args.mirror)
+            print(f"\n🪞 로컬 미러 {args.mirror}: {len(current)}개 문서")
+        else:
+            fields = [f for f in ALUMNI_FIELDS if f not in CREATE_ONLY_FIELDS]
+            current = read_state(backend, fields)
+            print(f"\n🔎 Firestore 필드 제한 읽기: {len(current)}개 문서")
+
+        print(f"\n📂 {args.csv} 비교 중...")
+        stats = diff_import_csv(backend, _open_source(args), current)
+
+        # current 는 비교 후 전체 상태이므로 그대로 집계
+        regions = RegionCounter()
+        for data in current.values():
+            regions.add(data)
+        write_region_aggregate(backend, regions)
+
+    if args.mirror and not args.dry_run:
+        save_mirror(args.mirror, current)
+
+    print(f"\n{'=' * 70}")
+    print(f"🆕 신규: {stats['created']}명")
+    print(f"✏️  변경: {stats['updated']}명")
+    print(f"⏸️  변경 없음: {stats['unchanged']}명")
+    print(f"⏭️  제외: {stats['skipped']}명 (이름 없음 또는 비010 번호)")
+    print(f"🧾 쓰기 작업: {backend.stats}")
+    print("=" * 70)
+    return 0
+
+
+def run_update(args):
+    from gnhs_tools.backends import open_backend
+
+    print("=" * 70)
+    print("📊 Firestore 추가 필드 업데이트" + (" (dry-run)" if args.dry_run else ""))
+    print("=" * 70)
+
+    backend = open_backend(args.dry_run, read_firestore=True, record=args.record)
+    with backend:
+        updated = update_extra_fields(backend, _open_source(args))
+
+    print(f"\n✅ 업데이트: {updated}개 문서")
+    print(f"추가된 필드: {', '.join(EXTRA_FIELDS)}")
+    print("=" * 70)
+    return 0
@@ -0,0 +1,79 @@
+"""
+데이터 마이그레이션 / 컬렉션 삭제
+"""
+from gnhs_tools.contacts import COLLECTION
+from gnhs_tools.metrics import METRICS
+
+
+def year_to_class(value):
+    """졸업년도를 회차로 변환 (2025 → 25, 1995 → 95, 이미 회차면 그대로)"""
+    if not isinstance(value, int):
+        return 0
+    if 0 < value <= 100:
+        return value
+    if value >= 2000:
+        value -= 2000
+    elif value >= 1900:
+        value -= 1900
+    else:
+        return 0
+    return value if 0 < value <= 100 else 0
+
+
+def migrate_class_numbers(backend):
+    """graduation_year 를 회차로 변환하고 class_number 와 일치시킴 (변경 문서 수 반환)"""
+    updated = 0
+    for doc_id, data in backend.stream(COLLECTION, fields=('graduation_year', 'class_number')):
+        old_year = data.get('graduation_year')
+        class_number = year_to_class(data.get('class_number')) or year_to_class(old_year)
+        if not class_number:
+            continue
+        if old_year == class_number and data.get('class_number') == class_number:
+            continue
+        with METRICS.timer('write'):
+            backend.update(COLLECTION, doc_id, {
+                'graduation_year': class_number,
+                'class_number': class_number,
+            })
+        updated += 1
+        if updated % 500 == 0:
+            print(f"  처리 중... {updated}개")
+    backend.flush()
+    return updated
+
+
+def run_migrate(args):
+    from gnhs_tools.backends import open_backend
+
+    print("=" * 70)
+    print("🔄 graduation_year 변환: 년도 → 회차" + (" (dry-run)" if args.dry_run else ""))
+    print("=" * 70)
+
+    backend = open_backend(args.dry_run, read_firestore=True, record=args.record)
+    with backend:
+        updated = migrate_class_numbers(backend)
+
+    print(f"\n✅ 변환 완료: {updated}개 문서 업데이트")
+    print("=" * 70)
+    return 0
+
+
+def run_wipe(args):
+    from gnhs_tools.backends import open_backend
+    from gnhs_tools.importer import wipe_collection
+
+    if not args.dry_run and not args.yes:
+        print(f"⚠️  경고: '{args.collection}' 컬렉션의 모든 문서를 삭제합니다.")
+        if input("계속하시겠습니까? (yes/no): ").lower() != 'yes':
+            print("❌ 작업이 취소되었습니다.")
+            return 1
+
+    backend = open_backend(args.dry_run, read_firestore=True, record=args.record)
+    with backend:
+        if not args.dry_run and not args.no_backup:
+            from gnhs_tools.backup import backup_before_wipe
+            backup_before_wipe(backend.db, args.collection)
+        deleted = wipe_collection(backend, args.collection)
+
+    print(f"✅ {deleted}개 문서 삭제" + (" (dry-run)" if args.dry_run else ""))
+    return 0
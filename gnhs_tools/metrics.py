@@ -0,0 +1,239 @@
+"""
+단계별 계측 (타이머 / 카운터 / 히스토그램)
+
+기본값은 비활성 상태이며, 이때 계측 호출은 거의 비용이 없습니다.
+CLI 의 --metrics 옵션으로 활성화하면 실행이 끝난 뒤 JSON 또는
+Prometheus textfile 형식으로 요약을 기록합니다.
+
+    from gnhs_tools.metrics import METRICS
+
+    with METRICS.timer('commit'):
+        batch.commit()
+    METRICS.count('rows')
+"""
+import json
+import os
+import time
+
+# 히스토그램 버킷 경계 (초)
+BUCKETS = (0.00001, 0.0001, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0)
+
+
+class Histogram:
+    """고정 버킷 히스토그램"""
+
+    __slots__ = ('count', 'total', 'max', 'buckets')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKETS) + 1)
+
+    def observe(self, value):
+        self.count += 1
+        self.total += value
+        if value > self.max:
+            self.max = value
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                self.buckets[i] += 1
+                return
+        self.buckets[-1] += 1
+
+    def to_dict(self):
+        return {
+            'count': self.count,
+            'sum_seconds': round(self.total, 6),
+            'avg_ms': round(self.total / self.count * 1000, 4) if self.count else 0.0,
+            'max_ms': round(self.max * 1000, 4),
+            'buckets': {str(b): n for b, n in zip(BUCKETS + ('+Inf',), self.buckets)},
+        }
+
+
+class _Timer:
+    __slots__ = ('_hist', '_start')
+
+    def __init__(self, hist):
+        self._hist = hist
+
+    def __enter__(self):
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self._hist.observe(time.perf_counter() - self._start)
+
+
+class _NullTimer:
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return None
+
+
+_NULL_TIMER = _NullTimer()
+
+
+class Metrics:
+    """계측 레지스트리"""
+
+    def __init__(self):
+        self.enabled = False
+        self.reset()
+
+    def reset(self):
+        self.counters = {}
+        self.stages = {}
+        self.gauges = {}
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.process_time()
+
+    def enable(self):
+        self.enabled = True
+        self.reset()
+
+    def _stage(self, stage):
+        hist = self.stages.get(stage)
+        if hist is None:
+            hist = self.stages[stage] = Histogram()
+        return hist
+
+    def timer(self, stage):
+        """with 블록 실행 시간을 stage 히스토그램에 기록"""
+        if not self.enabled:
+            return _NULL_TIMER
+        return _Timer(self._stage(stage))
+
+    def observe(self, stage, seconds):
+        if self.enabled:
+            self._stage(stage).observe(seconds)
+
+    def count(self, name, n=1):
+        if self.enabled:
+            self.counters[name] = self.counters.get(name, 0) + n
+
+    def gauge(self, name, value):
+        if self.enabled:
+            self.gauges[name] = value
+
+    def timed_iter(self, iterable, stage):
+        """이터레이터의 다음 항목을 꺼내는 시간을 stage 로 기록"""
+        if not self.enabled:
+            yield from iterable
+            return
+        hist = self._stage(stage)
+        iterator = iter(iterable)
+        perf_counter = time.perf_counter
+        while True:
+            start = perf_counter()
+            try:
+                item = next(iterator)
+            except StopIteration:
+                return
+            hist.observe(perf_counter() - start)
+            yield item
+
+    def summary(self, command=None):
+        wall = time.perf_counter() - self._wall_start
+        cpu = time.process_time() - self._cpu_start
+        stage_total = sum(h.total for h in self.stages.values())
+        return {
+            'command': command,
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+            'wall_seconds': round(wall, 6),
+            'cpu_seconds': round(cpu, 6),
+            # 1에 가까우면 파이썬 루프(CPU), 0에 가까우면 Firestore 대기 위주
+            'cpu_ratio': round(cpu / wall, 4) if wall else 0.0,
+            'unaccounted_seconds': round(max(wall - stage_total, 0.0), 6),
+            'counters': dict(self.counters),
+            'gauges': dict(self.gauges),
+            'stages': {name: h.to_dict() for name, h in self.stages.items()},
+        }
+
+    def write(self, path, command=None):
+        """확장자가 .prom 이면 Prometheus textfile, 그 외에는 JSON 으로 기록"""
+        summary = self.summary(command)
+        text = to_prometheus(summary) if path.endswith('.prom') else \
+            json.dumps(summary, ensure_ascii=False, indent=2) + '\n'
+        # textfile collector 가 쓰다 만 파일을 읽지 않도록 교체 방식으로 기록
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(text)
+        os.replace(tmp_path, path)
+        return summary
+
+
+def _labels(**labels):
+    return ','.join(f'{k}="{v}"' for k, v in labels.items() if v is not None)
+
+
+def to_prometheus(summary):
+    """요약 딕셔너리를 Prometheus textfile 형식으로 변환"""
+    command = summary['command']
+    base = _labels(command=command)
+    lines = [
+        '# TYPE gnhs_run_wall_seconds gauge',
+        f'gnhs_run_wall_seconds{{{base}}} {summary["wall_seconds"]}',
+        '# TYPE gnhs_run_cpu_seconds gauge',
+        f'gnhs_run_cpu_seconds{{{base}}} {summary["cpu_seconds"]}',
+        '# TYPE gnhs_events_total counter',
+    ]
+    for name, value in sorted(summary['counters'].items()):
+        lines.append(f'gnhs_events_total{{{_labels(command=command, name=name)}}} {value}')
+    lines.append('# TYPE gnhs_gauge gauge')
+    for name, value in sorted(summary['gauges'].items()):
+        lines.append(f'gnhs_gauge{{{_labels(command=command, name=name)}}} {value}')
+    lines.append('# TYPE gnhs_stage_seconds histogram')
+    for stage, hist in sorted(summary['stages'].items()):
+        cumulative = 0
+        for bound, n in hist['buckets'].items():
+            cumulative += n
+            labels = _labels(command=command, stage=stage, le=bound)
+            lines.append(f'gnhs_stage_seconds_bucket{{{labels}}} {cumulative}')
+        labels = _labels(command=command, stage=stage)
+        lines.append(f'gnhs_stage_seconds_sum{{{labels}}} {hist["sum_seconds"]}')
+        lines.append(f'gnhs_stage_seconds_count{{{labels}}} {hist["count"]}')
+    return '\n'.join(lines) + '\n'
+
+
+METRICS = Metrics()
+
+
+class Profiler:
+    """cProfile / tracemalloc 선택 실행"""
+
+    def __init__(self, profile_path=None, trace_memory=False):
+        self.profile_path = profile_path
+        self.trace_memory = trace_memory
+        self._profile = None
+
+    def __enter__(self):
+        if self.trace_memory:
+            import tracemalloc
+            tracemalloc.start()
+        if self.profile_path:
+            import cProfile
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._profile is not None:
+            import pstats
+            self._profile.disable()
+            self._profile.dump_stats(self.profile_path)
+            print(f"\n🔬 cProfile 결과: {self.profile_path} (상위 15개, 누적 시간순)")
+            pstats.Stats(self._profile).sort_stats('cumulative').print_stats(15)
+        if self.trace_memory:
+            import tracemalloc
+            current, peak = tracemalloc.get_traced_memory()
+            METRICS.gauge('memory_peak_bytes', peak)
+            METRICS.gauge('memory_current_bytes', current)
+            print(f"\n🧠 메모리: 현재 {current / 1024 / 1024:.1f}MB / 최대 {peak / 1024 / 1024:.1f}MB")
+            for stat in tracemalloc.take_snapshot().statistics('lineno')[:10]:
+                print(f"  {stat}")
+            tracemalloc.stop()
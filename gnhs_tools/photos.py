@@ -0,0 +1,293 @@
+"""
+프로필 사진 썸네일 파이프라인
+
+사진 디렉터리(파일 이름 = 전화번호, 예: 010-1234-5678.jpg) 또는 연락처
+파일의 Photo 열(URL 이나 파일 경로)에서 원본을 모아, 프로세스 풀에서 크기별
+정사각형 썸네일(WebP 또는 JPEG)로 만듭니다.
+
+- 내용 주소 저장소: 썸네일 이름은 원본 SHA-256 앞 16자리 + 크기
+  (photos/3fa9c1d2e4b5a6f7-256.webp). 같은 사진을 쓰는 동문이나 지난번과
+  같은 원본은 다시 변환하지 않습니다. URL 원본은 photos/downloads 에 캐시합니다.
+- 게시: 저장소의 썸네일 전체를 build/web/photos 와 맞춥니다 (flutter build web 이
+  build/web 을 지우므로 이번 실행에서 바뀐 사진만이 아니라 전부).
+  /photos/*.webp 는 firebase.json 의 이미지 immutable 캐시 헤더를 그대로 받습니다.
+- 반영: profile_photo_url (PROFILE_SIZE) 과 profile_photo_thumbnails {크기: URL} 을
+  배치로 update() 합니다. 값이 같으면 쓰지 않고, 앱에서 직접 올린 사진
+  (다른 주소)은 --force 없이는 덮어쓰지 않습니다.
+
+Pillow 가 필요합니다 (pip install Pillow).
+
+    python -m gnhs_tools photos --dir ~/photos --dry-run
+    python -m gnhs_tools photos --input contacts.csv      # Photo 열의 URL
+    firebase deploy --only hosting
+"""
+import hashlib
+import os
+import shutil
+import urllib.request
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+from gnhs_tools.contacts import COLLECTION, SERVER_TIMESTAMP, clean_phone
+from gnhs_tools.errors import ToolError
+from gnhs_tools.metrics import METRICS
+
+DEFAULT_STORE = 'photos'
+DEFAULT_PUBLISH = os.path.join('build', 'web', 'photos')
+HOSTING_PATH = '/photos/'
+DEFAULT_BASE_URL = 'https://gnhs-alumni.web.app'
+THUMBNAIL_SIZES = (96, 256, 768)
+# profile_photo_url 에 쓰는 크기 (목록/상세 화면의 CircleAvatar)
+PROFILE_SIZE = 256
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.webp', '.gif', '.bmp')
+# 형식별 (Pillow 형식 이름, 확장자, 저장 옵션)
+FORMATS = {
+    'webp': ('WEBP', 'webp', {'quality': 80, 'method': 4}),
+    'jpeg': ('JPEG', 'jpg', {'quality': 82, 'optimize': True, 'progressive': True}),
+}
+FETCH_TIMEOUT = 30
+
+
+def _pil():
+    try:
+        from PIL import Image
+    except ImportError as e:
+        raise ToolError("사진 썸네일에는 Pillow 가 필요합니다: pip install Pillow") from e
+    return Image
+
+
+def file_digest(path):
+    """원본 파일 SHA-256 앞 16자리 (내용 주소)"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def thumbnail_names(digest, fmt, sizes=THUMBNAIL_SIZES):
+    ext = FORMATS[fmt][1]
+    return {size: f"{digest}-{size}.{ext}" for size in sizes}
+
+
+def make_thumbnails(task):
+    """(다이제스트, 원본 경로, 저장소, 형식, 크기들) → (다이제스트, 오류 또는 None)
+
+    프로세스 풀 워커에서 실행됩니다.
+    """
+    digest, path, store, fmt, sizes = task
+    from PIL import Image, ImageOps
+
+    pil_format, _, options = FORMATS[fmt]
+    try:
+        with Image.open(path) as image:
+            # JPEG 는 필요한 크기 근처로 줄여서 디코딩 (큰 원본에서 가장 비싼 단계)
+            image.draft('RGB', (max(sizes) * 2, max(sizes) * 2))
+            image = ImageOps.exif_transpose(image).convert('RGB')
+            for size, name in thumbnail_names(digest, fmt, sizes).items():
+                # 원본보다 크게 늘리지 않음
+                edge = min(size, *image.size)
+                thumb = ImageOps.fit(image, (edge, edge), Image.LANCZOS)
+                target = os.path.join(store, name)
+                thumb.save(f"{target}.tmp", pil_format, **options)
+                os.replace(f"{target}.tmp", target)
+    except Exception as e:
+        return digest, f"{type(e).__name__}: {e}"
+    return digest, None
+
+
+# --- 원본 찾기 ---
+
+def directory_sources(directory):
+    """(문서 ID, 파일 경로) (파일 이름에서 010 전화번호를 찾음)"""
+    for entry in sorted(os.scandir(directory), key=lambda e: e.name):
+        stem, ext = os.path.splitext(entry.name)
+        if entry.is_file() and ext.lower() in IMAGE_EXTENSIONS:
+            doc_id = clean_phone(stem)
+            if doc_id.startswith('010'):
+                yield doc_id, entry.path
+
+
+def record_sources(path, fmt=None, mapping=None):
+    """연락처 파일의 (문서 ID, Photo 값) (파일 경로는 연락처 파일 기준 상대 경로)"""
+    from gnhs_tools.contacts import record_to_alumni
+    from gnhs_tools.sources import open_source
+
+    base = os.path.dirname(os.path.abspath(path))
+    for record in open_source(path, fmt, mapping):
+        photo = (record.get('photo') or '').strip()
+        result = record_to_alumni(record) if photo else None
+        if result is None:
+            continue
+        if not photo.startswith(('http://', 'https://')):
+            photo = os.path.join(base, photo)
+        yield result[0], photo
+
+
+def fetch(url, download_dir):
+    """URL 원본을 download_dir 에 캐시하고 경로 반환"""
+    name = hashlib.sha256(url.encode('utf-8')).hexdigest()[:24]
+    path = os.path.join(download_dir, name)
+    if not os.path.exists(path):
+        with METRICS.timer('photo_fetch'):
+            with urllib.request.urlopen(url, timeout=FETCH_TIMEOUT) as response:
+                data = response.read()
+        with open(f"{path}.tmp", 'wb') as f:
+            f.write(data)
+        os.replace(f"{path}.tmp", path)
+    return path
+
+
+# --- 파이프라인 ---
+
+def publish_store(store, publish_dir):
+    """저장소의 썸네일을 모두 publish_dir 에 복사 (같은 이름은 내용도 같으므로 없을 때만, 복사 수 반환)"""
+    os.makedirs(publish_dir, exist_ok=True)
+    copied = 0
+    for entry in os.scandir(store):
+        if not entry.is_file() or entry.name.endswith('.tmp'):
+            continue
+        target = os.path.join(publish_dir, entry.name)
+        if not os.path.exists(target) or os.path.getsize(target) != entry.stat().st_size:
+            shutil.copy2(entry.path, target)
+            copied += 1
+    return copied
+
+
+class PhotoPipeline:
+    """원본 → 다이제스트 → 썸네일 (저장소에 없을 때만) → 게시"""
+
+    def __init__(self, store=DEFAULT_STORE, publish_dir=DEFAULT_PUBLISH, fmt='webp',
+                 sizes=THUMBNAIL_SIZES, workers=None):
+        self.store = store
+        self.publish_dir = publish_dir
+        self.fmt = fmt
+        self.sizes = tuple(sizes)
+        self.workers = workers or os.cpu_count() or 1
+        self.download_dir = os.path.join(store, 'downloads')
+        self.stats = {'sources': 0, 'failed': 0, 'images': 0, 'generated': 0, 'reused': 0, 'published': 0}
+        self.errors = []
+        os.makedirs(self.download_dir, exist_ok=True)
+        os.makedirs(publish_dir, exist_ok=True)
+
+    def _resolve(self, item):
+        doc_id, source = item
+        try:
+            if source.startswith(('http://', 'https://')):
+                source = fetch(source, self.download_dir)
+            return doc_id, file_digest(source), source
+        except Exception as e:
+            return doc_id, None, f"{type(e).__name__}: {e}"
+
+    def _stored(self, digest):
+        return all(os.path.exists(os.path.join(self.store, name))
+                   for name in thumbnail_names(digest, self.fmt, self.sizes).values())
+
+    def run(self, sources):
+        """{문서 ID: 다이제스트} (썸네일이 준비된 동문만)"""
+        # 1) 다운로드/해시 (I/O 위주라 스레드)
+        resolved = {}
+        paths = {}
+        with ThreadPoolExecutor(max(4, self.workers * 2)) as pool, METRICS.timer('photo_resolve'):
+            for doc_id, digest, detail in pool.map(self._resolve, sources):
+                self.stats['sources'] += 1
+                if digest is None:
+                    self.stats['failed'] += 1
+                    self.errors.append((doc_id, detail))
+                    continue
+                resolved[doc_id] = digest
+                paths.setdefault(digest, detail)
+        self.stats['images'] = len(paths)
+
+        # 2) 저장소에 없는 원본만 프로세스 풀에서 변환 (CPU 위주)
+        tasks = [(digest, path, self.store, self.fmt, self.sizes)
+                 for digest, path in paths.items() if not self._stored(digest)]
+        self.stats['reused'] = len(paths) - len(tasks)
+        failed = set()
+        if tasks:
+            with ProcessPoolExecutor(self.workers) as pool, METRICS.timer('photo_thumbnail'):
+                for digest, error in pool.map(make_thumbnails, tasks, chunksize=4):
+                    if error:
+                        failed.add(digest)
+                        self.errors.append((paths[digest], error))
+                    else:
+                        self.stats['generated'] += 1
+        if failed:
+            self.stats['failed'] += sum(1 for d in resolved.values() if d in failed)
+            resolved = {doc_id: d for doc_id, d in resolved.items() if d not in failed}
+
+        # 3) 게시: 예전에 배정한 사진도 배포에 남도록 저장소 전체
+        self.stats['published'] = publish_store(self.store, self.publish_dir)
+        return resolved
+
+    def urls(self, digest, base_url=DEFAULT_BASE_URL):
+        return {str(size): f"{base_url.rstrip('/')}{HOSTING_PATH}{name}"
+                for size, name in thumbnail_names(digest, self.fmt, self.sizes).items()}
+
+
+def update_photo_fields(backend, assignments, urls, current, base_url=DEFAULT_BASE_URL, force=False):
+    """바뀐 동문만 profile_photo_url / profile_photo_thumbnails update() (통계 반환)
+
+    current 는 Firestore 에서 읽은 {문서 ID: {'profile_photo_url': ...}} 이고, 여기
+    없는 문서는 건너뜁니다 (빈 딕셔너리면 모두 건너뜀). None 이면 상태를 읽지
+    않은 것으로 보고 확인 없이 모두 update 합니다 (쓰기 로그 검토용).
+    """
+    ours = f"{base_url.rstrip('/')}{HOSTING_PATH}"
+    stats = {'updated': 0, 'unchanged': 0, 'kept_uploaded': 0, 'missing': 0}
+    for doc_id, digest in sorted(assignments.items()):
+        thumbnails = urls(digest)
+        url = thumbnails[str(PROFILE_SIZE)]
+        if current is not None:
+            if doc_id not in current:
+                stats['missing'] += 1
+                continue
+            existing = current[doc_id].get('profile_photo_url') or ''
+            if existing == url:
+                stats['unchanged'] += 1
+                continue
+            if existing and not existing.startswith(ours) and not force:
+                stats['kept_uploaded'] += 1
+                continue
+        backend.update(COLLECTION, doc_id, {
+            'profile_photo_url': url,
+            'profile_photo_thumbnails': thumbnails,
+            'updated_at': SERVER_TIMESTAMP,
+        })
+        stats['updated'] += 1
+    backend.flush()
+    return stats
+
+
+def run_photos(args):
+    from gnhs_tools.backends import open_backend
+    from gnhs_tools.sync import read_state
+
+    _pil()
+    sizes = tuple(sorted({int(s) for s in args.sizes.split(',')}))
+    if PROFILE_SIZE not in sizes:
+        raise ToolError(f"--sizes 에 profile_photo_url 크기 {PROFILE_SIZE} 가 있어야 합니다.")
+
+    print("=" * 70)
+    print("🖼️  프로필 사진 썸네일" + (" (dry-run)" if args.dry_run else ""))
+    print("=" * 70)
+
+    sources = directory_sources(args.dir) if args.dir else record_sources(args.input, args.format, args.mapping)
+    pipeline = PhotoPipeline(args.store, args.publish, args.image_format, sizes, args.workers)
+    assignments = pipeline.run(sources)
+    stats = pipeline.stats
+    print(f"📷 원본 {stats['sources']}개 → 서로 다른 사진 {stats['images']}장 "
+          f"(새로 변환 {stats['generated']} / 저장소 재사용 {stats['reused']} / 실패 {stats['failed']})")
+    print(f"🚚 게시: 저장소 → {args.publish} ({stats['published']}개 파일 복사)")
+    for key, error in pipeline.errors[:10]:
+        print(f"  ⚠️  {key}: {error}")
+
+    backend = open_backend(args.dry_run, read_firestore=True, record=args.record)
+    with backend:
+        # 문서가 하나도 없어도 {} 이므로 모두 '문서 없음' 으로 건너뜀
+        current = read_state(backend, ('profile_photo_url',))
+        result = update_photo_fields(backend, assignments, lambda d: pipeline.urls(d, args.base_url),
+                                     current, args.base_url, args.force)
+    print(f"✏️  profile_photo_url 갱신 {result['updated']}명 / 그대로 {result['unchanged']}명 / "
+          f"앱에서 올린 사진 유지 {result['kept_uploaded']}명 / 문서 없음 {result['missing']}명")
+    print("🚀 firebase deploy --only hosting 으로 배포하세요.")
+    print("=" * 70)
+    return 0
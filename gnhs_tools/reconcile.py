@@ -0,0 +1,365 @@
+"""
+연락처 파일(기준) ↔ Firestore 대조
+
+예전 스크립트들이 남긴 불일치를 다시 임포트하지 않고 찾아서 고칩니다.
+
+- 문서 ID: '010-1234-5678' (하이픈) 과 '01012345678' (숫자만) 이 섞여 있음
+- 회차: 회차 숫자(21) / 년도(2021, 1995, 기본값 2000) / class_number 없음
+- phone 필드 하이픈 여부, 그 밖의 필드 값 차이
+
+연락처 파일은 임포트와 같은 정규화(iter_alumni)를 거쳐 문서 ID 순으로
+정렬하고, Firestore 는 파티션 쿼리로 필요한 필드만 병렬로 읽습니다. 모든
+파티션은 같은 읽기 시각(read_time)을 쓰므로 실행 도중 앱에서 바뀐 문서가
+섞이지 않습니다. Firestore 문서는 정규 키(전화번호 숫자)로 정렬하므로 같은
+동문의 하이픈 ID 문서와 숫자 ID 문서가 나란히 오고, 두 스트림을 병합 조인해서
+불일치를 종류별로 셉니다. 정렬은 contactdiff 의 외부 정렬을 쓰므로 메모리
+사용량은 레코드 수와 무관합니다.
+
+고치는 쓰기는 동문 한 명당 최대 한 번(바뀐 필드만 merge set, 없으면 create)이고,
+하이픈 ID 문서는 숫자 ID 문서로 옮긴 뒤 삭제합니다. 옮길 때는 연락처 파일이
+정하지 않는 필드(앱에서 쓴 organization, 사진, company_key, created_at 등)를
+모두 가져갑니다. 이를 위해 스캔은 문서 전체를 읽고(읽기 비용은 같음), 하이픈
+ID 문서만 전체 필드를 메모리에 보관합니다.
+연락처 파일에 없는 문서(앱에서 추가한 동문 등)는 --delete-orphans 없이는
+보고만 합니다.
+
+    python -m gnhs_tools reconcile                            # 불일치 보고 (쓰기 없음)
+    python -m gnhs_tools reconcile --record fix.wal && \\
+        python -m gnhs_tools replay fix.wal                   # 고치는 쓰기만 병렬 반영
+"""
+import json
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from gnhs_tools.contactdiff import DEFAULT_RUN_ROWS, sorted_records
+from gnhs_tools.contacts import ALUMNI_FIELDS, COLLECTION, SERVER_TIMESTAMP, clean_phone, iter_alumni
+from gnhs_tools.cost import COSTS
+from gnhs_tools.maintenance import year_to_class
+from gnhs_tools.metrics import METRICS
+from gnhs_tools.sync import CREATE_ONLY_FIELDS, changed_fields
+
+# 연락처 파일이 기준인 필드 (import --diff 와 같음)
+COMPARED_FIELDS = tuple(f for f in ALUMNI_FIELDS if f not in CREATE_ONLY_FIELDS)
+# 정규 문서에 있어도 비어 있으면 하이픈 ID 문서 값으로 채우는 필드
+CARRIED_FIELDS = ('profile_photo_url', 'is_verified')
+# 정렬 스트림에 싣는 필드 (나머지는 이름만 EXTRA_KEY 에)
+SCAN_FIELDS = COMPARED_FIELDS + CARRIED_FIELDS
+EXTRA_KEY = '$extra'
+DEFAULT_WORKERS = 8
+CATEGORIES = (
+    'missing', 'orphan', 'legacy_id', 'duplicate_id',
+    'class_missing', 'class_encoding', 'class_mismatch', 'phone_format', 'field_drift',
+)
+CATEGORY_LABELS = {
+    'missing': "Firestore 에 없음",
+    'orphan': "연락처 파일에 없음",
+    'legacy_id': "하이픈 문서 ID",
+    'duplicate_id': "같은 번호 문서 중복",
+    'class_missing': "class_number 없음",
+    'class_encoding': "회차를 년도로 기록",
+    'class_mismatch': "회차 다름",
+    'phone_format': "phone 필드 형식",
+    'field_drift': "기타 필드 값 다름",
+}
+
+# 정규 키와 문서 ID 를 이어 붙이는 구분자 (숫자/하이픈보다 앞에 정렬됨)
+_KEY_SEP = '\t'
+_SCAN_CHUNK = 500
+
+
+def canonical_key(doc_id, data):
+    """Firestore 문서의 정규 키 (문서 ID 의 숫자, 010 이 아니면 phone 필드의 숫자)"""
+    key = clean_phone(doc_id)
+    if key.startswith('010'):
+        return key
+    return clean_phone(str(data.get('phone') or '')) or doc_id
+
+
+# --- Firestore 병렬 스캔 ---
+
+def parallel_scan(db, collection=COLLECTION, fields=None, workers=DEFAULT_WORKERS, read_time=None):
+    """파티션별 쿼리를 스레드에서 읽어 (문서 ID, 데이터)로 반환 (순서 없음, fields 로 필드 제한)
+
+    read_time 은 backup.ReadTime (모든 파티션을 같은 서버 시각으로 읽음) 입니다.
+    """
+    from gnhs_tools.backup import _partitions, _supports_read_time, stream_at
+
+    queries = _partitions(db, collection, workers)
+    if fields is not None:
+        queries = [q.select(list(fields)) for q in queries]
+    if read_time is not None and not _supports_read_time(queries[0]):
+        print("⚠️  이 SDK 는 read_time 을 지원하지 않아 파티션별 최신 상태로 읽습니다.")
+        read_time = None
+    chunks = queue.Queue(maxsize=max(4, len(queries) * 4))
+    stop = threading.Event()
+    done = object()
+
+    def put(item):
+        while not stop.is_set():
+            try:
+                chunks.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def scan(query):
+        try:
+            chunk = []
+            for doc in COSTS.reads(collection, METRICS.timed_iter(stream_at(query, read_time), 'reconcile_read')):
+                # 컬렉션 그룹 파티션에는 같은 이름의 하위 컬렉션 문서도 섞일 수 있음
+                if doc.reference.parent.parent is not None:
+                    continue
+                chunk.append((doc.id, doc.to_dict() or {}))
+                if len(chunk) >= _SCAN_CHUNK:
+                    put(chunk)
+                    chunk = []
+                if stop.is_set():
+                    return
+            if chunk:
+                put(chunk)
+        finally:
+            put(done)
+
+    with ThreadPoolExecutor(len(queries)) as pool:
+        futures = [pool.submit(scan, query) for query in queries]
+        try:
+            remaining = len(futures)
+            while remaining:
+                item = chunks.get()
+                if item is done:
+                    remaining -= 1
+                    continue
+                METRICS.count('docs_read', len(item))
+                yield from item
+        finally:
+            stop.set()
+        for future in futures:
+            future.result()
+
+
+def project(records, legacy_docs):
+    """전체 문서 → (정규 키, 문서 ID, 정렬용 데이터)
+
+    정렬용 데이터는 SCAN_FIELDS 와 나머지 필드 이름 목록(EXTRA_KEY)만 담고,
+    하이픈 ID 문서의 전체 데이터는 legacy_docs 에 보관합니다.
+    """
+    for doc_id, data in records:
+        key = canonical_key(doc_id, data)
+        if key != doc_id:
+            legacy_docs[doc_id] = data
+        projected = {k: data[k] for k in SCAN_FIELDS if k in data}
+        projected[EXTRA_KEY] = sorted(k for k in data if k not in COMPARED_FIELDS)
+        yield key, doc_id, projected
+
+
+def keyed_firestore(records, run_rows=DEFAULT_RUN_ROWS, legacy_docs=None):
+    """(정규 키, [(문서 ID, 정렬용 데이터), ...]) 를 정규 키 순으로 반환"""
+    if legacy_docs is None:
+        legacy_docs = {}
+    composite = ((f"{key}{_KEY_SEP}{doc_id}", data) for key, doc_id, data in project(records, legacy_docs))
+    key, group = None, []
+    for composite_id, data in sorted_records(composite, run_rows):
+        doc_key, doc_id = composite_id.split(_KEY_SEP, 1)
+        if doc_key != key and group:
+            yield key, group
+            group = []
+        key = doc_key
+        group.append((doc_id, data))
+    if group:
+        yield key, group
+
+
+def join_by_key(source, firestore):
+    """(키, 연락처 데이터 또는 None, Firestore 문서 목록) 을 키 순으로 반환"""
+    missing = object()
+    source_iter, store_iter = iter(source), iter(firestore)
+    s = next(source_iter, missing)
+    f = next(store_iter, missing)
+    while s is not missing or f is not missing:
+        if f is missing or (s is not missing and s[0] < f[0]):
+            yield s[0], s[1], []
+            s = next(source_iter, missing)
+        elif s is missing or f[0] < s[0]:
+            yield f[0], None, f[1]
+            f = next(store_iter, missing)
+        else:
+            yield s[0], s[1], f[1]
+            s = next(source_iter, missing)
+            f = next(store_iter, missing)
+
+
+# --- 대조 ---
+
+def _class_category(expected, current):
+    if 'class_number' not in current:
+        return 'class_missing'
+    for field in ('class_number', 'graduation_year'):
+        value = current.get(field)
+        if value != expected and year_to_class(value) == expected:
+            return 'class_encoding'
+    return 'class_mismatch'
+
+
+def _legacy_fields(legacy, legacy_docs):
+    """하이픈 ID 문서들의 COMPARED_FIELDS 밖 필드 (앞 문서 우선, 빈 값은 뒤 문서로 채움)"""
+    fields = {}
+    for doc_id, _ in legacy:
+        for field, value in legacy_docs.get(doc_id, {}).items():
+            if field in COMPARED_FIELDS or field == 'updated_at':
+                continue
+            if field not in fields or (not fields[field] and value):
+                fields[field] = value
+    return fields
+
+
+def classify(key, expected, docs, legacy_docs=None):
+    """동문 한 명의 대조 결과: (종류 목록, 바뀐 필드, 고치는 쓰기 목록)
+
+    docs 는 정렬용 데이터, legacy_docs 는 하이픈 ID 문서의 전체 데이터입니다.
+    쓰기는 ('create'|'merge'|'delete', 문서 ID, 데이터) 입니다.
+    """
+    if expected is None:
+        return ['orphan'], {}, [('delete', doc_id, None) for doc_id, _ in docs]
+
+    categories = []
+    writes = []
+    primary = next((data for doc_id, data in docs if doc_id == key), None)
+    legacy = [(doc_id, data) for doc_id, data in docs if doc_id != key]
+    if not docs:
+        categories.append('missing')
+    elif legacy:
+        categories.append('duplicate_id' if primary is not None else 'legacy_id')
+
+    # 연락처 파일이 정하지 않는 필드는 하이픈 ID 문서에서 가져감 (created_at 포함)
+    moved = _legacy_fields(legacy, legacy_docs or {})
+    if primary is None:
+        changes = {}
+        writes.append(('create', key, {'created_at': SERVER_TIMESTAMP, **moved, **expected,
+                                       'updated_at': SERVER_TIMESTAMP}))
+    else:
+        # 정규 문서에 없는 필드, 비어 있는 사진/인증 값만 채움
+        present = set(primary.get(EXTRA_KEY, ()))
+        carried = {field: value for field, value in moved.items()
+                   if field not in present or (field in CARRIED_FIELDS and not primary.get(field) and value)}
+        changes = changed_fields(expected, primary)
+        if 'class_number' in changes or 'graduation_year' in changes:
+            categories.append(_class_category(expected.get('class_number'), primary))
+        if 'phone' in changes and clean_phone(str(primary.get('phone') or '')) == expected.get('phone'):
+            categories.append('phone_format')
+        if set(changes) - {'class_number', 'graduation_year', 'phone'}:
+            categories.append('field_drift')
+        if changes or carried:
+            writes.append(('merge', key, {**carried, **changes, 'updated_at': SERVER_TIMESTAMP}))
+    writes.extend(('delete', doc_id, None) for doc_id, _ in legacy)
+    return categories, changes, writes
+
+
+class Reconciler:
+    """병합 조인 결과를 종류별로 세고 고치는 쓰기를 백엔드에 보냄"""
+
+    def __init__(self, backend, delete_orphans=False, collection=COLLECTION, legacy_docs=None):
+        self.backend = backend
+        self.legacy_docs = {} if legacy_docs is None else legacy_docs
+        self.delete_orphans = delete_orphans
+        self.collection = collection
+        self.counts = dict.fromkeys(CATEGORIES, 0)
+        self.field_counts = {}
+        self.stats = {'source': 0, 'firestore': 0, 'in_sync': 0}
+
+    def apply(self, key, expected, docs):
+        """한 명 처리 후 (종류 목록, 바뀐 필드, 쓰기 목록) 반환"""
+        self.stats['source'] += expected is not None
+        self.stats['firestore'] += len(docs)
+        categories, changes, writes = classify(key, expected, docs, self.legacy_docs)
+        if not categories:
+            self.stats['in_sync'] += 1
+        for category in categories:
+            self.counts[category] += 1
+        for field in changes:
+            self.field_counts[field] = self.field_counts.get(field, 0) + 1
+        if 'orphan' in categories and not self.delete_orphans:
+            writes = []
+        # 하이픈 ID 문서 이동은 한 묶음 (재생할 때 create 가 실패하면 delete 도 안 함)
+        with self.backend.unit(key):
+            for op, doc_id, data in writes:
+                if op == 'create':
+                    self.backend.create(self.collection, doc_id, data)
+                elif op == 'merge':
+                    self.backend.set(self.collection, doc_id, data, merge=True)
+                else:
+                    self.backend.delete(self.collection, doc_id)
+        for doc_id, _ in docs:
+            self.legacy_docs.pop(doc_id, None)
+        return categories, changes, writes
+
+    def run(self, source, firestore):
+        with METRICS.timer('reconcile'):
+            for key, expected, docs in join_by_key(source, firestore):
+                yield (key, expected, docs) + self.apply(key, expected, docs)
+        self.backend.flush()
+
+
+def _reader_db(backend):
+    db = getattr(backend, 'db', None)
+    if db is None:
+        db = backend.reader.db
+    return db
+
+
+def run_reconcile(args):
+    from gnhs_tools.backends import open_backend
+    from gnhs_tools.sources import open_source
+
+    print("=" * 70)
+    print(f"🧮 연락처 파일 ↔ Firestore 대조: {args.csv}")
+    print("=" * 70)
+
+    from gnhs_tools.backup import ReadTime
+
+    backend = open_backend(dry_run=not args.apply, read_firestore=True, record=args.record)
+    # 로컬 시계가 아니라 서버 시각 (시계가 어긋나도 read_time 이 거절되지 않도록)
+    read_time = ReadTime(_reader_db(backend))
+    if read_time.value is not None:
+        print(f"📸 Firestore 읽기 시각: {read_time.value.isoformat(timespec='seconds')} (파티션 {args.workers}개)")
+
+    source = sorted_records(iter_alumni(open_source(args.csv, args.format, args.mapping)), args.run_rows)
+    legacy_docs = {}
+    firestore = keyed_firestore(
+        parallel_scan(_reader_db(backend), workers=args.workers, read_time=read_time), args.run_rows, legacy_docs)
+    reconciler = Reconciler(backend, args.delete_orphans, legacy_docs=legacy_docs)
+    shown = 0
+    out = open(args.output, 'w', encoding='utf-8') if args.output else None
+    try:
+        with backend:
+            for key, expected, docs, categories, changes, writes in reconciler.run(source, firestore):
+                if not categories:
+                    continue
+                if out is not None:
+                    current = next((data for doc_id, data in docs if doc_id == key), {})
+                    entry = {'key': key, 'categories': categories, 'ids': [doc_id for doc_id, _ in docs],
+                             'fields': {k: [current.get(k), v] for k, v in changes.items()},
+                             'writes': [[op, doc_id] for op, doc_id, _ in writes]}
+                    out.write(json.dumps(entry, ensure_ascii=False, default=str))
+                    out.write('\n')
+                if shown < args.show:
+                    shown += 1
+                    name = (expected or (docs[0][1] if docs else {})).get('name', '')
+                    ids = ', '.join(doc_id for doc_id, _ in docs) or '-'
+                    print(f"  {key} {name} [{ids}]: {', '.join(CATEGORY_LABELS[c] for c in categories)}")
+    finally:
+        if out is not None:
+            out.close()
+
+    stats = reconciler.stats
+    print(f"\n📋 연락처 {stats['source']}명 / Firestore 문서 {stats['firestore']}개 / 일치 {stats['in_sync']}명")
+    for category in CATEGORIES:
+        if reconciler.counts[category]:
+            print(f"  {CATEGORY_LABELS[category]}: {reconciler.counts[category]}명")
+    for field, count in sorted(reconciler.field_counts.items(), key=lambda kv: -kv[1]):
+        print(f"    {field}: {count}명")
+    if reconciler.counts['orphan'] and not args.delete_orphans:
+        print("ℹ️  연락처 파일에 없는 문서는 쓰기 작업에 포함하지 않았습니다 (--delete-orphans 로 포함).")
+    print(f"🧾 쓰기 작업: {backend.stats}" + ("" if args.apply or args.record else " (기록 안 함)"))
+    print("=" * 70)
+    return 0
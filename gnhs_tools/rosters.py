@@ -0,0 +1,141 @@
+"""
+회차/그룹별 명단 문서
+
+동문 문서의 회차(class_number)와 그룹(groups, 연락처 Labels 를 정규화한 값)으로
+rosters 컬렉션에 명단 문서를 미리 만들어 둡니다. 회차/그룹 화면은 동문
+문서를 모두 쿼리해서 내려받는 대신 명단 문서 하나만 읽으면 됩니다.
+
+- rosters/class-{회차}: 회차별 명단
+- rosters/group-{그룹}: 회차가 아닌 라벨('그룹1', '해외거주' 등)별 명단
+  (회차 라벨 '21회' 는 class-21 과 같으므로 따로 만들지 않음)
+
+명단은 키 이름이 반복되지 않도록 문서 ID 순으로 정렬한 병렬 배열(ids, names,
+그룹 명단은 classes 도)로 저장합니다. 다시 만들 때는 기존 명단과 내용이
+다른 문서만 쓰고, 사라진 회차/그룹의 문서는 삭제합니다.
+
+groups 필드는 임포트 때 채워지므로, 이 필드가 생기기 전에 임포트한 문서는
+`import --diff` 로 한 번 채운 뒤 실행하거나 --input 으로 연락처 파일 기준 명단을 만드세요.
+
+    python -m gnhs_tools rosters --dry-run
+    python -m gnhs_tools rosters --input contacts.csv
+"""
+from gnhs_tools.aggregates import class_of
+from gnhs_tools.contacts import COLLECTION, SERVER_TIMESTAMP, class_label
+from gnhs_tools.cost import document_size
+from gnhs_tools.errors import ToolError
+from gnhs_tools.metrics import METRICS
+from gnhs_tools.sync import without_timestamp
+
+ROSTER_COLLECTION = 'rosters'
+# 명단을 만들 때 alumni 에서 읽는 필드
+SOURCE_FIELDS = ('name', 'class_number', 'graduation_year', 'groups')
+# Firestore 문서 크기 한도 (1 MiB) 에 여유를 둔 값
+MAX_DOCUMENT_BYTES = 1_000_000
+
+
+def roster_id(kind, key):
+    # Firestore 문서 ID 에는 '/' 를 쓸 수 없음
+    return f"{kind}-{key}".replace('/', '_')
+
+
+class RosterBuilder:
+    """동문 레코드를 모아 회차/그룹별 명단 문서를 계산"""
+
+    def __init__(self):
+        self.classes = {}
+        self.groups = {}
+        self.alumni = 0
+
+    def add(self, doc_id, data):
+        self.alumni += 1
+        name = data.get('name', '')
+        class_number = class_of(data)
+        if class_number:
+            self.classes.setdefault(class_number, []).append((doc_id, name))
+        for group in data.get('groups') or ():
+            if not class_label(group):
+                self.groups.setdefault(group, []).append((doc_id, name, class_number))
+
+    def documents(self):
+        """{명단 문서 ID: 내용}"""
+        documents = {}
+        for class_number, members in self.classes.items():
+            members.sort()
+            documents[roster_id('class', class_number)] = {
+                'kind': 'class',
+                'name': f"{class_number}회",
+                'class_number': class_number,
+                'count': len(members),
+                'ids': [m[0] for m in members],
+                'names': [m[1] for m in members],
+                'updated_at': SERVER_TIMESTAMP,
+            }
+        for group, members in self.groups.items():
+            members.sort()
+            documents[roster_id('group', group)] = {
+                'kind': 'group',
+                'name': group,
+                'count': len(members),
+                'ids': [m[0] for m in members],
+                'names': [m[1] for m in members],
+                'classes': [m[2] for m in members],
+                'updated_at': SERVER_TIMESTAMP,
+            }
+        for doc_id, document in documents.items():
+            if document_size(ROSTER_COLLECTION, doc_id, document) > MAX_DOCUMENT_BYTES:
+                raise ToolError(f"명단 문서가 Firestore 문서 크기 한도를 넘습니다: "
+                                f"{ROSTER_COLLECTION}/{doc_id} ({document['count']}명)")
+        return documents
+
+
+def rebuild_rosters(backend, records):
+    """rosters 컬렉션을 레코드 기준으로 맞춤 (통계 딕셔너리 반환)"""
+    builder = RosterBuilder()
+    with METRICS.timer('build_rosters'):
+        for doc_id, data in records:
+            builder.add(doc_id, data)
+        documents = builder.documents()
+
+    stats = {'alumni': builder.alumni, 'classes': len(builder.classes), 'groups': len(builder.groups),
+             'written': 0, 'unchanged': 0, 'stale_deleted': 0}
+    existing = dict(backend.stream(ROSTER_COLLECTION))
+    for doc_id in existing:
+        if doc_id not in documents:
+            backend.delete(ROSTER_COLLECTION, doc_id)
+            stats['stale_deleted'] += 1
+    for doc_id, document in sorted(documents.items()):
+        current = existing.get(doc_id)
+        if current is not None and without_timestamp(current) == without_timestamp(document):
+            stats['unchanged'] += 1
+            continue
+        backend.set(ROSTER_COLLECTION, doc_id, document)
+        stats['written'] += 1
+    backend.flush()
+    stats['largest'] = sorted(((d['count'], d['name']) for d in documents.values()), reverse=True)[:5]
+    return stats
+
+
+def run_rosters(args):
+    from gnhs_tools.backends import open_backend
+
+    print("=" * 70)
+    print("📇 회차/그룹별 명단 문서" + (" (dry-run)" if args.dry_run else ""))
+    print("=" * 70)
+
+    from_csv = args.input is not None
+    backend = open_backend(args.dry_run, read_firestore=not from_csv, record=args.record)
+    with backend:
+        if from_csv:
+            from gnhs_tools.contacts import iter_alumni
+            from gnhs_tools.sources import open_source
+            records = iter_alumni(open_source(args.input, args.format, args.mapping))
+        else:
+            records = backend.stream(COLLECTION, fields=SOURCE_FIELDS)
+        stats = rebuild_rosters(backend, records)
+
+    print(f"\n📋 동문 {stats['alumni']}명 → 회차 명단 {stats['classes']}개 / 그룹 명단 {stats['groups']}개")
+    print("👥 큰 명단: " + ', '.join(f"{name} {count}명" for count, name in stats['largest']))
+    print(f"✏️  기록 {stats['written']}개 / 그대로 {stats['unchanged']}개 / "
+          f"사라진 명단 삭제 {stats['stale_deleted']}개")
+    print("=" * 70)
+    return 0
@@ -0,0 +1,352 @@
+"""
+동문 검색 서버 (메모리 역색인)
+
+앱처럼 컬렉션 전체를 내려받아 부분 문자열을 훑는 대신, 동문 목록을
+메모리 역색인으로 만들어 두고 순위가 매겨진 결과를 페이지 단위로 돌려줍니다.
+
+색인 대상:
+- 이름 (음절 + 초성, 'ㄱㅊㅅ' 로 김철수 검색)
+- 직장, 직책, 지역(시/도, 시/군/구, 동)
+- 전화번호 뒷자리 (식별 번호를 뺀 8자리)
+
+각 필드는 글자 2-gram 포스팅으로 후보를 좁힌 뒤 실제 부분 문자열인지
+확인합니다. 데이터는 Firestore(에뮬레이터 포함), export JSONL 스냅샷, 연락처
+파일 중 하나에서 읽고, Firestore 를 쓰면 on_snapshot 으로 변경분을 반영합니다.
+
+    python -m gnhs_tools serve-search --snapshot alumni.jsonl --port 8765
+    curl 'http://127.0.0.1:8765/search?q=강릉+ㄱㅊ&page=1&size=20'
+"""
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from gnhs_tools.contacts import COLLECTION
+from gnhs_tools.cost import COSTS
+
+_CHOSEONG = 'ㄱㄲㄴㄷㄸㄹㅁㅂㅃㅅㅆㅇㅈㅉㅊㅋㅌㅍㅎ'
+_CHOSEONG_SET = frozenset(_CHOSEONG)
+
+# 필드별 가중치 (검색어가 여러 필드에 맞으면 가장 높은 값 사용)
+FIELD_WEIGHTS = {
+    'name': 10.0,
+    'choseong': 6.0,
+    'phone': 8.0,
+    'company': 4.0,
+    'region': 3.0,
+    'title': 2.0,
+}
+
+# 검색 결과에 포함하는 필드
+RESULT_FIELDS = ('name', 'class_number', 'company', 'job_title',
+                 'address_sido', 'address_sigungu', 'address_dong')
+
+MAX_PAGE_SIZE = 100
+# 검색어/검색 결과 캐시 항목 수 (넘으면 비움)
+CACHE_ENTRIES = 512
+
+
+def choseong(text):
+    """한글 음절을 초성으로 변환 (한글이 아닌 글자는 그대로)"""
+    out = []
+    for ch in text:
+        code = ord(ch) - 0xAC00
+        out.append(_CHOSEONG[code // 588] if 0 <= code < 11172 else ch)
+    return ''.join(out)
+
+
+def _grams(text):
+    """검색어의 포스팅 키: 1글자면 그 글자, 그 외에는 2-gram 집합"""
+    if len(text) < 2:
+        return {text} if text else set()
+    return {text[i:i + 2] for i in range(len(text) - 1)}
+
+
+def _index_grams(text):
+    """색인할 포스팅 키: 1글자 + 2-gram (1글자 검색어도 찾을 수 있게)"""
+    return set(text) | _grams(text)
+
+
+def _field_values(data):
+    """문서 데이터 → {필드: 색인용 문자열}"""
+    name = (data.get('name') or '').replace(' ', '')
+    # 식별 번호(010 등)를 뺀 뒷자리 8자리만 색인 ('010' 검색이 전원에 맞지 않도록)
+    phone = ''.join(ch for ch in (data.get('phone') or '') if ch.isdigit())[-8:]
+    region = ' '.join(filter(None, (data.get('address_sido'), data.get('address_sigungu'),
+                                    data.get('address_dong'))))
+    return {
+        'name': name.lower(),
+        'choseong': choseong(name),
+        'phone': phone,
+        'company': (data.get('company') or '').lower(),
+        'region': region,
+        'title': (data.get('job_title') or '').lower(),
+    }
+
+
+class SearchIndex:
+    """문서 ID → 필드 값 + 필드별 n-gram 포스팅
+
+    검색은 잠금 없이 읽습니다. 갱신은 쓰기 잠금 하나로 직렬화하되 포스팅
+    집합을 제자리에서 고치지 않고 새 frozenset 으로 바꿔 끼우므로
+    (copy-on-write), 검색 중인 스레드는 항상 완전한 집합을 봅니다.
+    검색어별 점수와 검색 결과 순위는 캐시하고, 갱신할 때마다 캐시를 새로
+    만듭니다 (반복되는 짧은 검색어 '김' 은 두 번째부터 정렬된 목록을 자르기만 함).
+    """
+
+    def __init__(self):
+        self._write_lock = threading.Lock()
+        self.docs = {}           # 문서 ID → (필드 값 딕셔너리, 결과 딕셔너리)
+        self.postings = {field: {} for field in FIELD_WEIGHTS}
+        self.version = 0
+        self._cache = {}
+
+    def __len__(self):
+        return len(self.docs)
+
+    def apply(self, upserts=(), deletes=()):
+        """(문서 ID, 데이터) 추가/갱신과 문서 ID 삭제를 한 번에 반영
+
+        건드린 포스팅마다 새 집합을 한 번만 만들므로, 전체 적재나 on_snapshot
+        변경 묶음은 한 번에 넘기세요.
+        """
+        entries = {}
+        for doc_id, data in upserts:
+            result = {key: data.get(key) for key in RESULT_FIELDS}
+            result['id'] = doc_id
+            entries[doc_id] = (_field_values(data), result)
+        with self._write_lock:
+            removed = {field: {} for field in FIELD_WEIGHTS}
+            added = {field: {} for field in FIELD_WEIGHTS}
+            for doc_id in list(deletes) + list(entries):
+                entry = self.docs.get(doc_id)
+                if entry is not None:
+                    for field, value in entry[0].items():
+                        for gram in _index_grams(value):
+                            removed[field].setdefault(gram, set()).add(doc_id)
+            for doc_id, (values, _) in entries.items():
+                for field, value in values.items():
+                    for gram in _index_grams(value):
+                        added[field].setdefault(gram, set()).add(doc_id)
+
+            for doc_id in deletes:
+                self.docs.pop(doc_id, None)
+            self.docs.update(entries)
+            for field, postings in self.postings.items():
+                for gram in set(removed[field]) | set(added[field]):
+                    ids = postings.get(gram, frozenset()).difference(removed[field].get(gram, ()))
+                    ids |= added[field].get(gram, frozenset())
+                    if ids:
+                        postings[gram] = frozenset(ids)
+                    else:
+                        postings.pop(gram, None)
+            self.version += 1
+            # 진행 중인 검색은 예전 캐시에 기록하므로 새 캐시에 섞이지 않음
+            self._cache = {}
+
+    def upsert(self, doc_id, data):
+        self.apply(upserts=[(doc_id, data)])
+
+    def delete(self, doc_id):
+        self.apply(deletes=[doc_id])
+
+    def _field_matches(self, field, term):
+        """field 에 term 이 부분 문자열로 들어 있는 문서 ID 집합"""
+        postings = self.postings[field]
+        grams = sorted(_grams(term), key=lambda g: len(postings.get(g, ())))
+        if not grams:
+            return frozenset()
+        candidates = postings.get(grams[0])
+        if not candidates:
+            return frozenset()
+        # 2글자 이하 검색어는 포스팅 자체가 정확한 결과 (복사하지 않음)
+        if len(grams) == 1 and len(term) <= 2:
+            return candidates
+        candidates = candidates.intersection(*(postings.get(gram, ()) for gram in grams[1:]))
+        if len(term) <= 2:
+            return candidates
+        docs = self.docs
+        return {
+            doc_id for doc_id in candidates
+            if doc_id in docs and term in docs[doc_id][0][field]
+        }
+
+    def _term_fields(self, term):
+        if all(ch in _CHOSEONG_SET for ch in term):
+            return ('choseong',)
+        if term.isdigit():
+            return ('phone',)
+        return ('name', 'company', 'region', 'title')
+
+    def _term_scores(self, term, cache):
+        """{문서 ID: 점수} (검색어가 여러 필드에 맞으면 가장 높은 값, 캐시)"""
+        key = ('term', term)
+        scores = cache.get(key)
+        if scores is not None:
+            return scores
+        scores = {}
+        docs = self.docs
+        for field in self._term_fields(term):
+            weight = FIELD_WEIGHTS[field]
+            # 전체 일치, 앞부분 일치에 가산점
+            exact, prefix = weight * 1.5, weight * 1.2
+            for doc_id in self._field_matches(field, term):
+                entry = docs.get(doc_id)
+                if entry is None:
+                    continue
+                value = entry[0][field]
+                score = exact if value == term else prefix if value.startswith(term) else weight
+                if field == 'phone' and value.endswith(term):
+                    score *= 1.25
+                if score > scores.get(doc_id, 0.0):
+                    scores[doc_id] = score
+        cache[key] = scores
+        return scores
+
+    def _rank(self, terms, cache):
+        """모든 검색어에 맞는 (문서 ID, 점수) 를 점수순으로 (점수 합, 같으면 이름, ID 순)"""
+        per_term = sorted((self._term_scores(term, cache) for term in terms), key=len)
+        # 후보가 가장 적은 검색어를 기준으로 나머지에서 찾아봄
+        scores = per_term[0]
+        if len(per_term) > 1:
+            rest = per_term[1:]
+            scores = {}
+            for doc_id, score in per_term[0].items():
+                for other in rest:
+                    extra = other.get(doc_id)
+                    if extra is None:
+                        break
+                    score += extra
+                else:
+                    scores[doc_id] = score
+        docs = self.docs
+        ranked = [(doc_id, score) for doc_id, score in scores.items() if doc_id in docs]
+        ranked.sort(key=lambda item: (-item[1], docs[item[0]][1].get('name') or '', item[0]))
+        return ranked
+
+    def search(self, query, page=1, size=20):
+        """검색어(공백 구분, 모두 만족)에 맞는 문서를 점수순으로 반환"""
+        size = max(1, min(size, MAX_PAGE_SIZE))
+        page = max(1, page)
+        terms = sorted(t for t in query.lower().split() if t)
+        if not terms:
+            return {'query': query, 'total': 0, 'page': page, 'size': size, 'results': []}
+
+        cache = self._cache
+        key = ('query',) + tuple(terms)
+        ranked = cache.get(key)
+        if ranked is None:
+            if len(cache) >= CACHE_ENTRIES:
+                cache.clear()
+            ranked = cache[key] = self._rank(terms, cache)
+        docs = self.docs
+        start = (page - 1) * size
+        results = []
+        for doc_id, score in ranked[start:start + size]:
+            entry = docs.get(doc_id)
+            if entry is not None:
+                results.append(dict(entry[1], score=round(score, 3)))
+        return {'query': query, 'total': len(ranked), 'page': page, 'size': size, 'results': results}
+
+
+def load_index(records):
+    index = SearchIndex()
+    index.apply(upserts=records)
+    return index
+
+
+def snapshot_records(path):
+    """export 명령의 JSONL 스냅샷에서 (문서 ID, 데이터)"""
+    from gnhs_tools.sync import load_mirror
+    return load_mirror(path).items()
+
+
+def watch_firestore(index, db, collection=COLLECTION):
+    """on_snapshot 으로 컬렉션 변경분을 색인에 반영 (구독 객체 반환)"""
+
+    def on_snapshot(_docs, changes, _read_time):
+        upserts, deletes = [], []
+        for change in changes:
+            doc = change.document
+            COSTS.read(collection, doc.id)
+            if change.type.name == 'REMOVED':
+                deletes.append(doc.id)
+            else:
+                upserts.append((doc.id, doc.to_dict() or {}))
+        # 첫 스냅샷(전체 문서)도 한 번에 반영
+        index.apply(upserts, deletes)
+
+    return db.collection(collection).on_snapshot(on_snapshot)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    index = None
+
+    def _send(self, status, body):
+        payload = json.dumps(body, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = parse_qs(url.query)
+        if url.path == '/health':
+            self._send(200, {'status': 'ok', 'documents': len(self.index), 'version': self.index.version})
+            return
+        if url.path != '/search':
+            self._send(404, {'error': 'not found'})
+            return
+        try:
+            page = int(params.get('page', ['1'])[0])
+            size = int(params.get('size', ['20'])[0])
+        except ValueError:
+            self._send(400, {'error': 'page/size 는 정수여야 합니다'})
+            return
+        start = time.perf_counter()
+        result = self.index.search(params.get('q', [''])[0], page, size)
+        result['took_ms'] = round((time.perf_counter() - start) * 1000, 3)
+        self._send(200, result)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def make_server(index, host='127.0.0.1', port=8765):
+    handler = type('SearchHandler', (_Handler,), {'index': index})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def run_serve(args):
+    watch = None
+    start = time.perf_counter()
+    if args.snapshot:
+        index = load_index(snapshot_records(args.snapshot))
+        origin = args.snapshot
+    elif args.input:
+        from gnhs_tools.contacts import iter_alumni
+        index = load_index(iter_alumni(args.input))
+        origin = args.input
+    else:
+        from gnhs_tools.firebase import get_db
+        db = get_db()
+        index = SearchIndex()
+        # 첫 스냅샷이 전체 문서를 ADDED 로 전달하므로 별도 전체 읽기가 필요 없음
+        watch = watch_firestore(index, db)
+        origin = 'firestore (on_snapshot)'
+
+    print(f"🔎 검색 색인: {len(index)}명 ({origin}, {(time.perf_counter() - start) * 1000:.0f}ms)")
+    server = make_server(index, args.host, args.port)
+    print(f"🚀 http://{args.host}:{server.server_address[1]}/search?q=... 대기 중 (Ctrl+C 로 종료)")
+    try:
+        server.serve_forever()
+    finally:
+        server.server_close()
+        if watch is not None:
+            watch.unsubscribe()
+    return 0
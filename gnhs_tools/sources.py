@@ -0,0 +1,307 @@
+"""
+연락처 입력 형식 어댑터
+
+모든 어댑터는 레코드를 하나씩 읽어 표준 키(CANONICAL_FIELDS) 딕셔너리로
+반환합니다. 파일 전체를 메모리에 올리지 않으므로 큰 명단도 처리할 수 있고,
+이후 정규화/쓰기 파이프라인은 입력 형식과 무관하게 동작합니다.
+
+- google-csv: Google 주소록 내보내기 CSV (기본값)
+- csv: 임의의 CSV + 컬럼 매핑
+- vcard: .vcf (vCard 3.0/4.0)
+- excel: .xlsx (openpyxl 필요)
+- jsonl: 한 줄에 JSON 객체 하나
+
+컬럼 매핑은 {표준 키: 원본 컬럼 이름} 형식의 JSON 파일로 지정합니다.
+    {"first_name": "성명", "phone": "휴대폰", "labels": "기수"}
+"""
+import csv
+import json
+import os
+
+from gnhs_tools.errors import ToolError
+
+# 표준 키
+CANONICAL_FIELDS = (
+    'first_name', 'last_name', 'name_suffix', 'nickname', 'labels',
+    'phone', 'phone2', 'email', 'email2',
+    'organization', 'title', 'department',
+    'address', 'address_region', 'address_city', 'address2',
+    'birthday', 'notes', 'photo',
+)
+
+# Google 주소록 CSV 컬럼 매핑
+GOOGLE_CSV_MAPPING = {
+    'first_name': 'First Name',
+    'last_name': 'Last Name',
+    'name_suffix': 'Name Suffix',
+    'nickname': 'Nickname',
+    'labels': 'Labels',
+    'phone': 'Phone 1 - Value',
+    'phone2': 'Phone 2 - Value',
+    'email': 'E-mail 1 - Value',
+    'email2': 'E-mail 2 - Value',
+    'organization': 'Organization Name',
+    'title': 'Organization Title',
+    'department': 'Organization Department',
+    'address': 'Address 1 - Formatted',
+    'address_region': 'Address 1 - Region',
+    'address_city': 'Address 1 - City',
+    'address2': 'Address 2 - Formatted',
+    'birthday': 'Birthday',
+    'notes': 'Notes',
+    'photo': 'Photo',
+}
+
+IDENTITY_MAPPING = {key: key for key in CANONICAL_FIELDS}
+
+EXTENSIONS = {
+    '.csv': 'google-csv',
+    '.vcf': 'vcard',
+    '.vcard': 'vcard',
+    '.xlsx': 'excel',
+    '.xlsm': 'excel',
+    '.jsonl': 'jsonl',
+    '.ndjson': 'jsonl',
+}
+
+
+class SourceError(ToolError, ValueError):
+    """입력 파일 형식을 처리할 수 없을 때 발생"""
+
+
+def _apply_mapping(raw, mapping):
+    record = {}
+    for key, column in mapping.items():
+        value = raw.get(column)
+        record[key] = '' if value is None else str(value).strip()
+    return record
+
+
+class Source:
+    """입력 어댑터 공통 인터페이스 (이터레이션하면 표준 키 레코드 반환)"""
+
+    format = None
+    default_mapping = IDENTITY_MAPPING
+
+    def __init__(self, path, mapping=None):
+        self.path = path
+        self.mapping = {**self.default_mapping, **(mapping or {})}
+
+    def raw_records(self):
+        raise NotImplementedError
+
+    def __iter__(self):
+        mapping = self.mapping
+        for raw in self.raw_records():
+            yield _apply_mapping(raw, mapping)
+
+
+class CsvSource(Source):
+    format = 'csv'
+
+    def raw_records(self):
+        with open(self.path, 'r', encoding='utf-8-sig', newline='') as f:
+            yield from csv.DictReader(f)
+
+
+class GoogleCsvSource(CsvSource):
+    format = 'google-csv'
+    default_mapping = GOOGLE_CSV_MAPPING
+
+
+class JsonlSource(Source):
+    format = 'jsonl'
+
+    def raw_records(self):
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line_no, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except ValueError as e:
+                    raise SourceError(f"{self.path}:{line_no}: JSON 형식 오류 ({e})") from e
+
+
+class ExcelSource(Source):
+    """첫 행을 헤더로 사용 (read-only 모드로 한 행씩 읽음)"""
+
+    format = 'excel'
+
+    def raw_records(self):
+        try:
+            from openpyxl import load_workbook
+        except ImportError as e:
+            raise SourceError("Excel 파일을 읽으려면 openpyxl 이 필요합니다: pip install openpyxl") from e
+
+        workbook = load_workbook(self.path, read_only=True, data_only=True)
+        try:
+            rows = workbook.active.iter_rows(values_only=True)
+            header = next(rows, None)
+            if header is None:
+                return
+            header = ['' if h is None else str(h).strip() for h in header]
+            for values in rows:
+                if values is None or all(v is None for v in values):
+                    continue
+                yield dict(zip(header, values))
+        finally:
+            workbook.close()
+
+
+def _unescape_vcard(value):
+    return (value.replace('\\n', '\n').replace('\\N', '\n')
+            .replace('\\,', ',').replace('\\;', ';').replace('\\\\', '\\'))
+
+
+def _split_vcard(value, sep=';'):
+    parts, current, escaped = [], [], False
+    for ch in value:
+        if escaped:
+            current.append('\\' + ch)
+            escaped = False
+        elif ch == '\\':
+            escaped = True
+        elif ch == sep:
+            parts.append(_unescape_vcard(''.join(current)))
+            current = []
+        else:
+            current.append(ch)
+    parts.append(_unescape_vcard(''.join(current)))
+    return parts
+
+
+class VcardSource(Source):
+    """vCard 스트리밍 파서
+
+    TEL/EMAIL/ADR 은 등장 순서대로 1, 2번째 값을 사용하고
+    CATEGORIES 는 Google CSV 의 Labels 처럼 ' ::: ' 로 이어 붙입니다.
+    """
+
+    format = 'vcard'
+
+    def _lines(self, f):
+        """접힌 줄(공백/탭으로 시작)을 이어 붙인 논리 줄"""
+        pending = None
+        for line in f:
+            line = line.rstrip('\r\n')
+            if line[:1] in (' ', '\t') and pending is not None:
+                pending += line[1:]
+                continue
+            if pending is not None:
+                yield pending
+            pending = line
+        if pending is not None:
+            yield pending
+
+    def raw_records(self):
+        with open(self.path, 'r', encoding='utf-8-sig') as f:
+            card = None
+            for line in self._lines(f):
+                if ':' not in line:
+                    continue
+                head, value = line.split(':', 1)
+                prop = head.split(';', 1)[0].split('.')[-1].upper()
+                if prop == 'BEGIN' and value.upper() == 'VCARD':
+                    card = {'tel': [], 'email': [], 'adr': [], 'categories': []}
+                elif prop == 'END' and card is not None:
+                    yield self._to_record(card)
+                    card = None
+                elif card is not None:
+                    self._add_property(card, prop, value)
+
+    def _add_property(self, card, prop, value):
+        if prop == 'N':
+            parts = _split_vcard(value) + [''] * 5
+            card['family'], card['given'], card['suffix'] = parts[0], parts[1], parts[4]
+        elif prop == 'FN':
+            card['fn'] = _unescape_vcard(value)
+        elif prop == 'TEL':
+            card['tel'].append(value.replace('tel:', ''))
+        elif prop == 'EMAIL':
+            card['email'].append(value)
+        elif prop == 'ADR':
+            # PO Box;확장 주소;도로명;시/군/구;시/도;우편번호;국가
+            parts = (_split_vcard(value) + [''] * 7)[:7]
+            card['adr'].append(parts)
+        elif prop == 'ORG':
+            parts = _split_vcard(value)
+            card['org'] = parts[0]
+            card['dept'] = parts[1] if len(parts) > 1 else ''
+        elif prop in ('TITLE', 'BDAY', 'NOTE', 'NICKNAME', 'PHOTO'):
+            card[prop.lower()] = _unescape_vcard(value)
+        elif prop == 'CATEGORIES':
+            card['categories'].extend(_split_vcard(value, ','))
+
+    @staticmethod
+    def _to_record(card):
+        tel, email, adr = card['tel'], card['email'], card['adr']
+        # 한국식 이름은 성+이름, N 이 없으면 FN 사용
+        if card.get('family') or card.get('given'):
+            first_name = f"{card.get('family', '')}{card.get('given', '')}"
+        else:
+            first_name = card.get('fn', '')
+
+        def formatted(parts):
+            po_box, extended, street, city, region, postal, country = parts
+            return ' '.join(p for p in (region, city, street, extended) if p)
+
+        return {
+            'first_name': first_name,
+            'name_suffix': card.get('suffix', ''),
+            'nickname': card.get('nickname', ''),
+            'labels': ' ::: '.join(card['categories']),
+            'phone': tel[0] if tel else '',
+            'phone2': tel[1] if len(tel) > 1 else '',
+            'email': email[0] if email else '',
+            'email2': email[1] if len(email) > 1 else '',
+            'organization': card.get('org', ''),
+            'title': card.get('title', ''),
+            'department': card.get('dept', ''),
+            'address': formatted(adr[0]) if adr else '',
+            'address_region': adr[0][4] if adr else '',
+            'address_city': adr[0][3] if adr else '',
+            'address2': formatted(adr[1]) if len(adr) > 1 else '',
+            'birthday': card.get('bday', ''),
+            'notes': card.get('note', ''),
+            'photo': card.get('photo', ''),
+        }
+
+
+SOURCES = {
+    cls.format: cls
+    for cls in (GoogleCsvSource, CsvSource, JsonlSource, ExcelSource, VcardSource)
+}
+
+
+def detect_format(path):
+    ext = os.path.splitext(path)[1].lower()
+    try:
+        return EXTENSIONS[ext]
+    except KeyError:
+        raise SourceError(f"확장자로 형식을 알 수 없습니다: {path} (--format 으로 지정하세요)") from None
+
+
+def load_mapping(path):
+    """{표준 키: 원본 컬럼} JSON 매핑 파일 로드"""
+    with open(path, 'r', encoding='utf-8') as f:
+        mapping = json.load(f)
+    unknown = set(mapping) - set(CANONICAL_FIELDS)
+    if unknown:
+        raise SourceError(f"알 수 없는 표준 키: {', '.join(sorted(unknown))}")
+    return mapping
+
+
+def open_source(path, fmt=None, mapping=None):
+    """경로와 형식(생략 시 확장자로 판단)에 맞는 어댑터 생성
+
+    mapping 은 딕셔너리 또는 JSON 매핑 파일 경로입니다.
+    """
+    if isinstance(path, Source):
+        return path
+    fmt = fmt or detect_format(path)
+    if fmt not in SOURCES:
+        raise SourceError(f"지원하지 않는 형식: {fmt}")
+    if isinstance(mapping, str):
+        mapping = load_mapping(mapping)
+    return SOURCES[fmt](path, mapping)
@@ -0,0 +1,107 @@
+"""
+필드 단위 변경 감지
+
+들어온 레코드를 현재 저장 상태(로컬 미러 파일 또는 필드 제한 읽기)와
+비교해서 실제로 바뀐 필드만 update() 로 보냅니다. 새 문서만 set() 으로
+만들고, 기존 문서의 created_at 은 건드리지 않습니다.
+
+로컬 미러는 `export` 명령의 JSONL 형식(id + 필드)과 같습니다.
+"""
+import json
+import os
+
+from gnhs_tools.contacts import COLLECTION, SERVER_TIMESTAMP
+from gnhs_tools.cost import COSTS
+from gnhs_tools.metrics import METRICS
+
+TIMESTAMP_FIELDS = ('created_at', 'updated_at')
+
+# 새 문서를 만들 때만 기록하는 필드 (앱에서 바꾼 값을 CSV 기본값으로 덮지 않음)
+CREATE_ONLY_FIELDS = TIMESTAMP_FIELDS + ('profile_photo_url', 'is_verified')
+
+
+def without_create_only(data):
+    """이미 있는 문서에 쓸 때: CREATE_ONLY_FIELDS 를 빼고 updated_at 만 남김"""
+    return {key: value for key, value in data.items() if key not in CREATE_ONLY_FIELDS or key == 'updated_at'}
+
+
+def without_timestamp(document):
+    """updated_at 을 뺀 문서 (다시 계산한 문서가 기존 문서와 같은지 비교할 때)"""
+    return {key: value for key, value in document.items() if key != 'updated_at'}
+
+
+def changed_fields(incoming, current, ignore=CREATE_ONLY_FIELDS):
+    """incoming 중 current 와 값이 다른 필드만 반환"""
+    return {
+        key: value for key, value in incoming.items()
+        if key not in ignore and current.get(key) != value
+    }
+
+
+def load_mirror(path):
+    """JSONL 미러 파일을 {문서 ID: 데이터}로 로드 (파일이 없으면 빈 딕셔너리)"""
+    state = {}
+    if not os.path.exists(path):
+        return state
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            state[record.pop('id')] = record
+    return state
+
+
+def save_mirror(path, state):
+    """{문서 ID: 데이터}를 JSONL 미러 파일로 저장 (타임스탬프 필드 제외)"""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        for doc_id in sorted(state):
+            data = {k: v for k, v in state[doc_id].items() if k not in TIMESTAMP_FIELDS}
+            f.write(json.dumps({'id': doc_id, **data}, ensure_ascii=False, default=str))
+            f.write('\n')
+    os.replace(tmp_path, path)
+
+
+def read_state(backend, fields, collection=COLLECTION):
+    """필드 제한 읽기로 현재 상태 로드"""
+    with COSTS.stage('read_state'):
+        return {doc_id: data for doc_id, data in backend.stream(collection, fields=fields)}
+
+
+def sync_record(backend, doc_id, data, current, collection=COLLECTION):
+    """레코드 하나를 현재 상태와 비교해서 필요한 쓰기만 수행
+
+    반환값: 'created' / 'updated' / 'unchanged'
+    current 딕셔너리(전체 상태)는 쓰기 결과에 맞게 갱신됩니다.
+    """
+    existing = current.get(doc_id)
+    if existing is None:
+        # 상태(미러)가 오래되어 문서가 이미 있어도 created_at 등은 덮지 않음
+        with METRICS.timer('write'):
+            backend.create(collection, doc_id, data)
+        current[doc_id] = {k: v for k, v in data.items() if k not in TIMESTAMP_FIELDS}
+        return 'created'
+
+    changes = changed_fields(data, existing)
+    if not changes:
+        return 'unchanged'
+
+    METRICS.count('fields_changed', len(changes))
+    with METRICS.timer('write'):
+        backend.update(collection, doc_id, {**changes, 'updated_at': SERVER_TIMESTAMP})
+    existing.update(changes)
+    return 'updated'
+
+
+def sync_records(backend, records, current, collection=COLLECTION, progress_every=1000):
+    """(문서 ID, 데이터) 스트림을 필드 단위로 반영 (결과별 건수 반환)"""
+    stats = {'created': 0, 'updated': 0, 'unchanged': 0}
+    for n, (doc_id, data) in enumerate(records, 1):
+        stats[sync_record(backend, doc_id, data, current, collection)] += 1
+        if progress_every and n % progress_every == 0:
+            print(f"📝 {n}명 비교 완료... (신규 {stats['created']} / 변경 {stats['updated']})")
+    backend.flush()
+    for key, value in stats.items():
+        METRICS.count(f'docs_{key}', value)
+    return stats
@@ -0,0 +1,371 @@
+"""
+열 단위 메모리 동문 표
+
+동문 문서를 행마다 딕셔너리로 들고 있는 대신 열별 NumPy 배열로 보관합니다.
+
+- 정수/불리언 필드: int16 / bool 배열
+- 반복되는 문자열(이름, 직장, 직책, 지역 ...): 사전 인코딩 (int32 코드 + 값 목록)
+- 문서 ID / 보조 전화번호: 숫자만 남겨서 앞에 1을 붙인 int64 ('010...' 의 앞자리 0 보존)
+
+주소 원문, 메모처럼 검색/집계에 쓰지 않는 긴 텍스트는 보관하지 않고
+has_email / has_address 같은 여부 열만 둡니다. 필터는 불리언 마스크를
+돌려주고, 회차별/직장별 집계는 np.bincount 로 계산합니다. 같은 사전을
+공유하는 두 표(Firestore 와 연락처 파일)는 코드 배열끼리 바로 비교할 수
+있습니다. NumPy 가 필요합니다 (pip install numpy).
+
+    python -m gnhs_tools query --input contacts.csv --group-by company_key
+    python -m gnhs_tools query --snapshot alumni.jsonl --class 25 --region 강릉
+    python -m gnhs_tools query --snapshot alumni.jsonl --join contacts.csv
+"""
+import sys
+import time
+from array import array
+
+from gnhs_tools.address import REGION_FIELDS
+from gnhs_tools.contacts import COLLECTION
+from gnhs_tools.errors import ToolError
+from gnhs_tools.metrics import METRICS
+
+STRING_COLUMNS = ('name', 'company', 'company_key', 'job_title', 'department', 'birth_date') + REGION_FIELDS
+BOOL_COLUMNS = ('has_email', 'has_address', 'has_photo', 'is_verified')
+INT_COLUMNS = ('class_number',)
+PACKED_COLUMNS = ('id', 'phone2')
+COLUMNS = PACKED_COLUMNS + INT_COLUMNS + STRING_COLUMNS + BOOL_COLUMNS
+
+# Firestore 에서 표를 만들 때 읽을 필드
+TABLE_FIELDS = ('phone2', 'class_number', 'graduation_year', 'email', 'address', 'profile_photo_url',
+                'is_verified') + STRING_COLUMNS
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError as e:
+        raise ToolError("열 단위 동문 표에는 numpy 가 필요합니다: pip install numpy") from e
+    return numpy
+
+
+def pack_digits(value):
+    """숫자 문자열 → int ('010...' 의 앞자리 0 을 지키려고 앞에 1을 붙임, 없거나 숫자가 아니면 0)"""
+    if value and value.isdigit() and len(value) <= 18:
+        return int('1' + value)
+    return 0
+
+
+def unpack_digits(packed):
+    return str(int(packed))[1:] if packed else ''
+
+
+class Dictionary:
+    """문자열 사전 인코딩 (코드 0 은 빈 문자열)"""
+
+    def __init__(self):
+        self.values = ['']
+        self.codes = {'': 0}
+
+    def __len__(self):
+        return len(self.values)
+
+    def encode(self, value):
+        value = value or ''
+        code = self.codes.get(value)
+        if code is None:
+            code = self.codes[value] = len(self.values)
+            self.values.append(value)
+        return code
+
+    def matching(self, predicate):
+        """predicate 를 만족하는 값들의 코드 목록 (표 크기가 아닌 사전 크기만큼 검사)"""
+        return [code for code, value in enumerate(self.values) if value and predicate(value)]
+
+
+class AlumniTable:
+    """열 단위 동문 표 (행 순서는 입력 순서)"""
+
+    def __init__(self, np, columns, dictionaries, odd_ids=None):
+        self.np = np
+        self.columns = columns
+        self.dictionaries = dictionaries
+        # 정수로 압축하지 못한 문서 ID {행 번호: 문서 ID}
+        self.odd_ids = odd_ids or {}
+        self._order = None
+
+    @classmethod
+    def from_records(cls, records, dictionaries=None):
+        """(문서 ID, 데이터) 스트림으로 표 생성
+
+        다른 표의 dictionaries 를 넘기면 사전을 공유해서 두 표의 문자열 코드를
+        그대로 비교할 수 있습니다.
+        """
+        from gnhs_tools.aggregates import class_of
+
+        np = _numpy()
+        if dictionaries is None:
+            dictionaries = {name: Dictionary() for name in STRING_COLUMNS}
+        # 행마다 NumPy 배열을 키우지 않도록 array 모듈로 모은 뒤 한 번에 변환
+        packed = {name: array('q') for name in PACKED_COLUMNS}
+        classes = array('h')
+        codes = {name: array('i') for name in STRING_COLUMNS}
+        flags = {name: array('b') for name in BOOL_COLUMNS}
+        odd_ids = {}
+
+        with METRICS.timer('build_table'):
+            for row, (doc_id, data) in enumerate(records):
+                packed_id = pack_digits(doc_id)
+                if not packed_id:
+                    odd_ids[row] = doc_id
+                packed['id'].append(packed_id)
+                packed['phone2'].append(pack_digits(data.get('phone2')))
+                classes.append(min(class_of(data), 32767))
+                for name in STRING_COLUMNS:
+                    codes[name].append(dictionaries[name].encode(data.get(name)))
+                flags['has_email'].append(bool(data.get('email')))
+                flags['has_address'].append(bool(data.get('address')))
+                flags['has_photo'].append(bool(data.get('profile_photo_url')))
+                flags['is_verified'].append(data.get('is_verified') is True)
+
+            columns = {name: np.array(values, dtype=np.int64) for name, values in packed.items()}
+            columns['class_number'] = np.array(classes, dtype=np.int16)
+            columns.update({name: np.array(values, dtype=np.int32) for name, values in codes.items()})
+            columns.update({name: np.array(values, dtype=np.int8).astype(bool) for name, values in flags.items()})
+        return cls(np, columns, dictionaries, odd_ids)
+
+    def __len__(self):
+        return len(self.columns['id'])
+
+    def nbytes(self):
+        """배열 + 사전 문자열의 대략적인 메모리 사용량"""
+        size = sum(column.nbytes for column in self.columns.values())
+        for dictionary in self.dictionaries.values():
+            size += sum(sys.getsizeof(value) for value in dictionary.values)
+        return size
+
+    # --- 필터 (불리언 마스크) ---
+
+    def all(self):
+        return self.np.ones(len(self), dtype=bool)
+
+    def eq(self, name, value):
+        if name in self.dictionaries:
+            code = self.dictionaries[name].codes.get(value or '')
+            if code is None:
+                return self.np.zeros(len(self), dtype=bool)
+            return self.columns[name] == code
+        return self.columns[name] == value
+
+    def isin(self, name, values):
+        if name in self.dictionaries:
+            codes = self.dictionaries[name].codes
+            values = [codes[v] for v in values if v in codes]
+        return self.np.isin(self.columns[name], values)
+
+    def contains(self, name, text):
+        """문자열 열에 text 가 들어 있는 행"""
+        return self.np.isin(self.columns[name], self.dictionaries[name].matching(lambda v: text in v))
+
+    def between(self, name, low, high):
+        column = self.columns[name]
+        return (column >= low) & (column <= high)
+
+    # --- 선택 / 집계 ---
+
+    def take(self, selector):
+        """마스크 또는 행 번호 배열로 고른 행만 담은 새 표 (사전은 공유)"""
+        rows = self.np.flatnonzero(selector) if selector.dtype == bool else selector
+        odd = {}
+        if self.odd_ids:
+            position = {row: i for i, row in enumerate(rows.tolist())}
+            odd = {position[row]: doc_id for row, doc_id in self.odd_ids.items() if row in position}
+        columns = {name: column[rows] for name, column in self.columns.items()}
+        return AlumniTable(self.np, columns, self.dictionaries, odd)
+
+    def group_count(self, name, mask=None):
+        """열 값별 인원 [(값, 인원)] (많은 순, 빈 값 제외)"""
+        np = self.np
+        column = self.columns[name] if mask is None else self.columns[name][mask]
+        if name in self.dictionaries:
+            counts = np.bincount(column, minlength=len(self.dictionaries[name]))
+            values = self.dictionaries[name].values
+            pairs = [(values[code], int(counts[code])) for code in np.flatnonzero(counts) if code]
+        else:
+            keys, counts = np.unique(column, return_counts=True)
+            pairs = [(int(k) if k.dtype.kind in 'iu' else bool(k), int(c))
+                     for k, c in zip(keys, counts) if k]
+        pairs.sort(key=lambda kv: (-kv[1], kv[0]))
+        return pairs
+
+    def decode(self, name, rows):
+        column = self.columns[name][rows]
+        if name in self.dictionaries:
+            values = self.dictionaries[name].values
+            return [values[code] for code in column.tolist()]
+        if name in PACKED_COLUMNS:
+            return [unpack_digits(v) for v in column.tolist()]
+        return column.tolist()
+
+    def doc_ids(self, rows):
+        ids = self.decode('id', rows)
+        if self.odd_ids:
+            for i, row in enumerate(self.np.arange(len(self))[rows].tolist()):
+                if row in self.odd_ids:
+                    ids[i] = self.odd_ids[row]
+        return ids
+
+    def rows(self, selector=None, fields=None, limit=None):
+        """행 딕셔너리 목록 (출력용)"""
+        rows = self.np.arange(len(self)) if selector is None else (
+            self.np.flatnonzero(selector) if selector.dtype == bool else selector)
+        if limit is not None:
+            rows = rows[:limit]
+        fields = fields or COLUMNS[1:]
+        columns = {name: self.decode(name, rows) for name in fields}
+        return [{'id': doc_id, **{name: columns[name][i] for name in fields}}
+                for i, doc_id in enumerate(self.doc_ids(rows))]
+
+    # --- 조인 ---
+
+    def lookup(self, packed_ids):
+        """압축된 문서 ID 배열 → 행 번호 배열 (없으면 -1)
+
+        같은 ID 가 여러 행이면 임포트(마지막 행이 이김)와 같이 뒤 행을 씁니다.
+        """
+        np = self.np
+        result = np.full(len(packed_ids), -1, dtype=np.int64)
+        if not len(self):
+            return result
+        if self._order is None:
+            self._order = np.argsort(self.columns['id'], kind='stable')
+        sorted_ids = self.columns['id'][self._order]
+        # 안정 정렬이므로 같은 ID 의 마지막 위치가 가장 뒤 행
+        positions = np.maximum(np.searchsorted(sorted_ids, packed_ids, side='right') - 1, 0)
+        found = (sorted_ids[positions] == packed_ids) & (packed_ids != 0)
+        result[found] = self._order[positions[found]]
+        return result
+
+    def latest(self):
+        """ID 마다 마지막 행만 True 인 마스크 (앞 행은 임포트 때 덮어써지는 행)"""
+        np = self.np
+        mask = self.lookup(self.columns['id']) == np.arange(len(self))
+        # odd_ids 는 행 순서로 들어 있으므로 덮어쓰면 마지막 행이 남음
+        index = {doc_id: row for row, doc_id in self.odd_ids.items()}
+        mask[list(index.values())] = True
+        return mask
+
+    def join(self, other):
+        """문서 ID 가 같은 행 쌍 (self 행 번호 배열, other 행 번호 배열)
+
+        양쪽 모두 같은 ID 가 여러 행이면 마지막 행만 씁니다.
+        """
+        np = self.np
+        rows = self.lookup(other.columns['id'])
+        if other.odd_ids:
+            # 숫자가 아닌(또는 18자리를 넘는) 문서 ID 는 딕셔너리로 조인
+            index = {doc_id: row for row, doc_id in self.odd_ids.items()}
+            for row, doc_id in other.odd_ids.items():
+                rows[row] = index.get(doc_id, -1)
+        matched = np.flatnonzero((rows >= 0) & other.latest())
+        return rows[matched], matched
+
+
+def with_company_keys(records):
+    """company_key 가 없는 레코드에 companies 작업과 같은 규칙(정규화 + 비슷한 이름 묶기)으로 채움
+
+    연락처 파일과 import 미러에는 company_key 가 없으므로 --group-by company_key
+    같은 질의가 비지 않도록 표를 만들기 전에 계산합니다.
+    """
+    from gnhs_tools.companies import CompanyIndex
+
+    records = list(records)
+    index = CompanyIndex()
+    for doc_id, data in records:
+        index.add(doc_id, data)
+    changes, _ = index.build()
+    keys = dict(changes)
+    for doc_id, data in records:
+        if not data.get('company_key'):
+            data['company_key'] = keys.get(doc_id, '')
+    return records
+
+
+def load_table(args):
+    """--input / --snapshot / Firestore 중 하나로 표 생성"""
+    if getattr(args, 'input', None):
+        from gnhs_tools.contacts import iter_alumni
+        from gnhs_tools.sources import open_source
+        records = iter_alumni(open_source(args.input, args.format, args.mapping))
+        return AlumniTable.from_records(with_company_keys(records))
+    if getattr(args, 'snapshot', None):
+        from gnhs_tools.sync import load_mirror
+        return AlumniTable.from_records(with_company_keys(load_mirror(args.snapshot).items()))
+    from gnhs_tools.backends import FirestoreBackend
+    return AlumniTable.from_records(FirestoreBackend().stream(COLLECTION, fields=TABLE_FIELDS))
+
+
+def _print_join(table, path, fmt, mapping):
+    from gnhs_tools.contacts import iter_alumni
+    from gnhs_tools.sources import open_source
+
+    other = AlumniTable.from_records(iter_alumni(open_source(path, fmt, mapping)), table.dictionaries)
+    left, right = table.join(other)
+    only_table = table.latest()
+    only_table[left] = False
+    print(f"\n🔗 {path} 와 조인: 일치 {len(left)}명 / 파일에만 {int(other.latest().sum()) - len(right)}명"
+          f" / 표에만 {int(only_table.sum())}명")
+    # 사전을 공유하므로 코드끼리 비교
+    for name in ('class_number', 'name', 'company', 'job_title', 'address_sigungu'):
+        differs = table.columns[name][left] != other.columns[name][right]
+        if differs.any():
+            print(f"  {name} 다름: {int(differs.sum())}명")
+
+
+def parse_class_range(value):
+    """'25' / '20-25' → (낮은 회차, 높은 회차)"""
+    low, _, high = value.strip().partition('-')
+    try:
+        low, high = int(low), int(high or low)
+    except ValueError:
+        raise ToolError(f"--class 는 회차 숫자나 범위여야 합니다 (예: 25, 20-25): {value!r}") from None
+    if low > high:
+        low, high = high, low
+    return low, high
+
+
+def run_query(args):
+    start = time.perf_counter()
+    table = load_table(args)
+    load_ms = (time.perf_counter() - start) * 1000
+    print(f"📋 {len(table)}명 적재 ({load_ms:.0f}ms, 약 {table.nbytes() / 1024 / 1024:.1f}MB)")
+
+    start = time.perf_counter()
+    mask = table.all()
+    if args.class_range:
+        mask &= table.between('class_number', *parse_class_range(args.class_range))
+    if args.company:
+        mask &= table.contains('company', args.company) | table.contains('company_key', args.company.upper())
+    if args.region:
+        mask &= (table.contains('address_sido', args.region) | table.contains('address_sigungu', args.region)
+                 | table.contains('address_dong', args.region))
+    if args.verified:
+        mask &= table.columns['is_verified']
+    for name in args.missing or ():
+        mask &= ~table.columns[name]
+    selected = int(mask.sum())
+    groups = table.group_count(args.group_by, mask) if args.group_by else None
+    query_ms = (time.perf_counter() - start) * 1000
+    print(f"🔍 조건에 맞는 동문 {selected}명 ({query_ms:.2f}ms)")
+
+    if groups is not None:
+        print(f"\n📊 {args.group_by} 별 인원:")
+        for value, count in groups[:args.limit]:
+            print(f"  {value}: {count}명")
+        if len(groups) > args.limit:
+            print(f"  ... 외 {len(groups) - args.limit}개")
+    else:
+        for row in table.rows(mask, ('name', 'class_number', 'company', 'job_title', 'address_sigungu'),
+                              args.limit):
+            print(f"  {row['id']} {row['name']} {row['class_number'] or '-'}회 "
+                  f"{row['company'] or '-'} {row['job_title']} {row['address_sigungu']}".rstrip())
+
+    if args.join:
+        _print_join(table, args.join, args.format, args.mapping)
+    return 0
@@ -0,0 +1,159 @@
+"""
+접속 통계 샤드 카운터
+
+visit_stats/{날짜} 문서 하나를 트랜잭션으로 읽고 고치는 현재 방식은 한 문서의
+지속 쓰기 한도(초당 약 1회)에 묶여서, 동문회 공지 직후처럼 접속이 몰리면
+트랜잭션이 계속 중단(aborted)됩니다.
+
+샤드 방식에서는 접속 한 건을 날짜 문서 아래 샤드 문서 중 하나에
+트랜잭션 없이 기록합니다.
+
+    visit_stats/{날짜}/visit_shards/{0..N-1}
+        count: Increment(1)
+        visited_users: ArrayUnion([{user_id, user_name, timestamp}])
+        last_visit: SERVER_TIMESTAMP
+
+압축기(compact-visits)는 샤드를 읽어서 날짜 문서의 count / visited_users 에
+더한 뒤 샤드를 삭제합니다(트랜잭션 하나). 앱(VisitStatsService)도 같은
+샤드에 기록하고, 날짜 문서의 압축된 합계에 아직 압축되지 않은 샤드를 더해서
+읽으므로 압축 주기와 상관없이 바로 반영됩니다.
+
+    python -m gnhs_tools compact-visits --every 60
+"""
+import datetime
+import random
+import time
+
+from gnhs_tools.cost import COSTS
+from gnhs_tools.metrics import METRICS
+
+VISIT_COLLECTION = 'visit_stats'
+SHARD_COLLECTION = 'visit_shards'
+
+# 샤드 수 (샤드당 초당 약 1회 → 날짜별 초당 약 N회 지속 쓰기)
+DEFAULT_SHARDS = 10
+
+
+def date_key(now=None):
+    """앱과 같은 YYYY-MM-DD 날짜 키"""
+    now = now or datetime.datetime.now()
+    return now.strftime('%Y-%m-%d')
+
+
+def shard_ref(db, day, shard):
+    return (db.collection(VISIT_COLLECTION).document(day)
+            .collection(SHARD_COLLECTION).document(str(shard)))
+
+
+def record_visit_sharded(db, day=None, user_id=None, user_name=None, shards=DEFAULT_SHARDS):
+    """샤드 방식 접속 기록 (트랜잭션 없이 임의의 샤드에 한 번 쓰기)"""
+    from gnhs_tools.firebase import firestore_module
+    firestore = firestore_module()
+
+    data = {'count': firestore.Increment(1), 'last_visit': firestore.SERVER_TIMESTAMP}
+    if user_id and user_name:
+        data['visited_users'] = firestore.ArrayUnion([{
+            'user_id': user_id,
+            'user_name': user_name,
+            'timestamp': datetime.datetime.now(datetime.timezone.utc),
+        }])
+    shard_ref(db, day or date_key(), random.randrange(shards)).set(data, merge=True)
+    COSTS.write(SHARD_COLLECTION, None, data)
+
+
+def pending_shards(db):
+    """{날짜: [샤드 참조]} (압축을 기다리는 샤드)"""
+    pending = {}
+    for doc in COSTS.reads(SHARD_COLLECTION, db.collection_group(SHARD_COLLECTION).select([]).stream()):
+        day_ref = doc.reference.parent.parent
+        if day_ref is None or day_ref.parent.id != VISIT_COLLECTION:
+            continue
+        pending.setdefault(day_ref.id, []).append(doc.reference)
+    return pending
+
+
+def _timestamp_key(entry):
+    value = entry.get('timestamp')
+    if isinstance(value, datetime.datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=datetime.timezone.utc)
+        return value.timestamp()
+    return 0.0
+
+
+def fold_day(db, day, refs):
+    """날짜 하나의 샤드를 날짜 문서에 더하고 샤드 삭제 (더한 접속 수 반환)
+
+    샤드 읽기/삭제와 날짜 문서 쓰기를 한 트랜잭션으로 처리하므로, 압축
+    도중 들어온 증가분은 잃어버리지 않고 트랜잭션 재시도나 다음 압축에서
+    반영됩니다.
+    """
+    from gnhs_tools.firebase import firestore_module
+    firestore = firestore_module()
+    day_ref = db.collection(VISIT_COLLECTION).document(day)
+
+    # 트랜잭션 함수는 충돌하면 다시 실행되므로 작업량은 커밋한 뒤 한 번만 집계
+    @firestore.transactional
+    def fold(transaction):
+        snapshots = {snap.reference.path: snap
+                     for snap in db.get_all([day_ref] + refs, transaction=transaction)}
+        added = 0
+        deleted = 0
+        visitors = []
+        last_visit = None
+        for ref in refs:
+            shard = snapshots.get(ref.path)
+            if shard is None or not shard.exists:
+                continue
+            data = shard.to_dict() or {}
+            added += data.get('count', 0)
+            visitors.extend(data.get('visited_users', []))
+            if data.get('last_visit') and (last_visit is None or data['last_visit'] > last_visit):
+                last_visit = data['last_visit']
+            transaction.delete(ref)
+            deleted += 1
+
+        day_doc = snapshots.get(day_ref.path)
+        current = (day_doc.to_dict() or {}) if day_doc is not None and day_doc.exists else None
+        visitors.sort(key=_timestamp_key, reverse=True)
+        update = {
+            'count': (current or {}).get('count', 0) + added,
+            'visited_users': visitors + (current or {}).get('visited_users', []),
+            'last_visit': last_visit or firestore.SERVER_TIMESTAMP,
+        }
+        if current is None:
+            update.update({'date': day, 'created_at': firestore.SERVER_TIMESTAMP})
+            transaction.set(day_ref, update)
+        else:
+            transaction.update(day_ref, update)
+        return added, deleted, update
+
+    with METRICS.timer('fold_visits'):
+        added, deleted, update = fold(db.transaction())
+    COSTS.read(VISIT_COLLECTION, count=len(refs) + 1)
+    for _ in range(deleted):
+        COSTS.delete(SHARD_COLLECTION)
+    COSTS.write(VISIT_COLLECTION, day, update)
+    return added
+
+
+def compact(db):
+    """대기 중인 모든 샤드를 압축 ({날짜: 더한 접속 수} 반환)"""
+    return {day: fold_day(db, day, refs) for day, refs in sorted(pending_shards(db).items())}
+
+
+def run_compact(args):
+    from gnhs_tools.firebase import get_db
+
+    db = get_db()
+    while True:
+        folded = compact(db)
+        if folded:
+            for day, added in folded.items():
+                print(f"📅 {day}: +{added}회")
+        elif not args.every:
+            print("ℹ️  압축할 샤드가 없습니다.")
+        if not args.every:
+            break
+        time.sleep(args.every)
+    return 0
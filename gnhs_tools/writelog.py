@@ -0,0 +1,280 @@
+"""
+쓰기 로그 (dry-run 기록 / 재생)
+
+dry-run 중 파이프라인이 요청한 create/set/update/delete 를 그대로 append-only
+바이너리 로그에 기록합니다. 같은 경로에 다시 기록하면 기존 로그를 덮어씁니다
+(append=True 일 때만 이어서 기록). 정규화는 한 번만 하고, 나중에 로그를 원하는
+백엔드에 병렬로 재생할 수 있습니다.
+
+파일 형식:
+    MAGIC (8바이트)
+    프레임* = 헤더(op:1, merge:1, 컬렉션 길이:2, 본문 길이:4, big-endian)
+              + 컬렉션 이름(UTF-8) + 본문(JSON: [문서 ID, 데이터] 또는
+                [문서 ID, 데이터, 묶음 키])
+
+데이터의 Firestore 값은 백업 파일과 같은 표시 객체($datetime, $bytes, $geo,
+$ref)로, SERVER_TIMESTAMP 는 $server_timestamp 로 기록합니다.
+
+묶음 키는 Backend.unit() 안에서 기록한 쓰기에만 붙고, 재생할 때 문서 ID 대신
+워커를 고르는 데 씁니다 (하이픈 ID 문서 이동의 create 와 delete 가 같은 워커에서
+순서대로 실행되도록).
+
+요약은 헤더만 읽고 본문은 건너뛰므로 로그 크기와 무관하게 빠릅니다.
+"""
+import contextlib
+import json
+import os
+import queue
+import struct
+import threading
+import zlib
+
+from gnhs_tools.backends import DryRunBackend
+from gnhs_tools.backup import decoder, encode_value, escape_markers
+from gnhs_tools.contacts import SERVER_TIMESTAMP
+from gnhs_tools.errors import ToolError
+
+MAGIC = b'GNHSWAL1'
+_HEADER = struct.Struct('>BBHI')
+
+OP_SET = 1
+OP_UPDATE = 2
+OP_DELETE = 3
+OP_CREATE = 4
+OP_NAMES = {OP_SET: 'set', OP_UPDATE: 'update', OP_DELETE: 'delete', OP_CREATE: 'create'}
+
+
+class WriteLogError(ToolError, ValueError):
+    """쓰기 로그 파일이 손상되었거나 형식이 다를 때 발생"""
+
+
+def _encode_value(value):
+    if value is SERVER_TIMESTAMP:
+        return {'$server_timestamp': True}
+    return encode_value(value)
+
+
+def _decoder(db=None):
+    """backup.decoder + SERVER_TIMESTAMP 센티널"""
+    decode = decoder(db)
+
+    def decode_object(obj):
+        if len(obj) == 1 and '$server_timestamp' in obj:
+            return SERVER_TIMESTAMP
+        return decode(obj)
+
+    return decode_object
+
+
+class WriteLogWriter:
+    """쓰기 로그 파일에 프레임을 기록 (기존 파일은 append=True 가 아니면 덮어씀)"""
+
+    def __init__(self, path, append=False):
+        self.path = path
+        if append and os.path.exists(path) and os.path.getsize(path):
+            with open(path, 'rb') as f:
+                if f.read(len(MAGIC)) != MAGIC:
+                    raise WriteLogError(f"쓰기 로그 파일이 아닙니다: {path}")
+            self._file = open(path, 'ab')
+        else:
+            self._file = open(path, 'wb')
+            self._file.write(MAGIC)
+
+    def append(self, op, collection, doc_id, data=None, merge=False, route=None):
+        name = collection.encode('utf-8')
+        entry = [doc_id, data] if route is None or route == doc_id else [doc_id, data, route]
+        body = json.dumps(escape_markers(entry), ensure_ascii=False, separators=(',', ':'),
+                          default=_encode_value).encode('utf-8')
+        self._file.write(_HEADER.pack(op, 1 if merge else 0, len(name), len(body)))
+        self._file.write(name)
+        self._file.write(body)
+
+    def close(self):
+        self._file.close()
+
+
+def _frames(f, decode=True, db=None):
+    object_hook = _decoder(db) if decode else None
+    if f.read(len(MAGIC)) != MAGIC:
+        raise WriteLogError("쓰기 로그 파일이 아닙니다")
+    while True:
+        header = f.read(_HEADER.size)
+        if not header:
+            return
+        if len(header) < _HEADER.size:
+            raise WriteLogError("로그 끝부분이 잘려 있습니다")
+        op, merge, name_len, body_len = _HEADER.unpack(header)
+        if op not in OP_NAMES:
+            raise WriteLogError(f"알 수 없는 작업 코드: {op} (로그가 손상되었습니다)")
+        collection = f.read(name_len).decode('utf-8')
+        if decode:
+            body = f.read(body_len)
+            if len(body) < body_len:
+                raise WriteLogError("로그 끝부분이 잘려 있습니다")
+            entry = json.loads(body, object_hook=object_hook)
+            doc_id, data = entry[0], entry[1]
+            yield op, collection, doc_id, data, bool(merge), entry[2] if len(entry) > 2 else doc_id
+        else:
+            f.seek(body_len, 1)
+            yield op, collection, None, body_len, bool(merge), None
+
+
+def read_log(path, db=None):
+    """로그의 (op, 컬렉션, 문서 ID, 데이터, merge)를 순서대로 반환
+
+    db 를 주면 GeoPoint / 문서 참조도 SDK 값으로 되돌립니다.
+    """
+    with open(path, 'rb') as f:
+        for frame in _frames(f, db=db):
+            yield frame[:5]
+
+
+def summarize(path):
+    """컬렉션별 작업 수와 본문 바이트 수 (본문은 해석하지 않음)"""
+    summary = {}
+    with open(path, 'rb') as f:
+        for op, collection, _, body_len, _, _ in _frames(f, decode=False):
+            entry = summary.setdefault(collection, {'create': 0, 'set': 0, 'update': 0, 'delete': 0, 'bytes': 0})
+            entry[OP_NAMES[op]] += 1
+            entry['bytes'] += body_len
+    return summary
+
+
+class RecordingBackend(DryRunBackend):
+    """dry-run 백엔드 + 모든 쓰기를 로그 파일에 기록"""
+
+    name = 'record'
+
+    def __init__(self, path, reader=None, append=False):
+        super().__init__(reader=reader)
+        self.log = WriteLogWriter(path, append)
+        self._route = None
+
+    @contextlib.contextmanager
+    def unit(self, key):
+        previous, self._route = self._route, key
+        try:
+            yield
+        finally:
+            self._route = previous
+
+    def create(self, collection, doc_id, data):
+        super().create(collection, doc_id, data)
+        self.log.append(OP_CREATE, collection, doc_id, data, route=self._route)
+
+    def set(self, collection, doc_id, data, merge=False):
+        super().set(collection, doc_id, data, merge)
+        self.log.append(OP_SET, collection, doc_id, data, merge, route=self._route)
+
+    def update(self, collection, doc_id, data):
+        super().update(collection, doc_id, data)
+        self.log.append(OP_UPDATE, collection, doc_id, data, route=self._route)
+
+    def delete(self, collection, doc_id):
+        super().delete(collection, doc_id)
+        self.log.append(OP_DELETE, collection, doc_id, route=self._route)
+
+    def close(self):
+        super().close()
+        self.log.close()
+
+
+def apply(backend, op, collection, doc_id, data, merge):
+    """로그 프레임 하나를 백엔드에 적용"""
+    if op == OP_CREATE:
+        backend.create(collection, doc_id, data)
+    elif op == OP_SET:
+        backend.set(collection, doc_id, data, merge=merge)
+    elif op == OP_UPDATE:
+        backend.update(collection, doc_id, data)
+    elif op == OP_DELETE:
+        backend.delete(collection, doc_id)
+    else:
+        raise WriteLogError(f"알 수 없는 작업 코드: {op}")
+
+
+def replay(path, backend_factory, workers=8, db=None):
+    """로그를 workers 개 스레드로 재생 (합산된 백엔드 통계 반환)
+
+    같은 문서(묶음 키가 있으면 같은 묶음)에 대한 작업은 항상 같은 워커로
+    보내므로 순서가 보존되고, 워커는 실패하면 남은 작업을 버리므로 이동할
+    문서의 create 가 실패하면 같은 묶음의 delete 도 실행되지 않습니다.
+    backend_factory() 는 워커마다 한 번 호출되고, db 는 GeoPoint / 문서 참조를
+    되돌리는 데 씁니다.
+    """
+    workers = max(1, workers)
+    queues = [queue.Queue(maxsize=2000) for _ in range(workers)]
+    backends = [backend_factory() for _ in range(workers)]
+    errors = []
+
+    def run(q, backend):
+        failed = False
+        while True:
+            frame = q.get()
+            if frame is None:
+                break
+            if failed:
+                # 생산자가 막히지 않도록 남은 프레임은 버림
+                continue
+            try:
+                apply(backend, *frame)
+            except Exception as e:
+                errors.append(e)
+                failed = True
+        if not failed:
+            try:
+                backend.close()
+            except Exception as e:
+                errors.append(e)
+
+    threads = [threading.Thread(target=run, args=(q, b), daemon=True) for q, b in zip(queues, backends)]
+    for t in threads:
+        t.start()
+    try:
+        with open(path, 'rb') as f:
+            for frame in _frames(f, db=db):
+                key = f"{frame[1]}/{frame[5]}".encode('utf-8')
+                queues[zlib.crc32(key) % workers].put(frame[:5])
+    finally:
+        for q in queues:
+            q.put(None)
+        for t in threads:
+            t.join()
+
+    if errors:
+        raise errors[0]
+
+    total = {}
+    for backend in backends:
+        for key, value in backend.stats.items():
+            total[key] = total.get(key, 0) + value
+    return total
+
+
+def run_summary(args):
+    summary = summarize(args.log)
+    print(f"🧾 {args.log}")
+    for collection, entry in sorted(summary.items()):
+        print(f"  {collection}: create {entry['create']} / set {entry['set']} / "
+              f"update {entry['update']} / delete {entry['delete']} ({entry['bytes'] / 1024:.1f}KB)")
+    if not summary:
+        print("  (비어 있음)")
+    return 0
+
+
+def run_replay(args):
+    db = None
+    if args.dry_run:
+        factory = DryRunBackend
+    else:
+        from gnhs_tools.backends import FirestoreBackend
+        from gnhs_tools.firebase import get_db
+        db = get_db()
+
+        def factory():
+            return FirestoreBackend(db=db)
+
+    print(f"▶️  {args.log} 재생 중 (워커 {args.workers}개)" + (" (dry-run)" if args.dry_run else ""))
+    stats = replay(args.log, factory, workers=args.workers, db=db)
+    print(f"✅ 재생 완료: {stats}")
+    return 0
@@ -1,81 +1,99 @@
+import 'dart:math';
+
 import 'package:cloud_firestore/cloud_firestore.dart';
 
 /// 접속 통계 관리 서비스
 class VisitStatsService {
   final FirebaseFirestore _firestore = FirebaseFirestore.instance;
 
+  /// 날짜별 샤드 수 (tools 의 visits.DEFAULT_SHARDS 와 같은 값)
+  static const int shardCount = 10;
+
+  final Random _random = Random();
+
+  String _dateKey(DateTime date) =>
+      '${date.year}-${date.month.toString().padLeft(2, '0')}-${date.day.toString().padLeft(2, '0')}';
+
+  /// visit_stats/{날짜}/visit_shards (압축을 기다리는 접속 기록)
+  CollectionReference<Map<String, dynamic>> _shards(String dateKey) =>
+      _firestore.collection('visit_stats').doc(dateKey).collection('visit_shards');
+
   /// 접속 기록 추가 (사용자 정보 포함)
+  ///
+  /// 날짜 문서 하나를 트랜잭션으로 고치면 접속이 몰릴 때 문서당 쓰기 한도에
+  /// 걸리므로, 임의의 샤드 문서에 트랜잭션 없이 한 번만 씁니다.
+  /// 샤드는 compact-visits 가 날짜 문서에 합칩니다.
   Future<void> recordVisit({String? userId, String? userName}) async {
     try {
       final now = DateTime.now();
-      
-      // 오늘 날짜 (YYYY-MM-DD 형식)
-      final dateKey = '${now.year}-${now.month.toString().padLeft(2, '0')}-${now.day.toString().padLeft(2, '0')}';
-      
-      // visit_stats 컬렉션에 날짜별 문서 생성/업데이트
-      final docRef = _firestore.collection('visit_stats').doc(dateKey);
-      
-      await _firestore.runTransaction((transaction) async {
-        final snapshot = await transaction.get(docRef);
-        
-        if (snapshot.exists) {
-          // 기존 문서가 있으면 카운트 증가
-          final currentCount = snapshot.data()?['count'] ?? 0;
-          final visitedUsers = List<Map<String, dynamic>>.from(snapshot.data()?['visited_users'] ?? []);
-          
-          // 사용자 정보가 있으면 visited_users에 추가 (중복 제거 안 함!)
-          if (userId != null && userName != null) {
-            // 최신 접속 정보를 맨 앞에 추가 (기존 기록 유지)
-            visitedUsers.insert(0, {
-              'user_id': userId,
-              'user_name': userName,
-              'timestamp': now,
-            });
-          }
-          
-          transaction.update(docRef, {
-            'count': currentCount + 1,
-            'last_visit': FieldValue.serverTimestamp(),
-            'visited_users': visitedUsers,
-          });
-        } else {
-          // 새 문서 생성
-          final visitedUsers = <Map<String, dynamic>>[];
-          if (userId != null && userName != null) {
-            visitedUsers.add({
-              'user_id': userId,
-              'user_name': userName,
-              'timestamp': now,
-            });
+      final shard = _shards(_dateKey(now)).doc('${_random.nextInt(shardCount)}');
+
+      final data = <String, dynamic>{
+        'count': FieldValue.increment(1),
+        'last_visit': FieldValue.serverTimestamp(),
+      };
+      // 사용자 정보가 있으면 visited_users에 추가 (접속 시각이 달라서 중복 제거되지 않음)
+      if (userId != null && userName != null) {
+        data['visited_users'] = FieldValue.arrayUnion([
+          {
+            'user_id': userId,
+            'user_name': userName,
+            'timestamp': now,
           }
-          
-          transaction.set(docRef, {
-            'date': dateKey,
-            'count': 1,
-            'created_at': FieldValue.serverTimestamp(),
-            'last_visit': FieldValue.serverTimestamp(),
-            'visited_users': visitedUsers,
-          });
-        }
-      });
+        ]);
+      }
+
+      await shard.set(data, SetOptions(merge: true));
     } catch (e) {
       // 접속 기록 실패는 무시 (앱 동작에 영향 없음)
       print('접속 기록 실패: $e');
     }
   }
 
+  /// 날짜 하나의 접속 수 (압축된 합계 + 아직 압축되지 않은 샤드)
+  Future<int> _dayVisits(String dateKey) async {
+    final results = await Future.wait([
+      _firestore.collection('visit_stats').doc(dateKey).get(),
+      _shards(dateKey).get(),
+    ]);
+    final day = results[0] as DocumentSnapshot<Map<String, dynamic>>;
+    final shards = results[1] as QuerySnapshot<Map<String, dynamic>>;
+
+    int total = day.exists ? (day.data()?['count'] ?? 0) as int : 0;
+    for (final shard in shards.docs) {
+      total += (shard.data()['count'] ?? 0) as int;
+    }
+    return total;
+  }
+
+  /// 날짜 하나의 접속자 목록 (압축된 목록 + 아직 압축되지 않은 샤드)
+  Future<List<dynamic>> _dayVisitors(String dateKey) async {
+    final results = await Future.wait([
+      _firestore.collection('visit_stats').doc(dateKey).get(),
+      _shards(dateKey).get(),
+    ]);
+    final day = results[0] as DocumentSnapshot<Map<String, dynamic>>;
+    final shards = results[1] as QuerySnapshot<Map<String, dynamic>>;
+
+    final visitors = <dynamic>[
+      ...(day.exists ? (day.data()?['visited_users'] as List<dynamic>? ?? []) : []),
+    ];
+    for (final shard in shards.docs) {
+      visitors.addAll(shard.data()['visited_users'] as List<dynamic>? ?? []);
+    }
+    return visitors;
+  }
+
+  /// 여러 날짜의 접속 수 합계
+  Future<int> _sumVisits(List<String> dateKeys) async {
+    final counts = await Future.wait(dateKeys.map(_dayVisits));
+    return counts.fold<int>(0, (total, count) => total + count);
+  }
+
   /// 오늘 접속자 수 가져오기
   Future<int> getTodayVisits() async {
     try {
-      final now = DateTime.now();
-      final dateKey = '${now.year}-${now.month.toString().padLeft(2, '0')}-${now.day.toString().padLeft(2, '0')}';
-      
-      final doc = await _firestore.collection('visit_stats').doc(dateKey).get();
-      
-      if (doc.exists) {
-        return doc.data()?['count'] ?? 0;
-      }
-      return 0;
+      return await _dayVisits(_dateKey(DateTime.now()));
     } catch (e) {
       return 0;
     }
@@ -93,21 +111,11 @@ class VisitStatsService {
       // 월요일부터 오늘까지의 날짜 목록 생성
       final dates = <String>[];
       for (int i = 0; i <= now.difference(monday).inDays; i++) {
-        final date = monday.add(Duration(days: i));
-        final dateKey = '${date.year}-${date.month.toString().padLeft(2, '0')}-${date.day.toString().padLeft(2, '0')}';
-        dates.add(dateKey);
+        dates.add(_dateKey(monday.add(Duration(days: i))));
       }
       
       // 각 날짜의 접속자 수 합산
-      int totalVisits = 0;
-      for (final dateKey in dates) {
-        final doc = await _firestore.collection('visit_stats').doc(dateKey).get();
-        if (doc.exists) {
-          totalVisits += (doc.data()?['count'] ?? 0) as int;
-        }
-      }
-      
-      return totalVisits;
+      return await _sumVisits(dates);
     } catch (e) {
       return 0;
     }
@@ -119,25 +127,13 @@ class VisitStatsService {
       final now = DateTime.now();
       
       // 이번 달 1일부터 오늘까지의 날짜 목록 생성
-      final firstDayOfMonth = DateTime(now.year, now.month, 1);
       final dates = <String>[];
-      
       for (int day = 1; day <= now.day; day++) {
-        final date = DateTime(now.year, now.month, day);
-        final dateKey = '${date.year}-${date.month.toString().padLeft(2, '0')}-${date.day.toString().padLeft(2, '0')}';
-        dates.add(dateKey);
+        dates.add(_dateKey(DateTime(now.year, now.month, day)));
       }
       
       // 각 날짜의 접속자 수 합산
-      int totalVisits = 0;
-      for (final dateKey in dates) {
-        final doc = await _firestore.collection('visit_stats').doc(dateKey).get();
-        if (doc.exists) {
-          totalVisits += (doc.data()?['count'] ?? 0) as int;
-        }
-      }
-      
-      return totalVisits;
+      return await _sumVisits(dates);
     } catch (e) {
       return 0;
     }
@@ -146,11 +142,16 @@ class VisitStatsService {
   /// 전체 접속자 수 가져오기
   Future<int> getTotalVisits() async {
     try {
-      final querySnapshot = await _firestore.collection('visit_stats').get();
+      final results = await Future.wait([
+        _firestore.collection('visit_stats').get(),
+        _firestore.collectionGroup('visit_shards').get(),
+      ]);
       
       int totalVisits = 0;
-      for (final doc in querySnapshot.docs) {
-        totalVisits += (doc.data()['count'] ?? 0) as int;
+      for (final snapshot in results) {
+        for (final doc in snapshot.docs) {
+          totalVisits += (doc.data()['count'] ?? 0) as int;
+        }
       }
       
       return totalVisits;
@@ -193,44 +194,38 @@ class VisitStatsService {
       
       // 최근 N일간의 날짜 목록 생성
       for (int i = 0; i < days; i++) {
-        final date = now.subtract(Duration(days: i));
-        final dateKey = '${date.year}-${date.month.toString().padLeft(2, '0')}-${date.day.toString().padLeft(2, '0')}';
+        final dateKey = _dateKey(now.subtract(Duration(days: i)));
         
-        final doc = await _firestore.collection('visit_stats').doc(dateKey).get();
+        final visitedUsers = await _dayVisitors(dateKey);
         
-        if (doc.exists) {
-          final data = doc.data();
-          final visitedUsers = data?['visited_users'] as List<dynamic>?;
-          
-          print('📅 [최근접속자] $dateKey: ${visitedUsers?.length ?? 0}명');
-          
-          if (visitedUsers != null) {
-            for (final user in visitedUsers) {
-              final userId = user['user_id'] as String?;
-              final userName = user['user_name'] as String?;
-              final timestamp = user['timestamp'];
-              
-              if (userId != null && userName != null) {
-                if (!userMap.containsKey(userId)) {
-                  // 새 사용자 추가
-                  userMap[userId] = {
-                    'user_id': userId,
-                    'user_name': userName,
-                    'timestamp': timestamp is Timestamp ? timestamp.toDate() : timestamp,
-                    'visit_count': 1, // 접속 횟수 초기화
-                  };
-                } else {
-                  // 기존 사용자: 횟수 증가 및 최신 시간 업데이트
-                  final existingUser = userMap[userId]!;
-                  existingUser['visit_count'] = (existingUser['visit_count'] as int) + 1;
-                  
-                  // 더 최근 접속이면 timestamp 업데이트
-                  if (timestamp != null && existingUser['timestamp'] != null) {
-                    final existingTime = existingUser['timestamp'] as DateTime;
-                    final newTime = timestamp is Timestamp ? timestamp.toDate() : timestamp as DateTime;
-                    if (newTime.isAfter(existingTime)) {
-                      existingUser['timestamp'] = newTime;
-                    }
+        if (visitedUsers.isNotEmpty) {
+          print('📅 [최근접속자] $dateKey: ${visitedUsers.length}명');
+
+          for (final user in visitedUsers) {
+            final userId = user['user_id'] as String?;
+            final userName = user['user_name'] as String?;
+            final timestamp = user['timestamp'];
+            
+            if (userId != null && userName != null) {
+              if (!userMap.containsKey(userId)) {
+                // 새 사용자 추가
+                userMap[userId] = {
+                  'user_id': userId,
+                  'user_name': userName,
+                  'timestamp': timestamp is Timestamp ? timestamp.toDate() : timestamp,
+                  'visit_count': 1, // 접속 횟수 초기화
+                };
+              } else {
+                // 기존 사용자: 횟수 증가 및 최신 시간 업데이트
+                final existingUser = userMap[userId]!;
+                existingUser['visit_count'] = (existingUser['visit_count'] as int) + 1;
+                
+                // 더 최근 접속이면 timestamp 업데이트
+                if (timestamp != null && existingUser['timestamp'] != null) {
+                  final existingTime = existingUser['timestamp'] as DateTime;
+                  final newTime = timestamp is Timestamp ? timestamp.toDate() : timestamp as DateTime;
+                  if (newTime.isAfter(existingTime)) {
+                    existingUser['timestamp'] = newTime;
                   }
                 }
               }
@@ -0,0 +1,39 @@
+import pytest
+
+from gnhs_tools.backends import DryRunBackend
+
+
+class CapturingBackend(DryRunBackend):
+    """DryRunBackend + 요청한 쓰기 목록 (stream 은 state 에서)"""
+
+    def __init__(self, state=None):
+        super().__init__()
+        self.state = state or {}
+        self.writes = []
+
+    def stream(self, collection, fields=None):
+        for doc_id, data in sorted(self.state.get(collection, {}).items()):
+            if fields is not None:
+                data = {k: v for k, v in data.items() if k in fields}
+            yield doc_id, dict(data)
+
+    def create(self, collection, doc_id, data):
+        super().create(collection, doc_id, data)
+        self.writes.append(('create', collection, doc_id, data))
+
+    def set(self, collection, doc_id, data, merge=False):
+        super().set(collection, doc_id, data, merge)
+        self.writes.append(('set_merge' if merge else 'set', collection, doc_id, data))
+
+    def update(self, collection, doc_id, data):
+        super().update(collection, doc_id, data)
+        self.writes.append(('update', collection, doc_id, data))
+
+    def delete(self, collection, doc_id):
+        super().delete(collection, doc_id)
+        self.writes.append(('delete', collection, doc_id, None))
+
+
+@pytest.fixture
+def capture():
+    return CapturingBackend
@@ -0,0 +1,40 @@
+import pytest
+
+from gnhs_tools.address import bump_count, parse_address, region_fields
+
+
+@pytest.mark.parametrize('address, expected', [
+    ('강원도 강릉시 교동 123', ('강원', '강릉시', '교동')),
+    ('강원특별자치도 강릉시 주문진읍 해안로', ('강원', '강릉시', '주문진읍')),
+    ('대한민국 부산광역시 해운대구 우동', ('부산', '해운대구', '우동')),
+    ('서울 강남구 역삼동', ('서울', '강남구', '역삼동')),
+    # 시/도 없이 이름이 하나뿐인 시/군/구
+    ('강릉시 교동', ('강원', '강릉시', '교동')),
+    # 세종은 시/군/구가 없음
+    ('세종특별자치시 조치원읍', ('세종', '', '조치원읍')),
+    ('', ('', '', '')),
+    (None, ('', '', '')),
+    ('아무거나', ('', '', '')),
+    ('강원도 강릉시 교1동 123', ('강원', '강릉시', '교1동')),
+    ('서울 노원구 상계10동', ('서울', '노원구', '상계10동')),
+    # 아파트 동 번호는 읍/면/동이 아님
+    ('강원도 강릉시 한국아파트201동 1004호', ('강원', '강릉시', '')),
+    ('강릉시 극동스타클래스아파트102동 (교동)', ('강원', '강릉시', '교동')),
+    ('서울 강남구 래미안101동 역삼동', ('서울', '강남구', '역삼동')),
+    ('강릉시 포남동 행복빌라동', ('강원', '강릉시', '포남동')),
+    ('강릉시 그린타운동 302호', ('강원', '강릉시', '')),
+])
+def test_parse_address(address, expected):
+    assert parse_address(address) == expected
+
+
+def test_region_fields():
+    assert region_fields('서울 강남구 역삼동') == {
+        'address_sido': '서울', 'address_sigungu': '강남구', 'address_dong': '역삼동'}
+
+
+def test_bump_count_drops_zero_keys():
+    counts = {'강원': 1}
+    bump_count(counts, '강원', -1)
+    bump_count(counts, '서울', 2)
+    assert counts == {'서울': 2}
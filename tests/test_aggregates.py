@@ -0,0 +1,56 @@
+import pytest
+
+from gnhs_tools.aggregates import AggregateWorker
+from gnhs_tools.cost import COSTS, BudgetExceeded
+
+
+class _Doc:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self._data = data
+
+    def to_dict(self):
+        if isinstance(self._data, Exception):
+            raise self._data
+        return self._data
+
+
+class _Change:
+    def __init__(self, doc, kind='MODIFIED'):
+        self.document = doc
+        self.type = type('ChangeType', (), {'name': kind})
+
+
+def _worker(capture):
+    worker = AggregateWorker(capture(), interval=0)
+    # 첫 스냅샷(전체 문서 목록)
+    worker._on_snapshot([_Doc('01011112222', {'class_number': 21})], [], None)
+    worker.drain(block=False)
+    return worker
+
+
+def test_snapshot_changes_are_applied(capture):
+    worker = _worker(capture)
+    worker._on_snapshot([], [_Change(_Doc('01033334444', {'class_number': 30}), 'ADDED')], None)
+    assert worker.drain(block=False) == 1
+    assert worker.state.summary.total == 2
+    assert worker._broken is None
+
+
+def test_callback_error_marks_listener_for_restart(capture):
+    worker = _worker(capture)
+    worker._on_snapshot([], [_Change(_Doc('01033334444', RuntimeError('stream reset')))], None)
+    worker.drain(block=False)
+    assert isinstance(worker._broken, RuntimeError)
+
+
+def test_budget_exceeded_in_callback_stops_worker(capture):
+    worker = _worker(capture)
+    COSTS.enable({'reads': 0})
+    try:
+        worker._on_snapshot([], [_Change(_Doc('01033334444', {'class_number': 30}))], None)
+    finally:
+        COSTS.enabled = False
+        COSTS.reset()
+    with pytest.raises(BudgetExceeded):
+        worker.drain(block=False)
@@ -0,0 +1,26 @@
+import pytest
+
+from gnhs_tools.analytics import alumni_rows
+
+
+def test_alumni_rows_prefer_app_organization():
+    rows = list(alumni_rows([
+        ('01011112222', {'name': '홍길동', 'organization': '강릉시청', 'company': '前 강릉시청'}),
+        ('01033334444', {'name': '김철수', 'company': '삼성전자'}),
+    ]))
+    assert [row['company'] for row in rows] == ['강릉시청', '삼성전자']
+
+
+def test_export_drops_partitions_that_are_no_longer_present(tmp_path):
+    pytest.importorskip('pyarrow')
+    from gnhs_tools.analytics import export_alumni, pyarrow_module
+
+    pa = pyarrow_module()
+    output = str(tmp_path)
+    export_alumni(pa, [('01011112222', {'class_number': 21}), ('01033334444', {'class_number': 30})], output)
+    assert sorted(p.name for p in (tmp_path / 'alumni').iterdir()) == ['class_number=21', 'class_number=30']
+
+    assert export_alumni(pa, [('01011112222', {'class_number': 21})], output) == {'alumni': 1}
+    assert [p.name for p in (tmp_path / 'alumni').iterdir()] == ['class_number=21']
+    assert pa.dataset.dataset(str(tmp_path / 'alumni'), partitioning='hive').count_rows() == 1
+    assert not (tmp_path / 'alumni.partial').exists()
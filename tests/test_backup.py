@@ -0,0 +1,145 @@
+import datetime
+import gzip
+import json
+import os
+
+from gnhs_tools import backup as backup_module
+from gnhs_tools.backup import MANIFEST_NAME, ReadTime, backup, discover_collections
+
+SERVER_TIME = datetime.datetime(2025, 10, 19, 1, 0, tzinfo=datetime.timezone.utc)
+
+
+class FakeDoc:
+    def __init__(self, db, path):
+        self.db = db
+        self.path = path
+        self.id = path.rsplit('/', 1)[1]
+        self.reference = self
+
+    def collections(self):
+        self.db.probed.append(self.path)
+        prefix = self.path + '/'
+        names = {p[len(prefix):].split('/', 1)[0] for p in self.db.docs if p.startswith(prefix)}
+        return [FakeCollection(self.db, prefix + name) for name in sorted(names)]
+
+    def get(self):
+        return self
+
+    @property
+    def read_time(self):
+        return SERVER_TIME
+
+    def to_dict(self):
+        return dict(self.db.docs[self.path])
+
+
+class FakeCollection:
+    def __init__(self, db, path):
+        self.db = db
+        self.path = path
+        self.id = path.rsplit('/', 1)[-1]
+
+    def _child_ids(self):
+        prefix = self.path + '/'
+        return sorted({p[len(prefix):].split('/', 1)[0] for p in self.db.docs if p.startswith(prefix)})
+
+    def document(self, doc_id):
+        return FakeDoc(self.db, f"{self.path}/{doc_id}")
+
+    def list_documents(self):
+        # 하위 컬렉션만 있는 문서 참조도 포함 (Firestore 의 show_missing 과 같음)
+        return [FakeDoc(self.db, f"{self.path}/{doc_id}") for doc_id in self._child_ids()]
+
+    def stream(self, read_time=None):
+        self.db.read_times.append(read_time)
+        for doc_id in self._child_ids():
+            path = f"{self.path}/{doc_id}"
+            if path in self.db.docs:
+                yield FakeDoc(self.db, path)
+
+
+class FakeGroupQuery:
+    def __init__(self, db, name):
+        self.db = db
+        self.name = name
+
+    def select(self, fields):
+        return self
+
+    def stream(self):
+        for path in sorted(self.db.docs):
+            parts = path.split('/')
+            if len(parts) > 2 and parts[-2] == self.name:
+                yield FakeDoc(self.db, path)
+
+
+class FakeDb:
+    def __init__(self, docs):
+        self.docs = docs
+        self.read_times = []
+        self.probed = []
+
+    def collection_group(self, name):
+        return FakeGroupQuery(self, name)
+
+    def collections(self):
+        return [FakeCollection(self, name) for name in sorted({p.split('/', 1)[0] for p in self.docs})]
+
+    def collection(self, path):
+        return FakeCollection(self, path)
+
+
+DOCS = {
+    'alumni/a': {'name': '김'},
+    'rosters/class-21': {'count': 1},
+    'maintenance_locks/bundles': {'owner': 'x'},
+    'visit_stats/2025-10-19': {'total': 3},
+    'visit_stats/2025-10-19/visit_shards/0': {'count': 2},
+    # 날짜 문서 없이 샤드만 있는 경우
+    'visit_stats/2025-10-20/visit_shards/1': {'count': 1},
+}
+
+
+def test_discover_collections_uses_group_queries_without_probing():
+    db = FakeDb(DOCS)
+    assert discover_collections(db) == [
+        'alumni', 'maintenance_locks', 'rosters', 'visit_stats',
+        'visit_stats/2025-10-19/visit_shards', 'visit_stats/2025-10-20/visit_shards',
+    ]
+    assert db.probed == []
+
+
+def test_discover_collections_probes_only_requested_collections():
+    docs = {**DOCS, 'alumni/a/notes/1': {'text': '메모'}}
+    db = FakeDb(docs)
+    found = discover_collections(db, ['alumni', 'visit_stats'], subcollections=(), probe=('alumni',))
+    assert found == ['alumni', 'visit_stats', 'alumni/a/notes']
+    assert db.probed == ['alumni/a']
+
+
+def test_read_time_expires_after_window(monkeypatch):
+    read_time = ReadTime(FakeDb(DOCS))
+    assert read_time.get() == SERVER_TIME
+    monkeypatch.setattr(backup_module.time, 'monotonic', lambda: read_time._started + 3600)
+    assert read_time.get() is None and read_time.expired
+
+
+def test_backup_writes_every_collection_at_one_read_time(tmp_path):
+    db = FakeDb(DOCS)
+    manifest = backup(db, str(tmp_path), workers=1)
+
+    counts = {name: entry['documents'] for name, entry in manifest['collections'].items()}
+    assert counts == {'alumni': 1, 'maintenance_locks': 1, 'rosters': 1, 'visit_stats': 1,
+                      'visit_stats/2025-10-19/visit_shards': 1, 'visit_stats/2025-10-20/visit_shards': 1}
+    assert set(db.read_times) == {SERVER_TIME}
+    assert manifest['read_time'] == SERVER_TIME.isoformat()
+
+    chunk = manifest['collections']['visit_stats/2025-10-20/visit_shards']['chunks'][0]
+    with gzip.open(os.path.join(tmp_path, chunk['file']), 'rt', encoding='utf-8') as f:
+        assert json.loads(f.readline()) == ['1', {'count': 1}]
+    assert os.path.exists(os.path.join(tmp_path, MANIFEST_NAME))
+
+
+def test_backup_without_recursion_keeps_top_level_only(tmp_path):
+    manifest = backup(FakeDb(DOCS), str(tmp_path), ('visit_stats',), workers=1, recursive=False)
+    assert list(manifest['collections']) == ['visit_stats']
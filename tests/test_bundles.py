@@ -0,0 +1,49 @@
+import datetime
+
+from gnhs_tools.bundles import changed_classes, class_queries
+
+
+class FakeQuery:
+    def __init__(self, filters=(), docs=()):
+        self.filters = tuple(filters)
+        self.docs = docs
+
+    def where(self, field, op, value):
+        return FakeQuery(self.filters + ((field, op, value),), self.docs)
+
+    def select(self, fields):
+        return self
+
+    def stream(self):
+        return iter(self.docs)
+
+
+class FakeSnapshot:
+    def __init__(self, data):
+        self.data = data
+
+    def to_dict(self):
+        return self.data
+
+
+class FakeDb:
+    def __init__(self, docs=()):
+        self.docs = [FakeSnapshot(d) for d in docs]
+
+    def collection(self, name):
+        assert name == 'alumni'
+        return FakeQuery(docs=self.docs)
+
+
+def test_class_queries_match_both_app_queries():
+    queries = class_queries(FakeDb(), 21)
+    assert {name: q.filters for name, q in queries.items()} == {
+        'class-21': (('class_number', '==', 21),),
+        'class-21-graduation_year': (('graduation_year', '==', 21),),
+    }
+
+
+def test_changed_classes_uses_both_fields():
+    db = FakeDb([{'class_number': 21}, {'graduation_year': 22}, {'class_number': 23, 'graduation_year': 24}, {}])
+    since = datetime.datetime(2025, 10, 19, tzinfo=datetime.timezone.utc)
+    assert changed_classes(db, since) == {'21', '22', '23', '24'}
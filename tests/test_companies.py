@@ -0,0 +1,46 @@
+import pytest
+
+from gnhs_tools.companies import COMPANY_COLLECTION, cluster_names, normalize_company, rebuild_company_index
+
+
+@pytest.mark.parametrize('raw, key', [
+    ('前포스코건설', '포스코건설'),
+    ('(주)조유', '조유'),
+    ('한국남동발전(주)', '한국남동발전'),
+    ('前 대우조선 전무', '대우조선'),
+    ('전) 삼성전자 근무', '삼성전자'),
+    ('강원대학', '강원대학교'),
+    ('미등록', ''),
+    (None, ''),
+])
+def test_normalize_company(raw, key):
+    assert normalize_company(raw) == key
+
+
+def test_cluster_names_merges_similar_names_into_largest():
+    canonical = cluster_names({'포스코건설': 5, '포스코건설사': 1, '삼성전자': 3})
+    assert canonical == {'포스코건설': '포스코건설', '포스코건설사': '포스코건설', '삼성전자': '삼성전자'}
+
+
+def test_cluster_names_keeps_distinct_institutions_apart():
+    counts = {'강릉남산초등학교': 1, '강릉성산초등학교': 1, '18전투비행단': 1, '8전투비행단': 1}
+    assert cluster_names(counts) == {name: name for name in counts}
+
+
+def test_rebuild_prefers_organization_and_writes_only_changes(capture):
+    records = [
+        ('a', {'name': '김', 'class_number': 21, 'company': '예전회사', 'organization': '(주)조유'}),
+        ('b', {'name': '이', 'class_number': 22, 'company': '포스코건설', 'company_key': '포스코건설'}),
+    ]
+    existing = {
+        '포스코건설': {'key': '포스코건설', 'name': '포스코건설', 'variants': ['포스코건설'], 'count': 1,
+                   'members': [{'id': 'b', 'name': '이', 'class_number': 22}], 'updated_at': 'old'},
+        '예전회사': {'key': '예전회사'},
+    }
+    backend = capture({COMPANY_COLLECTION: existing})
+    stats = rebuild_company_index(backend, records)
+
+    assert (stats['written'], stats['unchanged'], stats['stale_deleted']) == (1, 1, 1)
+    assert [(op, doc_id) for op, _, doc_id, _ in backend.writes] == [
+        ('update', 'a'), ('delete', '예전회사'), ('set', '조유')]
+    assert backend.writes[0][3] == {'company_key': '조유'}
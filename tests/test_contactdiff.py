@@ -0,0 +1,63 @@
+from gnhs_tools.contactdiff import apply_diff, merge_join, sorted_records
+from gnhs_tools.contacts import SERVER_TIMESTAMP
+from gnhs_tools.sync import CREATE_ONLY_FIELDS, sync_record, without_create_only
+
+
+def _records(*pairs):
+    return [(doc_id, dict(data, created_at=SERVER_TIMESTAMP)) for doc_id, data in pairs]
+
+
+def test_sorted_records_external_sort_keeps_last_value(tmp_path):
+    records = _records(('3', {'n': 1}), ('1', {'n': 1}), ('2', {'n': 1}), ('1', {'n': 2}), ('0', {'n': 1}))
+    result = list(sorted_records(records, run_rows=2, tmpdir=str(tmp_path)))
+    assert [doc_id for doc_id, _ in result] == ['0', '1', '2', '3']
+    assert dict(result)['1'] == {'n': 2}
+    assert 'created_at' not in dict(result)['0']
+    assert not list(tmp_path.iterdir())
+
+
+def test_sorted_records_in_memory_matches_external(tmp_path):
+    records = _records(*[(str(i % 7), {'i': i}) for i in range(30)])
+    assert list(sorted_records(records)) == list(sorted_records(records, run_rows=4, tmpdir=str(tmp_path)))
+
+
+def test_merge_join():
+    old = [('1', {'a': 1}), ('2', {'a': 1}), ('4', {'a': 1})]
+    new = [('2', {'a': 2}), ('3', {'a': 1}), ('4', {'a': 1})]
+    result = [(op, doc_id, changes) for op, doc_id, _, _, changes in merge_join(old, new)]
+    assert result == [('removed', '1', None), ('changed', '2', {'a': 2}), ('added', '3', None)]
+
+
+def test_added_uses_create(capture):
+    backend = capture()
+    apply_diff(backend, 'added', '010', {'name': 'a', 'is_verified': False}, None)
+    op, _, doc_id, data = backend.writes[0]
+    assert op == 'create' and doc_id == '010'
+    assert data['created_at'] is SERVER_TIMESTAMP
+
+
+def test_changed_is_merge_set_of_changes_only(capture):
+    backend = capture()
+    apply_diff(backend, 'changed', '010', {'name': 'b', 'email': 'x'}, {'name': 'b'})
+    assert backend.writes == [('set_merge', 'alumni', '010', {'name': 'b', 'updated_at': SERVER_TIMESTAMP})]
+
+
+def test_removed_only_with_flag(capture):
+    backend = capture()
+    apply_diff(backend, 'removed', '010', None, None)
+    apply_diff(backend, 'removed', '011', None, None, delete_removed=True)
+    assert backend.writes == [('delete', 'alumni', '011', None)]
+
+
+def test_without_create_only_keeps_updated_at():
+    data = {'name': 'a', 'created_at': 1, 'updated_at': 2, 'is_verified': False, 'profile_photo_url': ''}
+    assert without_create_only(data) == {'name': 'a', 'updated_at': 2}
+    assert set(CREATE_ONLY_FIELDS) >= {'created_at', 'is_verified', 'profile_photo_url'}
+
+
+def test_sync_record_creates_unknown_docs(capture):
+    backend = capture()
+    current = {}
+    assert sync_record(backend, '010', {'name': 'a'}, current) == 'created'
+    assert backend.writes[0][0] == 'create'
+    assert sync_record(backend, '010', {'name': 'a'}, current) == 'unchanged'
@@ -0,0 +1,25 @@
+import pytest
+
+from gnhs_tools.cli import _enable_costs, build_parser
+from gnhs_tools.cost import BUDGET_ENV, COSTS, BudgetExceeded, CostLedger
+
+
+def test_zero_budget_stops_first_write():
+    ledger = CostLedger()
+    ledger.enable({'writes': 0, 'reads': 2})
+    ledger.read('alumni', 'a')
+    with pytest.raises(BudgetExceeded):
+        ledger.write('alumni', 'a', {'name': '홍길동'})
+
+
+def test_budget_option_zero_is_kept(monkeypatch):
+    for env in BUDGET_ENV.values():
+        monkeypatch.delenv(env, raising=False)
+    args = build_parser().parse_args(['--budget-writes', '0', 'import', '--dry-run'])
+    try:
+        _enable_costs(args)
+        assert args.cost
+        assert COSTS.budgets == {'writes': 0}
+    finally:
+        COSTS.enabled = False
+        COSTS.reset()
@@ -0,0 +1,48 @@
+import datetime
+
+import pytest
+
+from gnhs_tools.daemon import DEFAULT_SCHEDULE, CronSchedule, IntervalSchedule, parse_schedule
+from gnhs_tools.errors import ToolError
+
+
+def _at(*args):
+    return datetime.datetime(*args)
+
+
+@pytest.mark.parametrize('expr, now, expected', [
+    ('*/5 * * * *', _at(2025, 10, 19, 10, 3, 30), _at(2025, 10, 19, 10, 5)),
+    ('*/5 * * * *', _at(2025, 10, 19, 10, 5), _at(2025, 10, 19, 10, 10)),
+    ('17 * * * *', _at(2025, 10, 19, 10, 17), _at(2025, 10, 19, 11, 17)),
+    ('30 3 * * *', _at(2025, 12, 31, 4, 0), _at(2026, 1, 1, 3, 30)),
+    # 2025-10-19 은 일요일
+    ('30 4 * * 0', _at(2025, 10, 19, 4, 31), _at(2025, 10, 26, 4, 30)),
+    ('0 0 * * 7', _at(2025, 10, 20, 0, 0), _at(2025, 10, 26, 0, 0)),
+    ('0 0 29 2 *', _at(2025, 3, 1), _at(2028, 2, 29)),
+    # 일/요일을 둘 다 지정하면 둘 중 하나만 맞아도 실행
+    ('0 12 1 * 1', _at(2025, 10, 19, 13, 0), _at(2025, 10, 20, 12, 0)),
+    ('@daily', _at(2025, 10, 19, 0, 0), _at(2025, 10, 20, 0, 0)),
+])
+def test_cron_next_after(expr, now, expected):
+    assert CronSchedule(expr).next_after(now) == expected
+
+
+@pytest.mark.parametrize('expr', ['* * * *', '61 * * * *', 'x * * * *', '0 0 31 2 *'])
+def test_cron_rejects_invalid_expressions(expr):
+    with pytest.raises(ToolError):
+        CronSchedule(expr).next_after(_at(2025, 10, 19))
+
+
+def test_parse_schedule():
+    schedule = parse_schedule('@every 90s')
+    assert isinstance(schedule, IntervalSchedule)
+    assert schedule.next_after(_at(2025, 10, 19)) == _at(2025, 10, 19, 0, 1, 30)
+    for expr in DEFAULT_SCHEDULE.values():
+        parse_schedule(expr)
+
+
+def test_default_rosters_job_runs_once_a_day():
+    schedule = parse_schedule(DEFAULT_SCHEDULE['rosters'])
+    first = schedule.next_after(_at(2025, 10, 19, 5, 0))
+    assert first == _at(2025, 10, 20, 4, 45)
+    assert schedule.next_after(first) - first == datetime.timedelta(days=1)
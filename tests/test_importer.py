@@ -0,0 +1,28 @@
+from gnhs_tools.importer import import_csv
+from gnhs_tools.sync import CREATE_ONLY_FIELDS
+
+CSV = 'First Name,Last Name,Labels,Phone 1 - Value\n홍,길동,21회,010-1234-5678\n'
+
+
+def _source(tmp_path):
+    path = tmp_path / 'contacts.csv'
+    path.write_text(CSV, encoding='utf-8')
+    return str(path)
+
+
+def test_merge_import_creates_so_app_fields_survive(tmp_path, capture):
+    backend = capture()
+    stats = import_csv(backend, _source(tmp_path), progress_every=0)
+    assert stats['uploaded'] == 1
+    [(op, collection, doc_id, data)] = backend.writes
+    # create 는 새 문서에만 전체를 쓰고, 있는 문서에는 CREATE_ONLY_FIELDS 를 빼고 merge
+    assert (op, collection, doc_id) == ('create', 'alumni', '01012345678')
+    assert data['profile_photo_url'] == '' and data['is_verified'] is False
+
+
+def test_overwrite_import_sets_whole_document(tmp_path, capture):
+    backend = capture()
+    import_csv(backend, _source(tmp_path), merge=False, progress_every=0)
+    [(op, _, _, data)] = backend.writes
+    assert op == 'set'
+    assert set(CREATE_ONLY_FIELDS) <= set(data)
@@ -0,0 +1,41 @@
+import json
+
+from gnhs_tools.metrics import BUCKETS, Histogram, Metrics, to_prometheus
+
+
+def test_disabled_metrics_record_nothing():
+    metrics = Metrics()
+    with metrics.timer('commit'):
+        pass
+    metrics.count('rows')
+    assert list(metrics.timed_iter([1, 2], 'read')) == [1, 2]
+    assert (metrics.stages, metrics.counters) == ({}, {})
+
+
+def test_histogram_buckets():
+    hist = Histogram()
+    for value in (0.000005, 0.003, 20.0):
+        hist.observe(value)
+    buckets = hist.to_dict()['buckets']
+    assert (buckets[str(BUCKETS[0])], buckets['0.005'], buckets['+Inf']) == (1, 1, 1)
+    assert hist.to_dict()['max_ms'] == 20000.0
+
+
+def test_write_json_and_prometheus(tmp_path):
+    metrics = Metrics()
+    metrics.enable()
+    with metrics.timer('commit'):
+        pass
+    assert list(metrics.timed_iter(iter('ab'), 'read')) == ['a', 'b']
+    metrics.count('rows', 3)
+
+    summary = metrics.write(str(tmp_path / 'run.json'), command='import')
+    assert json.loads((tmp_path / 'run.json').read_text(encoding='utf-8'))['counters'] == {'rows': 3}
+    assert (summary['stages']['commit']['count'], summary['stages']['read']['count']) == (1, 2)
+
+    text = to_prometheus(summary)
+    assert 'gnhs_events_total{command="import",name="rows"} 3' in text
+    # 누적 버킷의 +Inf 는 전체 관측 수
+    assert 'gnhs_stage_seconds_bucket{command="import",stage="read",le="+Inf"} 2' in text
+    metrics.write(str(tmp_path / 'run.prom'), command='import')
+    assert not (tmp_path / 'run.prom.tmp').exists()
@@ -0,0 +1,46 @@
+import os
+
+from gnhs_tools.photos import PROFILE_SIZE, publish_store, update_photo_fields
+
+
+def _urls(digest):
+    return {str(PROFILE_SIZE): f"https://gnhs-alumni.web.app/photos/{digest}-{PROFILE_SIZE}.webp"}
+
+
+def test_publish_store_copies_every_stored_thumbnail(tmp_path):
+    store, publish = tmp_path / 'photos', tmp_path / 'build' / 'web' / 'photos'
+    (store / 'downloads').mkdir(parents=True)
+    (store / 'old-256.webp').write_bytes(b'old')
+    (store / 'new-256.webp').write_bytes(b'new')
+    (store / 'partial.webp.tmp').write_bytes(b'x')
+    (store / 'downloads' / 'source.jpg').write_bytes(b'src')
+
+    assert publish_store(str(store), str(publish)) == 2
+    assert sorted(os.listdir(publish)) == ['new-256.webp', 'old-256.webp']
+    assert publish_store(str(store), str(publish)) == 0
+
+
+def test_update_photo_fields_skips_missing_docs(capture):
+    backend = capture()
+    stats = update_photo_fields(backend, {'a': 'd1'}, _urls, current={})
+    assert stats['missing'] == 1 and stats['updated'] == 0
+    assert backend.writes == []
+
+
+def test_update_photo_fields_without_state_updates_all(capture):
+    backend = capture()
+    stats = update_photo_fields(backend, {'a': 'd1'}, _urls, current=None)
+    assert stats['updated'] == 1
+    assert [w[:3] for w in backend.writes] == [('update', 'alumni', 'a')]
+
+
+def test_update_photo_fields_keeps_user_uploads(capture):
+    backend = capture()
+    current = {
+        'a': {'profile_photo_url': 'https://storage.example/user.jpg'},
+        'b': {'profile_photo_url': _urls('d2')[str(PROFILE_SIZE)]},
+        'c': {},
+    }
+    stats = update_photo_fields(backend, {'a': 'd1', 'b': 'd2', 'c': 'd3'}, _urls, current)
+    assert stats == {'updated': 1, 'unchanged': 1, 'kept_uploaded': 1, 'missing': 0}
+    assert [w[2] for w in backend.writes] == ['c']
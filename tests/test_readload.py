@@ -0,0 +1,59 @@
+import datetime
+
+from gnhs_tools.benchmarks.readload import Probe, _all_stats_ops, _percentile
+
+
+class _Doc:
+    def __init__(self, doc_id, data):
+        self.id = doc_id
+        self.exists = data is not None
+        self._data = data
+
+    def to_dict(self):
+        return self._data
+
+
+class _Ref:
+    def __init__(self, docs, doc_id):
+        self._doc = _Doc(doc_id, docs.get(doc_id))
+
+    def get(self, timeout=None):
+        return self._doc
+
+
+class _Collection:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def document(self, doc_id):
+        return _Ref(self.docs, doc_id)
+
+    def stream(self, timeout=None):
+        return (_Doc(doc_id, data) for doc_id, data in self.docs.items())
+
+
+class _Db:
+    def __init__(self, collections):
+        self.collections = collections
+
+    def collection(self, name):
+        return _Collection(self.collections.get(name, {}))
+
+
+def test_all_stats_reads_one_document_per_day_like_the_app():
+    db = _Db({'visit_stats': {'2025-10-19': {'count': 3}, '2025-10-01': {'count': 1}}})
+    # 2025-10-19 은 일요일 (이번 주 7일, 이번 달 19일)
+    ops = dict(_all_stats_ops(db, Probe(timeout=1), datetime.datetime(2025, 10, 19, 12)))
+    reads = {label: op()[0] for label, op in ops.items()}
+    assert reads == {
+        'visit_stats 오늘': 1,
+        'visit_stats 이번 주 (7일)': 7,
+        'visit_stats 이번 달 (19일)': 19,
+        'visit_stats 전체': 2,
+    }
+
+
+def test_percentile():
+    values = [float(n) for n in range(1, 101)]
+    assert (_percentile(values, 50), _percentile(values, 99)) == (51.0, 100.0)
+    assert _percentile([], 95) == 0.0
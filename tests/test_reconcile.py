@@ -0,0 +1,104 @@
+import datetime
+
+from gnhs_tools.contacts import SERVER_TIMESTAMP
+from gnhs_tools.reconcile import (
+    EXTRA_KEY, Reconciler, canonical_key, classify, join_by_key, keyed_firestore,
+)
+
+KEY = '01012345678'
+LEGACY = '010-1234-5678'
+CREATED = datetime.datetime(2024, 1, 1, tzinfo=datetime.timezone.utc)
+
+
+def _expected(**fields):
+    return {'phone': KEY, 'name': '홍길동', 'class_number': 21, 'graduation_year': 21, 'email': '', **fields}
+
+
+def _keyed(docs):
+    legacy = {}
+    return list(keyed_firestore(iter(docs.items()), legacy_docs=legacy)), legacy
+
+
+def test_canonical_key():
+    assert canonical_key(LEGACY, {}) == KEY
+    assert canonical_key('abc', {'phone': '010-1234-5678'}) == KEY
+    assert canonical_key('abc', {}) == 'abc'
+
+
+def test_keyed_firestore_groups_legacy_and_canonical_ids():
+    grouped, legacy = _keyed({KEY: _expected(), LEGACY: _expected(organization='앱'), '01000000000': _expected()})
+    assert [key for key, _ in grouped] == ['01000000000', KEY]
+    assert [doc_id for doc_id, _ in grouped[1][1]] == [LEGACY, KEY]
+    assert list(legacy) == [LEGACY]
+    assert dict(grouped[1][1])[LEGACY][EXTRA_KEY] == ['organization']
+
+
+def test_join_by_key():
+    source = [('1', 'a'), ('3', 'c')]
+    store = [('2', ['x']), ('3', ['y'])]
+    assert list(join_by_key(source, store)) == [('1', 'a', []), ('2', None, ['x']), ('3', 'c', ['y'])]
+
+
+def test_in_sync_has_no_writes():
+    [(key, docs)], legacy = _keyed({KEY: _expected()})
+    assert classify(key, _expected(), docs, legacy) == ([], {}, [])
+
+
+def test_missing_is_created():
+    categories, _, writes = classify(KEY, _expected(), [], {})
+    assert categories == ['missing']
+    op, doc_id, data = writes[0]
+    assert (op, doc_id) == ('create', KEY)
+    assert data['created_at'] is SERVER_TIMESTAMP
+
+
+def test_legacy_move_keeps_app_fields_and_created_at():
+    legacy_doc = _expected(phone=LEGACY, class_number=2021, organization='앱 직장', birthday='0101',
+                           profile_photo_url='p.webp', profile_photo_thumbnails={'96': 't.webp'},
+                           company_key='K', created_at=CREATED, updated_at=CREATED)
+    [(key, docs)], legacy = _keyed({LEGACY: legacy_doc})
+    categories, _, writes = classify(key, _expected(), docs, legacy)
+    assert categories == ['legacy_id']
+    (op, doc_id, data), delete = writes
+    assert (op, doc_id) == ('create', KEY)
+    assert data['created_at'] == CREATED
+    assert data['updated_at'] is SERVER_TIMESTAMP
+    assert data['organization'] == '앱 직장' and data['birthday'] == '0101'
+    assert data['profile_photo_thumbnails'] == {'96': 't.webp'} and data['company_key'] == 'K'
+    # 연락처 파일이 정하는 필드는 연락처 값
+    assert data['class_number'] == 21 and data['phone'] == KEY
+    assert delete == ('delete', LEGACY, None)
+
+
+def test_duplicate_fills_only_missing_fields():
+    primary = _expected(organization='정규', profile_photo_url='', created_at=CREATED)
+    duplicate = _expected(phone=LEGACY, organization='하이픈', profile_photo_url='p.webp', company_key='K',
+                          created_at=datetime.datetime(2020, 1, 1))
+    [(key, docs)], legacy = _keyed({KEY: primary, LEGACY: duplicate})
+    categories, changes, writes = classify(key, _expected(), docs, legacy)
+    assert categories == ['duplicate_id'] and changes == {}
+    (op, doc_id, data), delete = writes
+    assert (op, doc_id) == ('merge', KEY)
+    assert data == {'profile_photo_url': 'p.webp', 'company_key': 'K', 'updated_at': SERVER_TIMESTAMP}
+    assert delete == ('delete', LEGACY, None)
+
+
+def test_drift_categories():
+    current = {KEY: {'phone': LEGACY, 'name': '홍길동', 'class_number': 2021, 'graduation_year': 2021, 'email': 'x'}}
+    [(key, docs)], legacy = _keyed(current)
+    categories, changes, writes = classify(key, _expected(), docs, legacy)
+    assert categories == ['class_encoding', 'phone_format', 'field_drift']
+    assert set(changes) == {'phone', 'class_number', 'graduation_year', 'email'}
+    assert writes[0][0] == 'merge'
+
+    [(key, docs)], legacy = _keyed({KEY: {k: v for k, v in _expected().items() if k != 'class_number'}})
+    assert classify(key, _expected(), docs, legacy)[0] == ['class_missing']
+
+
+def test_orphans_only_deleted_on_request(capture):
+    [(key, docs)], legacy = _keyed({KEY: _expected()})
+    backend = capture()
+    Reconciler(backend).apply(key, None, docs)
+    assert backend.writes == []
+    Reconciler(backend, delete_orphans=True).apply(key, None, docs)
+    assert backend.writes == [('delete', 'alumni', KEY, None)]
@@ -0,0 +1,32 @@
+from gnhs_tools.contacts import SERVER_TIMESTAMP, parse_labels
+from gnhs_tools.rosters import ROSTER_COLLECTION, rebuild_rosters
+
+
+def test_parse_labels_normalizes_and_drops_system_labels():
+    assert parse_labels('Z-001 ::: 08회 ::: * myContacts') == ['8회', 'Z-001']
+    assert parse_labels(' 해외  거주 :::21 회:::해외 거주') == ['21회', '해외 거주']
+    assert parse_labels('') == []
+    assert parse_labels(None) == []
+
+
+def test_rebuild_rosters_writes_only_changed_documents(capture):
+    records = [
+        ('01011112222', {'name': '김', 'class_number': 21, 'groups': ['21회', '해외거주']}),
+        ('01033334444', {'name': '이', 'graduation_year': 21, 'groups': []}),
+        ('01055556666', {'name': '박', 'class_number': 22}),
+    ]
+    existing = {
+        'class-22': {'kind': 'class', 'name': '22회', 'class_number': 22, 'count': 1,
+                     'ids': ['01055556666'], 'names': ['박'], 'updated_at': 'yesterday'},
+        'class-30': {'kind': 'class', 'name': '30회', 'class_number': 30, 'count': 0,
+                     'ids': [], 'names': []},
+    }
+    backend = capture({ROSTER_COLLECTION: existing})
+    stats = rebuild_rosters(backend, records)
+
+    assert (stats['written'], stats['unchanged'], stats['stale_deleted']) == (2, 1, 1)
+    writes = {(op, doc_id): data for op, _, doc_id, data in backend.writes}
+    assert ('delete', 'class-30') in writes
+    assert writes[('set', 'class-21')]['ids'] == ['01011112222', '01033334444']
+    group = writes[('set', 'group-해외거주')]
+    assert (group['ids'], group['classes'], group['updated_at']) == (['01011112222'], [21], SERVER_TIMESTAMP)
@@ -0,0 +1,67 @@
+import threading
+
+from gnhs_tools.search import load_index
+
+PEOPLE = [
+    ('01011112222', {'name': '김철수', 'company': '강릉시청', 'phone': '010-1111-2222',
+                     'address_sido': '강원특별자치도', 'address_sigungu': '강릉시'}),
+    ('01033334444', {'name': '김영희', 'company': '삼성전자', 'phone': '010-3333-4444',
+                     'address_sido': '서울특별시', 'address_sigungu': '강남구'}),
+    ('01055556666', {'name': '이김산', 'company': '한국전력', 'phone': '010-5555-6666'}),
+]
+
+
+def _ids(result):
+    return [row['id'] for row in result['results']]
+
+
+def test_choseong_and_multi_term_search():
+    index = load_index(PEOPLE)
+    assert _ids(index.search('ㄱㅊㅅ')) == ['01011112222']
+    assert _ids(index.search('강릉 김')) == ['01011112222']
+    assert _ids(index.search('6666')) == ['01055556666']
+
+
+def test_prefix_match_ranks_first_and_pages():
+    index = load_index(PEOPLE)
+    result = index.search('김')
+    assert result['total'] == 3
+    # 이름이 '김' 으로 시작하는 두 명이 먼저 (같은 점수는 이름순)
+    assert _ids(result) == ['01033334444', '01011112222', '01055556666']
+    assert _ids(index.search('김', page=2, size=2)) == ['01055556666']
+
+
+def test_updates_invalidate_cached_results():
+    index = load_index(PEOPLE)
+    assert index.search('김')['total'] == 3
+    index.delete('01055556666')
+    index.upsert('01033334444', {'name': '박영희'})
+    assert _ids(index.search('김')) == ['01011112222']
+    assert _ids(index.search('박영')) == ['01033334444']
+    assert index.search('삼성')['total'] == 0
+
+
+def test_reads_during_writes_see_whole_postings():
+    index = load_index(PEOPLE)
+    errors = []
+
+    def writer():
+        for n in range(300):
+            index.upsert(f'0109{n:07d}', {'name': f'김{n}'})
+            index.delete(f'0109{n:07d}')
+
+    def reader():
+        try:
+            for _ in range(300):
+                result = index.search('김')
+                assert result['total'] >= 3
+        except Exception as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=writer)] + [threading.Thread(target=reader) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert errors == []
+    assert index.search('김')['total'] == 3
@@ -0,0 +1,48 @@
+import pytest
+
+from gnhs_tools.sources import SourceError, detect_format, open_source
+
+VCARD = (
+    'BEGIN:VCARD\r\n'
+    'VERSION:3.0\r\n'
+    'N:홍;길동;;;\r\n'
+    'FN:홍길동\r\n'
+    'TEL;TYPE=CELL:010-1234-5678\r\n'
+    'TEL;TYPE=HOME:033-123-4567\r\n'
+    'ORG:강릉시청;총무과\r\n'
+    'ADR;TYPE=HOME:;;교동로 1;강릉시;강원;25500;대한민국\r\n'
+    'NOTE:첫 줄\r\n'
+    ' 이어진 줄\r\n'
+    'CATEGORIES:21회,서울지회\r\n'
+    'END:VCARD\r\n'
+)
+
+
+def test_vcard_records_use_canonical_keys(tmp_path):
+    path = tmp_path / 'contacts.vcf'
+    path.write_text(VCARD, encoding='utf-8')
+    [record] = list(open_source(str(path)))
+    assert (record['first_name'], record['phone'], record['phone2']) == ('홍길동', '010-1234-5678', '033-123-4567')
+    assert (record['organization'], record['department']) == ('강릉시청', '총무과')
+    assert (record['address'], record['address_city']) == ('강원 강릉시 교동로 1', '강릉시')
+    assert record['notes'] == '첫 줄이어진 줄'
+    assert record['labels'] == '21회 ::: 서울지회'
+
+
+def test_csv_mapping_and_jsonl(tmp_path):
+    csv_path = tmp_path / 'roster.csv'
+    csv_path.write_text('성명,휴대폰\n김철수,010-1111-2222\n', encoding='utf-8')
+    [record] = list(open_source(str(csv_path), 'csv', {'first_name': '성명', 'phone': '휴대폰'}))
+    assert (record['first_name'], record['phone']) == ('김철수', '010-1111-2222')
+
+    jsonl_path = tmp_path / 'roster.jsonl'
+    jsonl_path.write_text('{"first_name": "이영희"}\n\n{oops}\n', encoding='utf-8')
+    records = iter(open_source(str(jsonl_path)))
+    assert next(records)['first_name'] == '이영희'
+    with pytest.raises(SourceError, match=':3:'):
+        next(records)
+
+
+def test_unknown_extension_needs_format():
+    with pytest.raises(SourceError):
+        detect_format('contacts.txt')
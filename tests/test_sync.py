@@ -0,0 +1,38 @@
+from gnhs_tools.contacts import SERVER_TIMESTAMP
+from gnhs_tools.sync import load_mirror, save_mirror, sync_records, without_create_only
+
+
+def _data(**fields):
+    return {'name': '홍길동', 'company': '강릉시청', 'profile_photo_url': '', 'is_verified': False,
+            'created_at': SERVER_TIMESTAMP, 'updated_at': SERVER_TIMESTAMP, **fields}
+
+
+def test_sync_writes_only_changed_fields(capture):
+    backend = capture()
+    current = {
+        '01011112222': {'name': '홍길동', 'company': '강원도청', 'profile_photo_url': 'https://x/p.jpg'},
+        '01033334444': {'name': '홍길동', 'company': '강릉시청'},
+    }
+    records = [('01011112222', _data()), ('01033334444', _data()), ('01055556666', _data())]
+    assert sync_records(backend, records, current, progress_every=0) == \
+        {'created': 1, 'updated': 1, 'unchanged': 1}
+
+    ops = {doc_id: (op, data) for op, _, doc_id, data in backend.writes}
+    # 앱에서 올린 사진(profile_photo_url)은 CSV 기본값으로 덮지 않음
+    assert ops['01011112222'] == ('update', {'company': '강릉시청', 'updated_at': SERVER_TIMESTAMP})
+    assert ops['01055556666'][0] == 'create'
+    assert '01033334444' not in ops
+    assert current['01011112222']['company'] == '강릉시청'
+    assert 'created_at' not in current['01055556666']
+
+
+def test_without_create_only_keeps_updated_at():
+    assert without_create_only(_data()) == {'name': '홍길동', 'company': '강릉시청', 'updated_at': SERVER_TIMESTAMP}
+
+
+def test_mirror_round_trip_drops_timestamps(tmp_path):
+    path = str(tmp_path / 'alumni.jsonl')
+    assert load_mirror(path) == {}
+    save_mirror(path, {'01011112222': _data()})
+    assert load_mirror(path) == {'01011112222': {
+        'name': '홍길동', 'company': '강릉시청', 'profile_photo_url': '', 'is_verified': False}}
@@ -0,0 +1,40 @@
+import pytest
+
+from gnhs_tools.errors import ToolError
+from gnhs_tools.table import AlumniTable, parse_class_range, with_company_keys
+
+
+def _table(records):
+    return AlumniTable.from_records(records)
+
+
+def test_parse_class_range():
+    assert parse_class_range('25') == (25, 25)
+    assert parse_class_range('20-25') == (20, 25)
+    assert parse_class_range('25-20') == (20, 25)
+    with pytest.raises(ToolError):
+        parse_class_range('이십')
+
+
+def test_lookup_uses_last_row_for_duplicate_ids():
+    table = _table([('01011112222', {'name': '앞'}), ('01033334444', {}), ('01011112222', {'name': '뒤'})])
+    other = _table([('01011112222', {})])
+    assert table.lookup(other.columns['id']).tolist() == [2]
+    assert table.latest().tolist() == [False, True, True]
+
+
+def test_join_matches_last_rows_on_both_sides():
+    table = _table([('01011112222', {'name': '앞'}), ('x-1', {}), ('01011112222', {'name': '뒤'}), ('x-1', {})])
+    other = _table([('x-1', {}), ('01011112222', {}), ('01011112222', {}), ('01099990000', {})])
+    left, right = table.join(other)
+    assert sorted(zip(left.tolist(), right.tolist())) == [(2, 2), (3, 0)]
+
+
+def test_company_keys_are_filled_for_source_records():
+    records = with_company_keys([
+        ('01011112222', {'company': '(주)포스코건설'}),
+        ('01033334444', {'company': '前 포스코건설 상무'}),
+        ('01055556666', {'company': '', 'company_key': '삼성전자'}),
+    ])
+    table = _table(records)
+    assert table.group_count('company_key', table.all()) == [('포스코건설', 2), ('삼성전자', 1)]
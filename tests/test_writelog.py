@@ -0,0 +1,144 @@
+import datetime
+
+import pytest
+
+from gnhs_tools.backends import DryRunBackend
+from gnhs_tools.contacts import SERVER_TIMESTAMP
+from gnhs_tools.writelog import (
+    MAGIC, OP_DELETE, OP_SET, OP_UPDATE, RecordingBackend, WriteLogError, WriteLogWriter,
+    _HEADER, read_log, replay, summarize,
+)
+
+
+def _record(path, append=False):
+    backend = RecordingBackend(str(path), append=append)
+    backend.set('alumni', '01012345678', {
+        'name': '홍길동', 'groups': ['21회'], 'created_at': SERVER_TIMESTAMP,
+        'seen': datetime.datetime(2025, 1, 2, 3, 4, 5),
+    }, merge=True)
+    backend.update('alumni', '01012345678', {'email': 'a@b.c'})
+    backend.delete('companies', '포스코')
+    backend.close()
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / 'run.wal'
+    _record(path)
+    frames = list(read_log(str(path)))
+    assert [f[0] for f in frames] == [OP_SET, OP_UPDATE, OP_DELETE]
+    op, collection, doc_id, data, merge = frames[0]
+    assert (collection, doc_id, merge) == ('alumni', '01012345678', True)
+    assert data['created_at'] is SERVER_TIMESTAMP
+    assert data['seen'] == datetime.datetime(2025, 1, 2, 3, 4, 5)
+    assert data['groups'] == ['21회']
+    assert frames[2][3] is None
+
+
+class _GeoPoint:
+    latitude, longitude = 37.75, 128.9
+
+
+def test_typed_values_and_marker_like_maps_round_trip(tmp_path):
+    path = tmp_path / 'run.wal'
+    data = {
+        'photo': b'\x89PNG', 'location': _GeoPoint(),
+        'note': {'$datetime': 'not a date'}, 'tag': {'$$x': 1}, 'server': {'$server_timestamp': True},
+        'seen': [{'$bytes': 'AA=='}, datetime.datetime(2025, 1, 2)],
+    }
+    backend = RecordingBackend(str(path))
+    backend.set('alumni', '01012345678', data)
+    backend.close()
+    [(_, _, _, decoded, _)] = read_log(str(path))
+    assert decoded['photo'] == b'\x89PNG'
+    # db 없이 읽으면 GeoPoint 는 표시 객체 그대로
+    assert decoded['location'] == {'$geo': [37.75, 128.9]}
+    assert decoded['note'] == {'$datetime': 'not a date'}
+    assert decoded['tag'] == {'$$x': 1}
+    assert decoded['server'] == {'$server_timestamp': True}
+    assert decoded['seen'] == [{'$bytes': 'AA=='}, datetime.datetime(2025, 1, 2)]
+
+
+def test_summary_counts_headers(tmp_path):
+    path = tmp_path / 'run.wal'
+    _record(path)
+    summary = summarize(str(path))
+    assert summary['alumni']['set'] == 1
+    assert summary['alumni']['update'] == 1
+    assert summary['companies']['delete'] == 1
+
+
+def test_rerecording_overwrites(tmp_path):
+    path = tmp_path / 'run.wal'
+    _record(path)
+    _record(path)
+    assert summarize(str(path))['alumni']['set'] == 1
+
+
+def test_append_keeps_previous_frames(tmp_path):
+    path = tmp_path / 'run.wal'
+    _record(path)
+    _record(path, append=True)
+    assert summarize(str(path))['alumni']['set'] == 2
+
+
+def test_append_refuses_foreign_file(tmp_path):
+    path = tmp_path / 'notes.txt'
+    path.write_text('hello')
+    with pytest.raises(WriteLogError):
+        WriteLogWriter(str(path), append=True)
+
+
+def test_unknown_op_is_reported_as_corrupt(tmp_path):
+    path = tmp_path / 'bad.wal'
+    path.write_bytes(MAGIC + _HEADER.pack(9, 0, 1, 2) + b'a' + b'[]')
+    with pytest.raises(WriteLogError):
+        summarize(str(path))
+    with pytest.raises(WriteLogError):
+        list(read_log(str(path)))
+
+
+def test_truncated_log(tmp_path):
+    path = tmp_path / 'cut.wal'
+    _record(path)
+    path.write_bytes(path.read_bytes()[:-3])
+    with pytest.raises(WriteLogError):
+        list(read_log(str(path)))
+
+
+class _FailingCreate(DryRunBackend):
+    """create 하나가 실패하는 재생용 백엔드 (받은 쓰기 기록)"""
+
+    applied = []
+
+    def create(self, collection, doc_id, data):
+        if doc_id == '01012345678':
+            raise RuntimeError('create failed')
+        self.applied.append(('create', doc_id))
+
+    def delete(self, collection, doc_id):
+        self.applied.append(('delete', doc_id))
+
+
+def test_unit_keeps_move_on_one_worker(tmp_path):
+    path = tmp_path / 'move.wal'
+    backend = RecordingBackend(str(path))
+    for n in range(20):
+        key = f"0101234{n:04d}"
+        with backend.unit(key):
+            backend.create('alumni', key, {'name': str(n)})
+            backend.delete('alumni', f"010-1234-{n:04d}")
+    backend.create('alumni', '01012345678', {'name': 'x'})
+    with backend.unit('01012345678'):
+        backend.delete('alumni', '010-1234-5678')
+    backend.close()
+
+    # 묶음 키는 재생 경로에만 쓰이고 read_log 결과는 그대로
+    assert len(list(read_log(str(path)))[0]) == 5
+
+    _FailingCreate.applied = []
+    with pytest.raises(RuntimeError):
+        replay(str(path), _FailingCreate, workers=8)
+    assert ('delete', '010-1234-5678') not in _FailingCreate.applied
+    deletes = [doc_id for op, doc_id in _FailingCreate.applied if op == 'delete']
+    creates = {doc_id for op, doc_id in _FailingCreate.applied if op == 'create'}
+    assert all(f"0101234{doc_id[-4:]}" in creates for doc_id in deletes)
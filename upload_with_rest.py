@@ -8,6 +8,8 @@ import csv
 import re
 import time
 
+from gnhs_tools.cost import COSTS, BudgetExceeded, budgets_from_env
+
 # Firebase 프로젝트 정보
 PROJECT_ID = "gnhs-alumni"
 
@@ -41,13 +43,18 @@ def upload_to_firestore(doc_id, data):
     
     payload = {"fields": fields}
     
+    # PATCH 한 번 = 문서 쓰기 1회. 요청 전에 집계해서 한도를 넘으면 보내지 않음 (BudgetExceeded)
+    COSTS.write('alumni', doc_id, data)
     try:
         # PATCH 요청 (문서 생성 또는 업데이트)
         response = requests.patch(url, json=payload, timeout=10)
-        return response.status_code in [200, 201]
     except Exception as e:
         print(f"❌ 업로드 실패 ({doc_id}): {e}")
         return False
+    if response.status_code in [200, 201]:
+        return True
+    print(f"❌ 업로드 실패 ({doc_id}): HTTP {response.status_code}")
+    return False
 
 print("=" * 80)
 print("🚀 REST API로 Firestore 업로드 시작")
@@ -57,6 +64,9 @@ uploaded = 0
 skipped = 0
 failed = 0
 
+# GNHS_BUDGET_WRITES / GNHS_BUDGET_USD 로 한도 설정
+COSTS.enable(budgets_from_env(), stage='rest-upload')
+
 with open('contacts.csv', 'r', encoding='utf-8') as f:
     reader = csv.DictReader(f)
     
@@ -90,7 +100,14 @@ with open('contacts.csv', 'r', encoding='utf-8') as f:
             'is_verified': False,
         }
         
-        if upload_to_firestore(phone, data):
+        try:
+            ok = upload_to_firestore(phone, data)
+        except BudgetExceeded as e:
+            # 한도 초과로 보내지 않은 문서
+            failed += 1
+            print(f"❌ {e}")
+            break
+        if ok:
             uploaded += 1
             if uploaded % 10 == 0:
                 print(f"✅ {uploaded}개 업로드 완료...")
@@ -103,4 +120,5 @@ print("\n" + "=" * 80)
 print(f"✅ 성공: {uploaded}개")
 print(f"⚠️  제외: {skipped}개")
 print(f"❌ 실패: {failed}개")
+COSTS.report()
 print("=" * 80)